@@ -9,7 +9,33 @@ __email__ = "s4809430@student.uq.edu.au"
 __date__ = "03/03/2023"
 __version__ = "23032023.2015"
 
+import heapq
+import io
+import json
+import sys
+import time
+from collections import ChainMap
+from collections.abc import Callable, Iterable, MutableMapping
+from contextlib import redirect_stdout
+from operator import itemgetter
+from typing import TextIO
+
+import commands
 from constants import *
+from aggregate import (RunningShoppingList, aggregate_shopping_list,
+                       parse_preferred_units)
+from binary_cook_book import BinaryCookBook
+from command_stats import CommandStats
+from importer import import_recipes
+from ingredient_cache import ParseCache
+from ingredient_index import IngredientIndex
+from ingredient_store import IngredientStore
+from name_search import NameSearch
+from optimiser import INGREDIENTS, QUANTITY, optimise_meal_plan
+from pantry import Pantry
+from recipe_index import RecipeIndex
+from shopping_list import ShoppingList
+from storage import CookBookStore
 
 
 # Write your functions here
@@ -75,13 +101,43 @@ def parse_ingredient(raw_ingredient_detail: str) -> tuple[float, str, str]:
     return float(measurement), unit, ingredient
 
 
+def parse_raw_ingredients(raw_ingredients: str) -> tuple[
+    tuple[float, str, str]]:
+    """Parses a comma separated string of ingredients.
+
+    Parameters:
+        raw_ingredients (str): The ingredients of a recipe, e.g.
+            "300 g peanuts,0.5 tsp salt".
+
+    Returns:
+        The parsed ingredients, see parse_ingredient.
+    """
+    return tuple(parse_ingredient(raw_ingredient.strip()) for
+                 raw_ingredient in raw_ingredients.split(","))
+
+
+# Recipes are parsed once into compact views and then served from this cache,
+# see recipe_ingredients.
+INGREDIENT_STORE = IngredientStore(parse_ingredient)
+INGREDIENT_CACHE = ParseCache(parser=INGREDIENT_STORE.parse)
+
+# Number of commands run_batch collects before writing their output.
+BATCH_FLUSH_SIZE = 1024
+
+# Number of table rows render_ingredients formats before writing them.
+RENDER_CHUNK_SIZE = 4096
+
+
 def recipe_ingredients(recipe: tuple[str, str]) -> tuple[
     tuple[float, str, str]]:
     """Splits the recipe into its ingredients.
 
     Takes in a recipe of the form tuple[str, str] and splits the ingredients
     of the recipe into individual elements where each element if of the form
-    tuple[float, str, str].
+    tuple[float, str, str]. Parsed recipes are kept in INGREDIENT_CACHE so a
+    recipe is only split and parsed the first time it is seen, and are kept
+    as IngredientViews from INGREDIENT_STORE, which take a fraction of the
+    memory of the tuples they stand for.
 
     Parameters:
         recipe (tuple[str, str]): The recipe that is to be processed, must be
@@ -91,15 +147,15 @@ def recipe_ingredients(recipe: tuple[str, str]) -> tuple[
     Returns:
         The ingredients as a tuple of tuples, where each tuple within the
         tuple has the amount of that ingredient (the float) and the units and
-        name of the ingredient, in that order.
+        name of the ingredient, in that order. The result is an
+        IngredientView, which compares equal to (and pickles as) that tuple.
 
     Usage:
         >>> recipe_ingredients(
         ("peanut butter", "300 g peanuts,0.5 tsp salt, 2 tsp oil"))
         ((300.0, "g", "peanuts"), (0.5, "tsp", "salt"), (2.0, "tsp", "oil"))
     """
-    return tuple(parse_ingredient(raw_ingredient.strip()) for
-                 raw_ingredient in recipe[1].split(","))
+    return INGREDIENT_CACHE.get(recipe[1])
 
 
 def add_recipe(new_recipe: tuple[str, str], recipes: list[tuple[str, str]]) -> \
@@ -141,9 +197,9 @@ def get_ingredient_amount(ingredient: str, recipe: tuple[str, str]) -> \
         >>> get_ingredient_amount("peanuts", recipe)
         (300, "g")
     """
-    ingredients = recipe_ingredients(recipe)
-    for recipe_ingredient in ingredients:
-        if recipe_ingredient[2].lower() == ingredient.lower():  # Compares
+    ingredient = ingredient.lower()
+    for recipe_ingredient in recipe_ingredients(recipe):
+        if recipe_ingredient[2].lower() == ingredient:  # Compares
             # ingredient names
             return recipe_ingredient[:2]
 
@@ -152,18 +208,22 @@ def remove_recipe(name: str, recipes: list[tuple[str, str]]) -> None:
     """Removes the first occurrence of the specified recipe from recipes.
 
     Uses find_recipe to check if the recipe is in recipes, if so it is
-    removed from the list, otherwise it does nothing.
+    removed from the list, otherwise it does nothing. If recipes is a
+    RecipeIndex the recipe is removed through its name index instead.
 
     Parameters:
         name (str): The name of the recipe.
-        recipes (list[tuple[str, str]]): The list of recipes.
+        recipes (list[tuple[str, str]] | RecipeIndex): The list of recipes.
 
     Usage:
         >>> recipes = [
         ("peanut butter", "300 g peanuts,0.5 tsp salt,2 tsp oil")]
         >>> remove_recipe("peanut butter", recipes)
     """
-    if (recipe := find_recipe(recipe_name=name, recipes=recipes)) is not None:
+    if isinstance(recipes, RecipeIndex):
+        recipes.remove_name(name)
+    elif (recipe := find_recipe(recipe_name=name, recipes=recipes)) is not \
+            None:
         recipes.remove(recipe)
 
 
@@ -172,12 +232,13 @@ def find_recipe(recipe_name: str, recipes: list[tuple[str, str]]) -> \
     """Tries to find the given recipe within recipes.
 
     Loops through recipes, if the recipe name is found the recipe is
-    returned, otherwise returns None.
+    returned, otherwise returns None. If recipes is a RecipeIndex its name
+    index is used instead of looping.
 
     Parameters:
         recipe_name (str): The name of the recipe you want to find.
-        recipes (list[tuple[str, str]]): The list of recipes you want to look
-            through.
+        recipes (list[tuple[str, str]] | RecipeIndex): The list of recipes you
+            want to look through.
 
     Returns:
         Either returns None or if the recipe is found it returns the recipe.
@@ -190,12 +251,17 @@ def find_recipe(recipe_name: str, recipes: list[tuple[str, str]]) -> \
         >>> find_recipe("something not in the list")
         None
     """
+    if isinstance(recipes, RecipeIndex):
+        return recipes.find(recipe_name)
+
+    recipe_name = recipe_name.casefold()
     for recipe in recipes:
-        if get_recipe_name(recipe).lower() == recipe_name.lower():
+        if get_recipe_name(recipe).casefold() == recipe_name:
             return recipe
 
 
-def create_recipe() -> tuple[str, str]:
+def create_recipe(read_input: Callable[[str], str] = input) -> \
+        tuple[str, str]:
     """A function to create recipes from user input.
 
     Prompts the user for a recipe name and then continually prompts the user
@@ -204,14 +270,18 @@ def create_recipe() -> tuple[str, str]:
     anything. The recipe of the form ("recipe name", "ingredient_1,
     ingredient_2,...") is returned.
 
+    Parameters:
+        read_input (Callable[[str], str]): Called with each prompt to read
+            the user's answer, input by default.
+
     Returns:
          A tuple containing the recipe name and the ingredients, both as
          strings.
     """
     ingredients = list()
-    recipe_name = input("Please enter the recipe name: ")
+    recipe_name = read_input("Please enter the recipe name: ")
     while True:
-        raw_ingredient = input("Please enter an ingredient: ") + ","
+        raw_ingredient = read_input("Please enter an ingredient: ") + ","
 
         if raw_ingredient == ",":  # breaks if the user inputted nothing
             break
@@ -229,13 +299,14 @@ def add_to_shopping_list(ingredient_details: tuple[float, str, str],
     Loops through shopping_list, first checks if the ingredients name is
     already in the list, if so the amounts ( already within the list and from
     ingredient_details ) are summed, otherwise the ingredient is appended
-    onto the list as is.
+    onto the list as is. A ShoppingList is updated in place through its name
+    index instead.
 
     Parameters:
         ingredient_details (tuple[float, str, str]): A tuple containing the
             amount of the ingredient, the units and the name, in that order.
-        shopping_list (list[tuple[float, str, str] | None]): The shopping
-            list you want to add to.
+        shopping_list (list[tuple[float, str, str] | None] | ShoppingList):
+            The shopping list you want to add to.
 
     Usage:
         >>> shopping_list = [(300.0, "g", "peanuts"), (0.5, "tsp", "salt"),
@@ -249,6 +320,10 @@ def add_to_shopping_list(ingredient_details: tuple[float, str, str],
         [(1500.0, "g", "peanuts"), (0.5, "tsp", "salt"), (2.0, "tsp", "oil"),
         (1000.0, "g", "tofu")]
     """
+    if isinstance(shopping_list, ShoppingList):
+        shopping_list.add(ingredient_details)
+        return
+
     for ingredient in shopping_list:
         if ingredient[2].lower() == ingredient_details[2].lower():  # Compares
             # ingredient names
@@ -268,13 +343,14 @@ def remove_from_shopping_list(ingredient_name: str, amount: float,
     amount of that ingredient is decreased by the amount inputted into the
     function. The item is then removed from the shopping list, then the new
     amount is checked, if amount <= 0 the function does nothing and exits
-    otherwise the recipe is appended with the new amount.
+    otherwise the recipe is appended with the new amount. A ShoppingList is
+    decreased in place through its name index instead.
 
     Parameters:
         ingredient_name (str): The name of the ingredient you want to modify.
         amount (float): The amount to remove from the ingredient.
-        shopping_list (list[tuple[float, str, str] | None]): The shopping
-            list you want to add to.
+        shopping_list (list[tuple[float, str, str] | None] | ShoppingList):
+            The shopping list you want to remove from.
 
     Usage:
         >>> shopping_list = [(0.5, "tsp", "salt"), (2.0, "tsp", "oil"),
@@ -286,6 +362,10 @@ def remove_from_shopping_list(ingredient_name: str, amount: float,
         >>> shopping_list
         [(0.5, "tsp", "salt"), (2.0, "tsp", "oil")]
     """
+    if isinstance(shopping_list, ShoppingList):
+        shopping_list.decrease(ingredient_name, amount)
+        return
+
     for ingredient in shopping_list:
         if ingredient[2].lower() == ingredient_name.lower():
             amount = ingredient[0] - amount
@@ -295,22 +375,27 @@ def remove_from_shopping_list(ingredient_name: str, amount: float,
             return
 
 
-def generate_shopping_list(recipes: list[tuple[str, str]]) -> list[tuple[
-    float, str, str]]:
+def generate_shopping_list(recipes: list[tuple[str, str]],
+                           preferred_units: dict[str, str] | None = None,
+                           workers: int | None = None) -> \
+        list[tuple[float, str, str]]:
     """Makes a list of ingredients from a list of recipes.
 
-    Loops through recipes and adds it into a dictionary where the keys of the
-    dictionary are the ingredient names ( e.g. {"butter": <value>,
-    "chocolate": <value>,...} ) and the values are also dictionaries
-    ( {"amount": <float e.g. 0.25>, "units": <str e.g. "ml">} ).
-    The dictionary is used as a simple way to handle duplicates. The
-    dictionary is then pulled back apart into a list where each value is a
-    tuple of the form (amount, units, name), e.g. [(300.0, "g", "peanuts"),
+    Uses aggregate_shopping_list to sum the ingredients of every recipe,
+    ingredients with the same name are converted into the same units before
+    being summed ( e.g. 1 tbsp salt and 1 tsp salt becomes 4.0 tsp salt ).
+    The result is a list where each value is a tuple of the form
+    (amount, units, name), e.g. [(300.0, "g", "peanuts"),
     (10.0, "ml", "water"),...].
 
     Parameters:
         recipes (list[tuple[str, str]]): The list of recipes you want a
             shopping list for.
+        preferred_units (dict[str, str] | None): Units to display each
+            dimension ( "volume", "mass" or "count" ) in, if not given the
+            units each ingredient was first seen in are used.
+        workers (int | None): Number of processes used for very large meal
+            plans, None for one per CPU and 1 to always use this process.
 
     Returns:
         A list of ingredients of the form (amount, units, name).
@@ -324,95 +409,104 @@ def generate_shopping_list(recipes: list[tuple[str, str]]) -> list[tuple[
         (0.25, "tsp", "garlic powder"), (0.25, "tsp", "onion powder"),
         (0.125, "tsp", "pepper"), (0.25, "tsp", "turmeric"),
         (1.0, "cup", "soy milk")]
+        >>> generate_shopping_list([("tea", "1 tbsp sugar,1 tsp sugar")])
+        [(1.333333333, "tbsp", "sugar")]
+        >>> generate_shopping_list([("tea", "1 tbsp sugar,1 tsp sugar")],
+        preferred_units={"volume": "tsp"})
+        [(4.0, "tsp", "sugar")]
     """
-    # A dictionary is used to simplify the process of finding duplicates
-    unique_shopping_list = dict()
-    for recipe in recipes:
-        # Loops through the ingredients
-        for amount, units, name in recipe_ingredients(recipe):
+    return aggregate_shopping_list(recipes=recipes,
+                                   parse=INGREDIENT_CACHE.get,
+                                   preferred_units=preferred_units,
+                                   workers=workers)
 
-            if name in unique_shopping_list:  # If already in dictionary
-                unique_shopping_list[name]["amount"] += amount
-                continue
-            unique_shopping_list[name] = {"amount": amount, "units": units}
 
-    # Turns the dictionary back into the list format
-    return [
-        (unique_shopping_list[key]["amount"],
-         unique_shopping_list[key]["units"], key)
-        for key in unique_shopping_list]
+def render_ingredients(shopping_list: Iterable[tuple[float, str, str]],
+                       write: Callable[[str], object],
+                       limit: int | None = None, offset: int = 0) -> None:
+    """Writes the ingredients of a shopping list as a table, in chunks.
 
+    The column widths and sort keys are worked out in a single pass over
+    shopping_list, the rows are then sorted by name ( ignoring case ) and
+    written RENDER_CHUNK_SIZE rows at a time. The widths always come from
+    every row so pages of the same list line up.
 
-def display_ingredients(shopping_list: list[tuple[float, str, str]]) -> None:
+    Parameters:
+        shopping_list (Iterable[tuple[float, str, str]]): The ingredients to
+            display, (amount, units, name).
+        write (Callable[[str], object]): Called with each chunk of the
+            table, e.g. sys.stdout.write.
+        limit (int | None): The most rows to write, None for all of them.
+        offset (int): The number of rows ( in sorted order ) to skip.
+    """
+    rows = list()
+    pad_a = pad_u = pad_i = 0
+    for amount, units, name in shopping_list:
+        amount = str(amount)
+        pad_a = max(pad_a, len(amount))
+        pad_u = max(pad_u, len(units))
+        pad_i = max(pad_i, len(name))
+        rows.append((name.upper(), amount, units, name))
+    if len(rows) == 0:
+        return
+
+    sort_key = itemgetter(0)
+    if limit is None:
+        rows.sort(key=sort_key)
+        rows = rows[offset:] if offset else rows
+    else:  # Only the rows being shown need to be in order
+        rows = heapq.nsmallest(offset + limit, rows, key=sort_key)[offset:]
+
+    row_format = f"| {{:>{pad_a}}} | {{:^{pad_u + 1}}} | {{:<{pad_i + 1}}} |\n"
+    for start in range(0, len(rows), RENDER_CHUNK_SIZE):
+        write("".join(row_format.format(amount, units, name)
+                      for _, amount, units, name in
+                      rows[start:start + RENDER_CHUNK_SIZE]))
+
+
+def display_ingredients(shopping_list: list[tuple[float, str, str]],
+                        limit: int | None = None, offset: int = 0) -> None:
     """Displays the ingredients of a shopping list as a table.
 
-    Loops through shopping_list ( if it is populated, otherwise it exits )
-    and adds it into a dictionary where the keys of the dictionary are the
-    ingredient names ( e.g. {"butter": <value>, "chocolate": <value>,...} )
-    and the values are also dictionaries ( {"amount": <float e.g. 0.25>,
-    "units": <str e.g. "ml">} ). Next the maximum widths of each column is
-    found ( the columns being amount, units, name ). Finaly the table is
-    constructed using the maximum widths as padding, and then it is displayed
-    to the user.
+    Uses render_ingredients to find the maximum widths of each column ( the
+    columns being amount, units, name ) and write the table, sorted by
+    ingredient name, to the user. Nothing is displayed for an empty
+    shopping list.
 
     Parameters:
         shopping_list (list[tuple[float, str, str]]): The shopping list with
             the ingredients you want displayed.
+        limit (int | None): The most rows to display, None for all of them.
+        offset (int): The number of rows to skip, for paging.
 
     Usage:
         >>> display_ingredients(
         [(1.0, "large", "banana"), (0.5, "cup", "ice"),])
-        | 1.0 | large | banana |
-        | 0.5 | cup   | ice    |
+        | 1.0 | large  | banana  |
+        | 0.5 |  cup   | ice     |
     """
-    # Do nothing or the function errors out.
-    if len(shopping_list) == 0:
-        return
+    render_ingredients(shopping_list=shopping_list, write=sys.stdout.write,
+                       limit=limit, offset=offset)
 
-    # Turns the ingredients into a dictionary to make it easier to format the
-    # table later, this does not need the same checking code as in
-    # generate_shopping_list as this is run afterwards.
-    ingredients = {name: {"amount": amount, "units": units}
-                   for amount, units, name in shopping_list}
-
-    # Constructs a list of word lengths per row, uses an iterator
-    # with the zip command to reshape the list from from
-    # [0, 1 ,2 ,3, 4, 5, ...] into form [(0, 1, 2), (3, 4, 5), ...].
-    column_entry_widths = list(zip(column_entry_widths := (
-        len(str(item)) if type(item) is float else len(item)
-        for ingredient in shopping_list for item in ingredient),
-                                   column_entry_widths, column_entry_widths))
-
-    # unpacks and zips column_entry_widths into a different configuration.
-    # From list of lengths per ingredient/row -> list of lengths per column.
-    # Then the max of each list is grabbed which is the padding needed for each
-    # column.
-    max_lens = tuple(max(column_lengths) for column_lengths in
-                     list(zip(*column_entry_widths)))
-
-    table = list(
-        (
-            "| {amount: >{pad_a}} |"
-            " {units: ^{pad_u}} |"
-            " {ingredient: <{pad_i}} |".format(
-                amount=str(ingredients[ingredient]["amount"]),
-                pad_a=max_lens[0], units=str(ingredients[ingredient]["units"]),
-                pad_u=max_lens[1] + 1, ingredient=ingredient,
-                pad_i=max_lens[2] + 1
-            )
-        )
-        for ingredient in sorted(ingredients, key=lambda wrd: wrd.upper())
-    )
-    print("\n".join(table))
+
+def display_recipe_names(recipe_names: list[str]) -> None:
+    """Prints each recipe name on its own line.
+
+    Parameters:
+        recipe_names (list[str]): The names of the recipes to print.
+    """
+    if len(recipe_names) == 0:
+        print("No recipes found.")
+        return
+    print("\n".join(recipe_names))
 
 
 def sanitise_command(command: str) -> str:
     """Returns a cleaned command string with numbers and whitespace removed.
 
-    Loops through the characters in the command string, if the character is a
-    digit it is skipped otherwise the character is appended to a list,
-    the list is then joined back to a string and stripped of any
-    leading/trailing whitespace.
+    Uses commands.sanitise, which removes the digits with a single
+    str.translate, then strips any leading/trailing whitespace and lowers the
+    case.
 
     Parameters:
         command (str): The command to sanitise
@@ -425,50 +519,16 @@ def sanitise_command(command: str) -> str:
         >>> command
         "add chocolate brownies"
     """
-    return ("".join("" if char.isdigit() else char for char in
-                    command).strip().lower())
-
+    return commands.sanitise(command)
 
-def process_command(command: str, condition: int) -> any:
-    """Takes in a command collected from the user and processes/cleans it.
 
-    Takes in a command string and condition, depending on the condition the
-    command string is manipulated differently and then returned for further
-    processing.
-
-    Parameters:
-        command (str): The command to process.
-        condition (int): The case in which the command was collected,
-            to determine what to do with the command. Condition can take on
-            three states:
-            condition = 0: Adding/removing a recipe to/from recipes.
-            condition = 1: Removing or decreasing an ingredient from the
-            shopping list.
+def default_cook_book() -> dict[str, str]:
+    """Returns the cook book every new session starts with.
 
     Returns:
-        Anything depending on the command it is processing, these include;
+        A dictionary of recipe name -> ingredients.
     """
-    command = command.lower()
-    match condition:
-        case 0:  # adding/removing recipes
-            command = sanitise_command(command=command)
-            recipe_name = command.split(" ", maxsplit=1)[1]
-            return recipe_name
-        case 1:  # removing items from the shopping list
-            command = command.removeprefix("rm -i").strip()
-            name, amount = command.rsplit(" ", maxsplit=1)
-            return name.strip(), amount.strip()
-
-
-def main():
-    """Handles all high level user interactions.
-
-    All top level commands are handled by this function and any sub-commands
-    are handled by other functions. Also holds user info such as the cook
-    book, recipes and shopping list.
-    """
-    # cook book
-    cook_book = {
+    return {
         CHOCOLATE_PEANUT_BUTTER_SHAKE[0]: CHOCOLATE_PEANUT_BUTTER_SHAKE[1],
         BROWNIE[0]: BROWNIE[1],
         SEITAN[0]: SEITAN[1],
@@ -477,62 +537,522 @@ def main():
         MUNG_BEAN_OMELETTE[0]: MUNG_BEAN_OMELETTE[1]
     }
 
-    # Write the rest of your code here
-    recipes = list()
-    shopping_list = list()
-    while True:
-        user_input = input("Please enter a command: ")
-        user_input = user_input.strip()
-        sani_command = sanitise_command(user_input)
 
-        if sani_command == "q":
-            return
+class CookBook:
+    """A cook book and the ingredient and name indexes built over it.
+
+    Holds everything about the recipes which doesn't belong to one session,
+    so many MealPlanners (e.g. the sessions of server.py) can share one cook
+    book, and the indexes are only built once.
+    """
 
-        elif sani_command == "h":
-            display_help()
+    def __init__(self, recipes: MutableMapping[str, str] | None = None) -> \
+            None:
+        """Initialises an instance of CookBook.
+
+        Parameters:
+            recipes (MutableMapping[str, str] | None): Recipe name ->
+                ingredients, e.g. a CookBookView. If None the
+                default_cook_book is used.
+        """
+        self._recipes = default_cook_book() if recipes is None else recipes
+        self._ingredient_index = IngredientIndex(parse=INGREDIENT_CACHE.get,
+                                                 source=self._recipes)
+        self._name_search = NameSearch(source=self._recipes)
+
+    def __len__(self) -> int:
+        """Returns the number of recipes in the cook book."""
+        recipes = self._recipes
+        if isinstance(recipes, ChainMap):  # Avoids ChainMap building a set
+            added, compiled = recipes.maps
+            return len(compiled) + sum(name not in compiled for name in added)
+        return len(recipes)
+
+    def get_recipes(self) -> MutableMapping[str, str]:
+        """Returns the recipe name -> ingredients mapping."""
+        return self._recipes
+
+    def get_ingredient_index(self) -> IngredientIndex:
+        """Returns the index of recipes by ingredient."""
+        return self._ingredient_index
+
+    def get_name_search(self) -> NameSearch:
+        """Returns the fuzzy index of recipe names."""
+        return self._name_search
+
+    def index_recipe(self, recipe: tuple[str, str]) -> None:
+        """Adds a recipe already put in the cook book to the indexes."""
+        self._ingredient_index.add_recipe(recipe)
+        self._name_search.add(recipe[0])
+
+    def add_recipe(self, recipe: tuple[str, str]) -> None:
+        """Adds (or replaces) a recipe in the cook book and its indexes.
+
+        Raises:
+            ValueError: If an ingredient can't be parsed, nothing is changed.
+        """
+        # Parsed first, as sessions sharing the cook book must never see a
+        # recipe the indexes can't hold.
+        INGREDIENT_CACHE.get(recipe[1])
+        self._recipes[recipe[0]] = recipe[1]
+        self.index_recipe(recipe)
+
+
+def load_cook_book(filename: str) -> CookBook:
+    """Opens a compiled cook book (see binary_cook_book.py).
+
+    The file is memory mapped rather than read, recipes made or imported
+    during the session are kept in a dictionary in front of it.
 
-        elif sani_command.startswith("add "):
-            recipe_name = process_command(command=user_input, condition=0)
-            if recipe_name not in cook_book:
-                print("\nRecipe does not exist in the cook book. ")
-                print("Use the mkrec command to create a new recipe.\n")
-                continue
+    Parameters:
+        filename (str): The file written by compile_cook_book.
 
-            recipe = (recipe_name, cook_book[recipe_name])
-            add_recipe(new_recipe=recipe, recipes=recipes)
+    Returns:
+        The cook book.
+    """
+    return CookBook(ChainMap(dict(), BinaryCookBook(filename)))
 
-        elif sani_command.startswith("rm -i"):
-            name, amount = process_command(user_input, condition=1)
-            remove_from_shopping_list(ingredient_name=name,
-                                      amount=float(amount),
-                                      shopping_list=shopping_list)
 
-        elif sani_command.startswith("rm "):
-            recipe_name = process_command(command=user_input, condition=0)
-            remove_recipe(name=recipe_name,
-                          recipes=recipes)
+class MealPlanner:
+    """Holds the state of one meal planning session and runs its commands.
 
-        elif sani_command == "g":
-            shopping_list = generate_shopping_list(recipes=recipes)
-            display_ingredients(shopping_list=shopping_list)
+    The meal plan (recipes) and shopping list live here so the same commands
+    can be run from the interactive prompt in main, from a batch of commands
+    in run_batch or by each session of server.py. The cook book is a
+    CookBook, which may be shared between planners.
+    """
 
-        elif sani_command == "ls":
-            if len(recipes) == 0:
-                print("No recipe in meal plan yet.")
-            else:
-                print(recipes)
+    def __init__(self, database: str | None = None,
+                 read_input: Callable[[str], str] = input,
+                 cook_book: CookBook | None = None,
+                 stats: CommandStats | None = None,
+                 stats_file: str | None = None,
+                 preferred_units: dict[str, str] | None = None) -> None:
+        """Initialises an instance of MealPlanner.
+
+        Parameters:
+            database (str | None): A SQLite file to load the cook book, meal
+                plan and shopping list from and save them to. If None nothing
+                is saved.
+            read_input (Callable[[str], str]): Used to read the extra lines
+                the mkrec command asks for, called with the prompt.
+            cook_book (CookBook | None): The cook book to share, if None (and
+                there is no database) a new default cook book is used.
+            stats (CommandStats | None): Where to record how long each
+                command takes, if None (and there is no stats_file) commands
+                aren't timed.
+            stats_file (str | None): A JSON file to write the command
+                statistics to when the session is closed.
+            preferred_units (dict[str, str] | None): Units to show each
+                dimension of the shopping list in, e.g. {"volume": "ml"},
+                see parse_preferred_units. If None the units each
+                ingredient was first seen in are used.
+
+        Raises:
+            ValueError: If both a database and a cook book are given.
+        """
+        if database is not None and cook_book is not None:
+            raise ValueError("A planner with a database uses its cook book")
+        self._read_input = read_input
+        if stats is None and stats_file is not None:
+            stats = CommandStats()
+        self._stats = stats
+        self._stats_file = stats_file
+
+        self._store = None
+        if database is not None:
+            self._store = CookBookStore(filename=database,
+                                        parse_ingredient=parse_ingredient)
+            recipes = self._store.get_cook_book()
+            if next(iter(recipes), None) is None:  # Seeds a new database
+                recipes.update(default_cook_book())
+            cook_book = CookBook(recipes)
+            self._recipes = RecipeIndex(self._store.get_meal_plan())
+            # Summed by the database rather than parsing the meal plan again
+            self._shopping_list = RunningShoppingList(
+                parse=INGREDIENT_CACHE.get,
+                preferred_units=preferred_units,
+                adjustments=self._store.get_adjustments(),
+                groups=self._store.get_shopping_groups())
+        else:
+            if cook_book is None:
+                cook_book = CookBook()
+            self._recipes = RecipeIndex()
+            # Kept up to date by add, rm and rm -i rather than rebuilt by g
+            self._shopping_list = RunningShoppingList(
+                parse=INGREDIENT_CACHE.get, preferred_units=preferred_units)
+        self._pantry = Pantry()
+        self._shared = cook_book
+        self._cook_book = cook_book.get_recipes()
+        self._ingredient_index = cook_book.get_ingredient_index()
+        self._name_search = cook_book.get_name_search()
+
+    def _add_to_meal_plan(self, recipe: tuple[str, str]) -> None:
+        """Adds a recipe to the meal plan and its shopping list.
+
+        Raises:
+            ValueError: If an ingredient can't be parsed, nothing is added.
+        """
+        # First, so nothing is changed if the recipe can't be parsed
+        self._shopping_list.add_recipe(recipe)
+        add_recipe(new_recipe=recipe, recipes=self._recipes)
+        if self._store is not None:
+            self._store.add_to_meal_plan(recipe[0])
+
+    def _suggest(self, recipe_name: str,
+                 accept: Callable[[str], bool]) -> None:
+        """Prints the recipes with names closest to a mistyped recipe_name.
+
+        Names are suggested as the RECIPE_NAME argument would read them
+        (lower case, digits removed), and only if accept is True for that,
+        so typing a suggestion always finds the recipe.
+        """
+        suggestions = list(dict.fromkeys(
+            commands.sanitise(name) for name in self._name_search.suggest(
+                recipe_name,
+                accept=lambda name: accept(commands.sanitise(name)))))
+        if suggestions:
+            print(f"Did you mean: {', '.join(suggestions)}?")
+
+    def get_sizes(self) -> dict[str, int]:
+        """Returns the number of recipes in the meal plan, ingredients on the
+        shopping list and recipes in the cook book.
+        """
+        return {"recipes": len(self._recipes),
+                "shopping list": len(self._shopping_list),
+                "cook book": len(self._shared)}
+
+    def close(self) -> None:
+        """Saves the session (if it has a database) and closes it."""
+        if self._stats_file is not None:
+            self._stats.dump(self._stats_file, self.get_sizes())
+            self._stats_file = None
+        if self._store is not None:
+            self._store.save_adjustments(
+                self._shopping_list.get_adjustments())
+            self._store.close()
+            self._store = None
+
+    def execute(self, user_input: str) -> bool:
+        """Runs a single command, printing its output.
+
+        Parameters:
+            user_input (str): The command, as typed by the user.
+
+        Returns:
+            False if the command was q (and the session has been closed),
+            otherwise True.
+        """
+        try:
+            command = commands.parse_command(user_input)
+        except commands.CommandError as error:
+            print(f"\n{error}\n")
+            return True
+        if command is None:
+            return True
+
+        if self._stats is None:
+            return self._run(command)
+        start = time.perf_counter()
+        try:
+            return self._run(command)
+        finally:
+            self._stats.record(command.kind, time.perf_counter() - start)
+
+    def _run(self, command: commands.Command) -> bool:
+        """Runs a parsed command, see execute."""
+        cook_book = self._cook_book
+        recipes = self._recipes
+        store = self._store
+        ingredient_index = self._ingredient_index
+
+        match command.kind:
+            case commands.QUIT:
+                self.close()
+                return False
+
+            case commands.HELP:
+                display_help()
+
+            case commands.ADD:
+                recipe_name = command.argument
+                if recipe_name not in cook_book:
+                    print("\nRecipe does not exist in the cook book. ")
+                    self._suggest(recipe_name,
+                                  accept=lambda name: name in cook_book)
+                    print("Use the mkrec command to create a new recipe.\n")
+                    return True
+
+                try:
+                    self._add_to_meal_plan(
+                        (recipe_name, cook_book[recipe_name]))
+                except ValueError as error:
+                    print(f"\nCould not add {recipe_name}: {error}\n")
+
+            case commands.REMOVE_INGREDIENT:
+                try:
+                    self._shopping_list.decrease(
+                        ingredient_name=command.argument,
+                        amount=command.amount, units=command.units)
+                except ValueError as error:
+                    print(f"\n{error}\n")
+
+            case commands.REMOVE:
+                recipe = find_recipe(recipe_name=command.argument,
+                                     recipes=recipes)
+                if recipe is None:
+                    self._suggest(command.argument, accept=lambda name:
+                                  find_recipe(name, recipes) is not None)
+                    return True
+                remove_recipe(name=command.argument, recipes=recipes)
+                self._shopping_list.remove_recipe(recipe)
+                if store is not None:
+                    store.remove_from_meal_plan(command.argument)
+
+            case commands.GENERATE:
+                display_ingredients(
+                    shopping_list=self._shopping_list.get_items(),
+                    limit=command.limit, offset=command.offset)
+
+            case commands.GENERATE_NET:
+                display_ingredients(
+                    shopping_list=self._pantry.net(
+                        self._shopping_list.get_items()),
+                    limit=command.limit, offset=command.offset)
+
+            case commands.PANTRY:
+                filename = command.argument
+                try:
+                    added = self._pantry.load(
+                        filename=filename, parse_ingredient=parse_ingredient)
+                except OSError as error:
+                    print(f"\nCould not load {filename}: {error}\n")
+                    return True
+                print(f"Added {added} ingredients to the pantry.")
+
+            case commands.PLAN:
+                words = command.argument.split()
+                objective = words[1] if len(words) == 2 else INGREDIENTS
+                if not words[0].isdecimal() or len(words) > 2 or \
+                        objective not in (INGREDIENTS, QUANTITY):
+                    print("\nUsage: plan {meals} [ingredients|quantity]\n")
+                    return True
+                try:
+                    plan, cost, optimal = optimise_meal_plan(
+                        cook_book=cook_book, meals=int(words[0]),
+                        parse=INGREDIENT_CACHE.get, pantry=self._pantry,
+                        objective=objective)
+                except ValueError as error:
+                    print(f"\n{error}\n")
+                    return True
+                for recipe in plan:
+                    self._add_to_meal_plan(recipe)
+                    print(f"Added {get_recipe_name(recipe)}")
+                print(f"{objective.capitalize()} to buy: {cost:g}"
+                      f"{'' if optimal else ' (best found in time)'}")
+
+            case commands.LIST:
+                if len(recipes) == 0:
+                    print("No recipe in meal plan yet.")
+                else:
+                    print(recipes)
+
+            case commands.LIST_RECIPES:
+                for key in cook_book:
+                    print(key)
+
+            case commands.LIST_SHOPPING:
+                display_ingredients(
+                    shopping_list=self._shopping_list.get_items(),
+                    limit=command.limit, offset=command.offset)
+
+            case commands.MAKE_RECIPE:
+                recipe = create_recipe(read_input=self._read_input)
+                try:
+                    self._shared.add_recipe(recipe)
+                except ValueError:
+                    print(f"\nCould not make {get_recipe_name(recipe)}, "
+                          f"ingredients must be {{amount}} {{units}} "
+                          f"{{name}}, e.g. 300 g peanuts.\n")
+
+            case commands.IMPORT:
+                filename = command.argument
+                try:
+                    stats = import_recipes(
+                        filename=filename, cook_book=cook_book,
+                        parse_ingredient=parse_ingredient,
+                        on_import=self._shared.index_recipe)
+                except (OSError, ValueError) as error:
+                    print(f"\nCould not import {filename}: {error}\n")
+                    return True
+                if store is not None:
+                    store.commit()
+                print(f"Imported {stats['imported']} recipes "
+                      f"({stats['rejected']} rejected) in "
+                      f"{stats['seconds']:.2f}s, "
+                      f"{stats['rows per second']:.0f} rows/sec.")
+
+            case commands.USES:
+                ingredients = [ingredient.strip() for ingredient in
+                               command.argument.split(",")]
+                display_recipe_names(
+                    ingredient_index.recipes_using_all(ingredients))
+
+            case commands.COOK:
+                try:
+                    pantry = parse_raw_ingredients(command.argument)
+                except ValueError:
+                    print("\nIngredients must be of the form "
+                          "{amount} {units} {name}.\n")
+                    return True
+                display_recipe_names(ingredient_index.cookable(pantry))
+
+            case commands.STATS:
+                if self._stats is None:
+                    print("\nCommands aren't being timed, start with --stats "
+                          "to time them.\n")
+                    print(", ".join(f"{name}: {size}" for name, size in
+                                    self.get_sizes().items()))
+                else:
+                    self._stats.display(self.get_sizes())
+
+        return True
+
+
+def main(database: str | None = None, cook_book: CookBook | None = None,
+         stats: CommandStats | None = None, stats_file: str | None = None,
+         preferred_units: dict[str, str] | None = None):
+    """Handles all high level user interactions.
 
-        elif sani_command == "ls -a":
-            for key in cook_book:
-                print(key)
+    All top level commands are handled by this function and any sub-commands
+    are handled by other functions. The cook book, recipes and shopping list
+    are held by a MealPlanner.
 
-        elif sani_command == "ls -s":
-            display_ingredients(shopping_list=shopping_list)
+    Parameters:
+        database (str | None): A SQLite file to load the cook book, meal plan
+            and shopping list from and save them to. If None nothing is saved.
+        cook_book (CookBook | None): The cook book to use when there is no
+            database, e.g. from load_cook_book.
+        stats (CommandStats | None): Where to record how long each command
+            takes, None to not time commands.
+        stats_file (str | None): A JSON file to write the command statistics
+            to on q.
+        preferred_units (dict[str, str] | None): Units to show each
+            dimension of the shopping list in, see MealPlanner.
+    """
+    planner = MealPlanner(database=database, cook_book=cook_book,
+                          stats=stats, stats_file=stats_file,
+                          preferred_units=preferred_units)
+    while planner.execute(input("Please enter a command: ")):
+        pass
+
+
+def run_batch(command_lines: Iterable[str], database: str | None = None,
+              json_output: bool = False, output: TextIO = sys.stdout,
+              cook_book: CookBook | None = None,
+              stats: CommandStats | None = None,
+              stats_file: str | None = None,
+              preferred_units: dict[str, str] | None = None) -> None:
+    """Runs a stream of commands without prompting.
+
+    Each command is run by the same MealPlanner.execute as main uses. Lines
+    read by mkrec are taken from the same stream. Output is collected and
+    written to output in chunks of BATCH_FLUSH_SIZE commands, either as the
+    plain text the interactive prompt would print or, if json_output is True,
+    as one JSON object per command of the form
+    {"command": <command>, "output": <printed text>}.
 
-        elif sani_command == "mkrec":
-            key, value = create_recipe()
-            cook_book[key] = value
+    Parameters:
+        command_lines (Iterable[str]): The commands, one per item, e.g. an
+            open file.
+        database (str | None): See main.
+        json_output (bool): Whether to write JSON lines instead of text.
+        output (TextIO): Where to write the output.
+        cook_book (CookBook | None): See main.
+        stats (CommandStats | None): See main.
+        stats_file (str | None): See main.
+        preferred_units (dict[str, str] | None): See main.
+
+    Usage:
+        >>> run_batch(["add peanut butter", "g", "q"])
+        |   2.0 | tsp  | oil      |
+        | 300.0 |  g   | peanuts  |
+        |   0.5 | tsp  | salt     |
+    """
+    lines = (line.rstrip("\r\n") for line in command_lines)
+    planner = MealPlanner(database=database,
+                          read_input=lambda prompt: next(lines, ""),
+                          cook_book=cook_book, stats=stats,
+                          stats_file=stats_file,
+                          preferred_units=preferred_units)
+    buffer = list()
+    running = True
+    for line in lines:
+        with redirect_stdout(io.StringIO()) as captured:
+            running = planner.execute(line)
+        if json_output:
+            buffer.append(json.dumps({"command": line,
+                                      "output": captured.getvalue()}) + "\n")
+        else:
+            buffer.append(captured.getvalue())
+
+        if len(buffer) >= BATCH_FLUSH_SIZE:
+            output.write("".join(buffer))
+            buffer.clear()
+        if not running:
+            break
+    output.write("".join(buffer))
+    output.flush()
+    if running:  # Ran out of commands before a q
+        planner.close()
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Meal planner.")
+    parser.add_argument("--db", default=None,
+                        help="SQLite file to save the cook book, meal plan "
+                             "and shopping list in.")
+    parser.add_argument("--batch", default=None, metavar="FILE",
+                        help="Run the commands in FILE (- for stdin) without "
+                             "prompting.")
+    parser.add_argument("--json", action="store_true",
+                        help="With --batch, print one JSON result per "
+                             "command.")
+    parser.add_argument("--cook-book", default=None, metavar="FILE",
+                        help="Use the compiled cook book in FILE, see "
+                             "binary_cook_book.py. Can't be used with --db.")
+    parser.add_argument("--stats", action="store_true",
+                        help="Time every command, see the stats command.")
+    parser.add_argument("--stats-file", default=None, metavar="FILE",
+                        help="Write the command timings to FILE as JSON on "
+                             "q (implies --stats).")
+    parser.add_argument("--units", nargs="+", default=(), metavar="UNITS",
+                        help="Show shopping list amounts in these units, at "
+                             "most one per dimension, e.g. --units ml g.")
+    args = parser.parse_args()
+    if args.db is not None and args.cook_book is not None:
+        parser.error("--cook-book can't be used with --db")
+    try:
+        preferred_units = parse_preferred_units(args.units)
+    except ValueError as error:
+        parser.error(str(error))
+    cook_book = None
+    if args.cook_book is not None:
+        cook_book = load_cook_book(args.cook_book)
+    stats = CommandStats() if args.stats else None
+    if args.batch is None:
+        main(database=args.db, cook_book=cook_book, stats=stats,
+             stats_file=args.stats_file, preferred_units=preferred_units)
+    elif args.batch == "-":
+        run_batch(sys.stdin, database=args.db, json_output=args.json,
+                  cook_book=cook_book, stats=stats,
+                  stats_file=args.stats_file,
+                  preferred_units=preferred_units)
+    else:
+        with open(args.batch, "r") as batch_file:
+            run_batch(batch_file, database=args.db, json_output=args.json,
+                      cook_book=cook_book, stats=stats,
+                      stats_file=args.stats_file,
+                      preferred_units=preferred_units)
@@ -0,0 +1,481 @@
+"""
+Unit normalising shopping list aggregation.
+
+Amounts are converted into a base unit for their dimension (ml for volume,
+g for mass and single items for counts) before being summed, so "1 tbsp" and
+"1 tsp" of the same ingredient add up to "4.0 tsp" rather than "2.0 tbsp".
+Units which are not in UNIT_CONVERSIONS (e.g. "large" or "stalk") are their
+own dimension and are only ever summed with themselves.
+
+NumPy is used for the reduction when it is installed, otherwise an
+equivalent pure Python reduction is used. Meal plans with at least
+PARALLEL_THRESHOLD distinct recipes are split into shards which are parsed
+and summed in a process pool, and the partial sums are merged.
+
+RunningShoppingList keeps the same sums up to date as recipes are added to
+and removed from a meal plan, so the shopping list never has to be rebuilt.
+"""
+
+import os
+from collections import Counter
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+VOLUME = "volume"
+MASS = "mass"
+COUNT = "count"
+
+# units -> (dimension, size of one unit in the dimensions base unit)
+UNIT_CONVERSIONS: dict[str, tuple[str, float]] = {
+    "ml": (VOLUME, 1.0),
+    "l": (VOLUME, 1000.0),
+    "tsp": (VOLUME, 5.0),
+    "tbsp": (VOLUME, 15.0),
+    "cup": (VOLUME, 240.0),
+    "mg": (MASS, 0.001),
+    "g": (MASS, 1.0),
+    "kg": (MASS, 1000.0),
+    "oz": (MASS, 28.349523125),
+    "lb": (MASS, 453.59237),
+    "each": (COUNT, 1.0),
+    "pc": (COUNT, 1.0),
+    "pcs": (COUNT, 1.0),
+    "dozen": (COUNT, 12.0),
+}
+
+# Totals are rounded to this many decimal places to hide conversion noise
+# such as 0.30000000000000004.
+AMOUNT_PRECISION = 9
+
+# Number of distinct recipes in a meal plan before parsing them in a process
+# pool is faster than starting the pool.
+PARALLEL_THRESHOLD = 50000
+# Shards handed to each worker process, more shards balance the load better.
+SHARDS_PER_WORKER = 4
+
+
+def normalise_unit(units: str) -> tuple[str, float]:
+    """Returns the dimension of units and the size of one unit in its base.
+
+    Parameters:
+        units (str): The units of an ingredient, e.g. "tbsp".
+
+    Returns:
+        A tuple of (dimension, factor), units which can't be converted are
+        their own dimension with a factor of 1.0.
+
+    Usage:
+        >>> normalise_unit("tbsp")
+        ('volume', 15.0)
+        >>> normalise_unit("large")
+        ('large', 1.0)
+    """
+    units = units.casefold()
+    return UNIT_CONVERSIONS.get(units, (units, 1.0))
+
+
+def parse_preferred_units(units: Iterable[str]) -> dict[str, str]:
+    """Turns a list of units into the preferred units for their dimensions.
+
+    Parameters:
+        units (Iterable[str]): Units to display amounts in, at most one for
+            each dimension, e.g. ["ml", "g"].
+
+    Returns:
+        The preferred units, dimension -> units, as taken by
+        aggregate_shopping_list and RunningShoppingList.
+
+    Raises:
+        ValueError: If units can't be converted to, or two units share a
+            dimension.
+
+    Usage:
+        >>> parse_preferred_units(["tbsp", "G"])
+        {'volume': 'tbsp', 'mass': 'g'}
+    """
+    preferred_units = dict()
+    for unit in units:
+        unit = unit.casefold()
+        if unit not in UNIT_CONVERSIONS:
+            raise ValueError(f"Can't convert amounts to {unit!r}, units must "
+                             f"be one of {', '.join(UNIT_CONVERSIONS)}")
+        dimension = UNIT_CONVERSIONS[unit][0]
+        if dimension in preferred_units:
+            raise ValueError(f"Both {preferred_units[dimension]!r} and "
+                             f"{unit!r} are units of {dimension}")
+        preferred_units[dimension] = unit
+    return preferred_units
+
+
+def aggregate_shopping_list(
+        recipes: Iterable[tuple[str, str]],
+        parse: Callable[[str], tuple[tuple[float, str, str]]],
+        preferred_units: dict[str, str] | None = None,
+        workers: int | None = None,
+        parallel_threshold: int = PARALLEL_THRESHOLD
+) -> list[tuple[float, str, str]]:
+    """Sums the ingredients of every recipe in a meal plan.
+
+    Ingredients are grouped by (casefolded name, dimension). Each group is
+    displayed in preferred_units[dimension] if it is given, otherwise in the
+    units the group was first seen in. Groups are returned in the order they
+    were first seen.
+
+    Every distinct recipe is only parsed once, the meal plan is reduced to a
+    count per distinct recipe and the parsed rows are weighted by that count.
+    If there are at least parallel_threshold distinct recipes they are
+    parsed and summed by parallel_aggregate instead.
+
+    Parameters:
+        recipes (Iterable[tuple[str, str]]): The meal plan.
+        parse (Callable[[str], tuple]): Function parsing the ingredient
+            string of a recipe, e.g. INGREDIENT_CACHE.get from a1.py.
+        preferred_units (dict[str, str] | None): Units to display each
+            dimension in, e.g. {"volume": "ml"}.
+        workers (int | None): Number of worker processes to use for large
+            meal plans, None for one per CPU and 1 to never use a pool (a
+            pool is never used on a single CPU).
+        parallel_threshold (int): Number of distinct recipes at which the
+            process pool is used.
+
+    Returns:
+        A list of ingredients of the form (amount, units, name).
+
+    Usage:
+        >>> aggregate_shopping_list([("tea", "1 tbsp sugar,1 tsp sugar")],
+        INGREDIENT_CACHE.get)
+        [(4.0, 'tsp', 'sugar')]
+    """
+    preferred_units = preferred_units or dict()
+    recipe_counts = Counter(recipe[1] for recipe in recipes)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(recipe_counts) >= parallel_threshold:
+        return parallel_aggregate(list(recipe_counts.items()), parse,
+                                  preferred_units, workers)
+
+    # Columns, one row per ingredient of each distinct recipe.
+    group_ids: list[int] = list()
+    base_amounts: list[float] = list()
+    weights: list[int] = list()
+
+    groups: dict[tuple[str, str], int] = dict()
+    group_units: list[tuple[str, float]] = list()
+    group_names: list[str] = list()
+    for raw_ingredients, count in recipe_counts.items():
+        for amount, units, name in parse(raw_ingredients):
+            dimension, factor = normalise_unit(units)
+            key = (name.casefold(), dimension)
+            if (group_id := groups.get(key)) is None:
+                group_id = groups[key] = len(group_names)
+                display = preferred_units.get(dimension, units)
+                group_units.append((display, normalise_unit(display)[1]))
+                group_names.append(name)
+            group_ids.append(group_id)
+            base_amounts.append(amount * factor)
+            weights.append(count)
+
+    totals = _reduce(group_ids, base_amounts, weights, len(group_names))
+    return [
+        (round(total / factor, AMOUNT_PRECISION), units, name)
+        for total, (units, factor), name in zip(totals, group_units,
+                                                 group_names)
+    ]
+
+
+def _reduce(group_ids: list[int], base_amounts: list[float],
+            weights: list[int], group_count: int) -> list[float]:
+    """Sums base_amounts * weights for each group id.
+
+    Parameters:
+        group_ids (list[int]): The group of each row.
+        base_amounts (list[float]): The amount of each row in base units.
+        weights (list[int]): How many times each row appears in the plan.
+        group_count (int): The number of groups.
+
+    Returns:
+        The total of each group, indexed by group id.
+    """
+    if np is not None:
+        return np.bincount(
+            np.asarray(group_ids, dtype=np.int64),
+            weights=(np.asarray(base_amounts, dtype=np.float64) *
+                     np.asarray(weights, dtype=np.float64)),
+            minlength=group_count
+        ).tolist()
+
+    totals = [0.0] * group_count
+    for group_id, amount, weight in zip(group_ids, base_amounts, weights):
+        totals[group_id] += amount * weight
+    return totals
+
+
+def _aggregate_shard(
+        shard: tuple[list[tuple[str, int]],
+                     Callable[[str], tuple[tuple[float, str, str]]],
+                     dict[str, str]]
+) -> dict[tuple[str, str], list]:
+    """Parses and sums one shard of a meal plan, run in a worker process.
+
+    Parameters:
+        shard (tuple): The (ingredient string, count) pairs of the shard, the
+            parse function and the preferred units.
+
+    Returns:
+        A dictionary, in the order groups were first seen, mapping
+        (casefolded name, dimension) to [name, display units, base total].
+    """
+    recipe_counts, parse, preferred_units = shard
+    groups: dict[tuple[str, str], list] = dict()
+    for raw_ingredients, count in recipe_counts:
+        for amount, units, name in parse(raw_ingredients):
+            dimension, factor = normalise_unit(units)
+            key = (name.casefold(), dimension)
+            if (group := groups.get(key)) is None:
+                group = groups[key] = [
+                    name, preferred_units.get(dimension, units), 0.0]
+            group[2] += amount * factor * count
+    return groups
+
+
+def parallel_aggregate(
+        recipe_counts: list[tuple[str, int]],
+        parse: Callable[[str], tuple[tuple[float, str, str]]],
+        preferred_units: dict[str, str],
+        workers: int | None = None
+) -> list[tuple[float, str, str]]:
+    """Sums a meal plan by sharding its distinct recipes across processes.
+
+    The shards are contiguous runs of recipe_counts, so merging the partial
+    sums shard by shard keeps groups in the order they were first seen and
+    gives the same list as the serial aggregation.
+
+    Parameters:
+        recipe_counts (list[tuple[str, int]]): Each distinct ingredient
+            string in the meal plan and how many times it's used, in the
+            order they first appear.
+        parse (Callable[[str], tuple]): Function parsing an ingredient
+            string, it must be picklable.
+        preferred_units (dict[str, str]): Units to display each dimension in.
+        workers (int | None): Number of worker processes, None for one per
+            CPU.
+
+    Returns:
+        A list of ingredients of the form (amount, units, name).
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_count = workers * SHARDS_PER_WORKER
+    shard_size = -(-len(recipe_counts) // shard_count)  # Rounds up
+    shards = [(recipe_counts[start:start + shard_size], parse, preferred_units)
+              for start in range(0, len(recipe_counts), shard_size)]
+
+    merged: dict[tuple[str, str], list] = dict()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for groups in executor.map(_aggregate_shard, shards):
+            for key, (name, units, total) in groups.items():
+                if (group := merged.get(key)) is None:
+                    merged[key] = [name, units, total]
+                else:
+                    group[2] += total
+
+    return [
+        (round(total / normalise_unit(units)[1], AMOUNT_PRECISION), units,
+         name)
+        for name, units, total in merged.values()
+    ]
+
+
+class RunningShoppingList:
+    """The shopping list of a meal plan, kept up to date as it changes.
+
+    Each (casefolded name, dimension) group holds its total in base units and
+    the number of meal plan ingredients adding to it. Adding or removing a
+    recipe only touches the groups of its own ingredients, and a group is
+    dropped once nothing adds to it, so its total never drifts away from 0.
+    Every group is its own row, the same as aggregate_shopping_list, so
+    "2 large onion" and "100 g onion" stay apart.
+
+    Amounts taken off by hand (rm -i) are kept apart from the totals, as base
+    units taken off each group, so they are not lost when recipes are added
+    or removed. Reading the list costs O(distinct ingredients) and the result
+    is cached until the next change.
+
+    Groups are in the order they were first added and keep the units they
+    were first seen in (or the preferred units for their dimension), even if
+    the recipe which added them first is later removed.
+    """
+
+    def __init__(self,
+                 parse: Callable[[str], tuple[tuple[float, str, str]]],
+                 recipes: Iterable[tuple[str, str]] = (),
+                 preferred_units: dict[str, str] | None = None,
+                 adjustments: dict[tuple[str, str], float] | None = None,
+                 groups: Iterable[tuple[str, str, str, float, int]] = ()) \
+            -> None:
+        """Initialises an instance of RunningShoppingList.
+
+        Parameters:
+            parse (Callable[[str], tuple]): Function parsing the ingredient
+                string of a recipe, e.g. INGREDIENT_CACHE.get from a1.py.
+            recipes (Iterable[tuple[str, str]]): The meal plan to start with.
+            preferred_units (dict[str, str] | None): Units to display each
+                dimension in, e.g. {"volume": "ml"}.
+            adjustments (dict[tuple[str, str], float] | None): Amounts
+                already taken off by hand, as returned by get_adjustments.
+            groups (Iterable[tuple[str, str, str, float, int]]): Groups
+                already summed, (name, units, dimension, base total, uses) in
+                the order they were first seen, e.g. from
+                CookBookStore.get_shopping_groups. Added before recipes.
+
+        Usage:
+            >>> shopping_list = RunningShoppingList(INGREDIENT_CACHE.get,
+            [PEANUT_BUTTER])
+            >>> shopping_list.decrease("salt", 0.25)
+            >>> shopping_list.add_recipe(PEANUT_BUTTER)
+            >>> shopping_list.get_items()
+            [(600.0, 'g', 'peanuts'), (0.75, 'tsp', 'salt'), (4.0, 'tsp', 'oil')]
+        """
+        self._parse = parse
+        self._preferred_units = preferred_units or dict()
+        # (casefolded name, dimension) -> [name, units, factor, total, uses]
+        self._groups: dict[tuple[str, str], list] = dict()
+        # casefolded name -> dimensions it has a group in, in list order
+        self._dimensions: dict[str, list[str]] = dict()
+        # (casefolded name, dimension) -> base units taken off by hand
+        self._adjustments: dict[tuple[str, str], float] = dict(
+            adjustments or dict())
+        self._items = None
+        for name, units, dimension, total, uses in groups:
+            group = self._get_group(name, units, dimension)
+            group[3] += total
+            group[4] += uses
+        for recipe in recipes:
+            self.add_recipe(recipe)
+
+    def __len__(self) -> int:
+        """Returns the number of ingredients on the shopping list."""
+        return len(self.get_items())
+
+    def _get_group(self, name: str, units: str, dimension: str) -> list:
+        """Returns the group of name in dimension, making it if needed."""
+        key = (name.casefold(), dimension)
+        if (group := self._groups.get(key)) is None:
+            display = self._preferred_units.get(dimension, units)
+            group = self._groups[key] = [name, display,
+                                         normalise_unit(display)[1], 0.0, 0]
+            self._dimensions.setdefault(key[0], []).append(dimension)
+        return group
+
+    def add_recipe(self, recipe: tuple[str, str]) -> None:
+        """Adds the ingredients of a recipe added to the meal plan.
+
+        Parameters:
+            recipe (tuple[str, str]): The recipe, (name, ingredients).
+
+        Raises:
+            ValueError: If an ingredient can't be parsed, nothing is added.
+        """
+        # Parsed in full before any group changes
+        ingredients = self._parse(recipe[1])
+        for amount, units, name in ingredients:
+            dimension, factor = normalise_unit(units)
+            group = self._get_group(name, units, dimension)
+            group[3] += amount * factor
+            group[4] += 1
+        self._items = None
+
+    def remove_recipe(self, recipe: tuple[str, str]) -> None:
+        """Takes away the ingredients of a recipe removed from the meal plan.
+
+        The recipe must have been added with add_recipe.
+
+        Parameters:
+            recipe (tuple[str, str]): The recipe, (name, ingredients).
+        """
+        groups = self._groups
+        for amount, units, name in self._parse(recipe[1]):
+            dimension, factor = normalise_unit(units)
+            key = (name.casefold(), dimension)
+            group = groups[key]
+            group[3] -= amount * factor
+            group[4] -= 1
+            if group[4] == 0:
+                del groups[key]
+                # Nothing is left to take the amount off
+                self._adjustments.pop(key, None)
+                dimensions = self._dimensions[key[0]]
+                dimensions.remove(dimension)
+                if not dimensions:
+                    del self._dimensions[key[0]]
+        self._items = None
+
+    def decrease(self, ingredient_name: str, amount: float,
+                 units: str | None = None) -> None:
+        """Takes amount off an ingredient by hand.
+
+        Does nothing if the ingredient is not on the shopping list. No more
+        than the amount on the list is taken off, so buying extra now doesn't
+        hide recipes added later.
+
+        Parameters:
+            ingredient_name (str): The name of the ingredient.
+            amount (float): The amount to take away.
+            units (str | None): The units of amount, which pick the row if
+                the ingredient is listed in more than one dimension. If None
+                amount is in the units shown.
+
+        Raises:
+            ValueError: If units is None and the ingredient is listed in more
+                than one dimension.
+        """
+        name = ingredient_name.casefold()
+        if units is None:
+            dimensions = self._dimensions.get(name, ())
+            if len(dimensions) > 1:
+                shown = ", ".join(self._groups[(name, dimension)][1]
+                                  for dimension in dimensions)
+                raise ValueError(f"{ingredient_name} is listed in more than "
+                                 f"one unit ({shown}), give the units to "
+                                 f"take off")
+            if not dimensions:
+                return
+            key = (name, dimensions[0])
+            factor = self._groups[key][2]
+        else:
+            dimension, factor = normalise_unit(units)
+            key = (name, dimension)
+        if (group := self._groups.get(key)) is None:
+            return
+        taken = self._adjustments.get(key, 0.0)
+        self._adjustments[key] = taken + \
+            max(0.0, min(amount * factor, group[3] - taken))
+        self._items = None
+
+    def get_adjustments(self) -> dict[tuple[str, str], float]:
+        """Returns the base units taken off each (casefolded name,
+        dimension) by hand."""
+        return dict(self._adjustments)
+
+    def get_items(self) -> list[tuple[float, str, str]]:
+        """Returns the shopping list, it must not be changed.
+
+        One (amount, units, name) row per group, less the amount taken off
+        by hand, the same as aggregate_shopping_list gives for the meal plan
+        when nothing has been taken off.
+        """
+        if self._items is not None:
+            return self._items
+
+        adjustments = self._adjustments
+        items = list()
+        for key, (name, units, factor, total, _) in self._groups.items():
+            amount = round((total - adjustments.get(key, 0.0)) / factor,
+                           AMOUNT_PRECISION)
+            if amount > 0:
+                items.append((amount, units, name))
+        self._items = items
+        return items
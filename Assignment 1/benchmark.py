@@ -0,0 +1,284 @@
+"""
+Benchmarks a1.py against the 2023 sem 1 rewrite.
+
+Generates synthetic cook books, meal plans and shopping lists of growing
+size, times each public function of both implementations on the same data,
+checks they give equal results and writes a scaling report (best time and
+peak memory against n) as JSON and/or CSV.
+
+Usage:
+    python benchmark.py --sizes 100 1000 5000 --json report.json --csv report.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import a1
+
+REWRITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            os.pardir, "2023 sem 1 - rewrite", "A1", "a1.py")
+DEFAULT_SIZES = (100, 1000, 5000)
+# Number of lookups/removals timed for the per item functions.
+QUERIES = 200
+UNITS = ("g", "ml", "tsp", "tbsp", "cup", "large")
+
+
+def load_rewrite():
+    """Imports the rewrite's a1.py under the name a1_rewrite."""
+    spec = importlib.util.spec_from_file_location("a1_rewrite", REWRITE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _word(number: int) -> str:
+    """Returns a digit free name for number, e.g. 0 -> "a", 27 -> "bb"."""
+    letters = list()
+    while True:
+        number, remainder = divmod(number, 26)
+        letters.append(chr(ord("a") + remainder))
+        if number == 0:
+            return "".join(reversed(letters))
+        number -= 1
+
+
+def make_data(n: int, seed: int = 1001) -> dict:
+    """Generates a cook book, meal plan and shopping list of size n.
+
+    Each ingredient name always uses the same units, so both implementations
+    (one of which converts units) should agree on every result.
+    """
+    rng = random.Random(seed)
+    ingredient_names = [f"ingredient {_word(i)}" for i in range(max(20, n // 5))]
+    ingredient_units = {name: rng.choice(UNITS) for name in ingredient_names}
+
+    cook_book = list()
+    for i in range(n):
+        ingredients = rng.sample(ingredient_names, k=rng.randint(3, 10))
+        cook_book.append((
+            f"recipe {_word(i)}",
+            ",".join(f"{rng.randint(1, 40) / 4} {ingredient_units[name]} "
+                     f"{name}" for name in ingredients)))
+    meal_plan = [rng.choice(cook_book) for _ in range(n)]
+    shopping_items = [(rng.randint(1, 40) / 4, ingredient_units[name], name)
+                      for name in rng.choices(ingredient_names, k=n)]
+    return {
+        "cook book": cook_book,
+        "meal plan": meal_plan,
+        "shopping items": shopping_items,
+        "queries": rng.choices(cook_book, k=QUERIES),
+        "ingredient queries": [(name, rng.choice(cook_book))
+                               for name in rng.choices(ingredient_names,
+                                                       k=QUERIES)],
+    }
+
+
+def _shopping_dict(shopping_list) -> dict:
+    """Normalises a shopping list for comparison."""
+    return {name: (round(amount, 6), units)
+            for amount, units, name in shopping_list}
+
+
+def workloads(module, is_rewrite: bool) -> dict[str, Callable]:
+    """Returns function name -> workload for one implementation.
+
+    A workload is called with the generated data, it returns a zero argument
+    function to time and a function turning that run's return value into
+    something comparable between implementations. Setup work (such as
+    building the containers the function works on) is done before timing.
+    Where the rewrite is given a list, a1 is given the container its list
+    functions also accept (RecipeIndex for recipes, ShoppingList for a
+    shopping list). a1's main keeps its shopping list in a
+    RunningShoppingList, which the generate_shopping_list workload covers
+    through aggregate_shopping_list.
+    """
+    recipe_list = (list if is_rewrite else a1.RecipeIndex)
+    shopping_list_type = (list if is_rewrite else a1.ShoppingList)
+
+    def parse_ingredient(data):
+        raw = [raw_ingredient for recipe in data["cook book"]
+               for raw_ingredient in recipe[1].split(",")]
+        return (lambda: [module.parse_ingredient(item) for item in raw],
+                lambda result: result)
+
+    def recipe_ingredients(data):
+        # Every distinct recipe is parsed and its parsed form kept, so the
+        # peak memory is what holding a parsed cook book costs.
+        if not is_rewrite:
+            a1.INGREDIENT_CACHE.clear()
+        return (lambda: [module.recipe_ingredients(recipe)
+                         for recipe in data["cook book"]],
+                lambda result: [tuple(ingredients) for ingredients in result])
+
+    def add_recipe(data):
+        recipes = recipe_list()
+
+        def run():
+            for recipe in data["meal plan"]:
+                module.add_recipe(recipe, recipes)
+            return recipes
+        return run, list
+
+    def find_recipe(data):
+        recipes = recipe_list(data["meal plan"])
+        return (lambda: [module.find_recipe(recipe[0], recipes)
+                         for recipe in data["queries"]],
+                lambda result: result)
+
+    def remove_recipe(data):
+        recipes = recipe_list(data["meal plan"])
+
+        def run():
+            for recipe in data["queries"]:
+                module.remove_recipe(recipe[0], recipes)
+            return recipes
+        return run, list
+
+    def get_ingredient_amount(data):
+        return (lambda: [module.get_ingredient_amount(name, recipe)
+                         for name, recipe in data["ingredient queries"]],
+                # The rewrite returns the whole (amount, units, name) tuple
+                lambda result: [None if amount is None else tuple(amount[:2])
+                                for amount in result])
+
+    def add_to_shopping_list(data):
+        def run():
+            shopping_list = shopping_list_type()
+            for item in data["shopping items"]:
+                module.add_to_shopping_list(item, shopping_list)
+            return shopping_list
+        return run, _shopping_dict
+
+    def remove_from_shopping_list(data):
+        shopping_list = shopping_list_type()
+        for item in data["shopping items"]:
+            module.add_to_shopping_list(item, shopping_list)
+
+        def run():
+            for amount, _, name in data["shopping items"][:QUERIES]:
+                module.remove_from_shopping_list(name, amount / 2,
+                                                 shopping_list)
+            return shopping_list
+        return run, _shopping_dict
+
+    def generate_shopping_list(data):
+        if not is_rewrite:
+            a1.INGREDIENT_CACHE.clear()
+        return (lambda: module.generate_shopping_list(data["meal plan"]),
+                _shopping_dict)
+
+    def display_ingredients(data):
+        shopping_list = list(_shopping_dict(data["shopping items"]).items())
+        shopping_list = [(amount, units, name)
+                         for name, (amount, units) in shopping_list]
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                module.display_ingredients(shopping_list)
+            return output.getvalue()
+        # The rewrite doesn't sort the table, so only compare the rows.
+        return run, lambda result: sorted(result.splitlines())
+
+    def sanitise_command(data):
+        lines = [f"add {recipe[0].title()} 12 " for recipe in data["queries"]]
+        return (lambda: [module.sanitise_command(line) for line in lines],
+                lambda result: result)
+
+    return {function.__name__: function for function in (
+        parse_ingredient, recipe_ingredients, add_recipe, find_recipe,
+        remove_recipe, get_ingredient_amount, add_to_shopping_list,
+        remove_from_shopping_list, generate_shopping_list,
+        display_ingredients, sanitise_command)}
+
+
+def measure(workload: Callable, data: dict, repeat: int) -> \
+        tuple[float, int, object]:
+    """Returns the best time, peak traced memory and normalised result."""
+    best = float("inf")
+    for _ in range(repeat):
+        run, normalise = workload(data)
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+
+    run, normalise = workload(data)
+    tracemalloc.start()
+    result = run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, normalise(result)
+
+
+def run_benchmarks(sizes: list[int], repeat: int = 3,
+                   functions: list[str] | None = None) -> list[dict]:
+    """Times every function of both implementations at every size.
+
+    Returns:
+        One row per (function, n, implementation) with the best time in
+        seconds, peak memory in bytes and whether the two implementations
+        gave equal results.
+    """
+    implementations = {"a1": workloads(a1, is_rewrite=False),
+                       "rewrite": workloads(load_rewrite(), is_rewrite=True)}
+    rows = list()
+    for n in sizes:
+        data = make_data(n)
+        for function in implementations["a1"]:
+            if functions and function not in functions:
+                continue
+            results = dict()
+            for name, implementation in implementations.items():
+                seconds, peak, results[name] = measure(
+                    implementation[function], data, repeat)
+                rows.append({"function": function, "n": n,
+                             "implementation": name, "seconds": seconds,
+                             "peak bytes": peak})
+            equal = results["a1"] == results["rewrite"]
+            for row in rows[-len(implementations):]:
+                row["equal"] = equal
+            print(f"{function:>26} n={n:<7} "
+                  f"a1={rows[-2]['seconds']:.6f}s "
+                  f"rewrite={rows[-1]['seconds']:.6f}s "
+                  f"a1={rows[-2]['peak bytes']}B "
+                  f"rewrite={rows[-1]['peak bytes']}B "
+                  f"{'equal' if equal else 'DIFFERENT'}", file=sys.stderr)
+    return rows
+
+
+def main():
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--functions", nargs="+", default=None,
+                        help="Only benchmark these functions.")
+    parser.add_argument("--json", default=None, help="JSON report file.")
+    parser.add_argument("--csv", default=None, help="CSV report file.")
+    args = parser.parse_args()
+
+    rows = run_benchmarks(args.sizes, args.repeat, args.functions)
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(rows, file, indent=2)
+    if args.csv is not None:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json is None and args.csv is None:
+        json.dump(rows, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Compiled, memory mapped binary cook books.
+
+A compiled cook book file is laid out as (all integers little endian)
+
+    header   magic b"CKBK", version (u16), flags (u16), recipe count (u64),
+             names offset (u64), index offset (u64)
+    records  one per recipe: name length (u16), name, ingredients length
+             (u32), the ingredients as written in a recipe, ingredient count
+             (u16), then per ingredient: amount (f64), units length (u8),
+             units, name length (u16), name
+    names    the casefolded recipe names, back to back
+    index    one INDEX_ENTRY per recipe, sorted by casefolded name: name
+             offset (u64), name length (u32), record offset (u64), record
+             length (u32)
+
+BinaryCookBook maps the file and only ever reads the header when opened.
+Looking a recipe up binary searches the fixed size index entries, comparing
+names straight out of the mapping, and a record is only decoded when that
+recipe is read. Opening a cook book is O(1) in time and memory whatever its
+size, the operating system pages in only the parts that are touched.
+
+Usage:
+    python binary_cook_book.py recipes.csv cook_book.ckbk
+"""
+
+import mmap
+import struct
+from collections.abc import Callable, Iterable, Iterator, Mapping
+
+MAGIC = b"CKBK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQQ")
+INDEX_ENTRY = struct.Struct("<QIQI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+
+
+class CookBookFormatError(ValueError):
+    """Raised for a file which isn't a compiled cook book."""
+
+
+def _check_length(value: bytes | list, limit: int, what: str) -> None:
+    """Raises ValueError if value is too long for its length field."""
+    if len(value) > limit:
+        raise ValueError(f"{what} is too long, {len(value)} > {limit}")
+
+
+def _encode_record(name: str, raw_ingredients: str,
+                   ingredients: list[tuple[float, str, str]]) -> bytes:
+    """Packs one recipe into a record.
+
+    Raises:
+        ValueError: If a name, units or list is too long for the format.
+    """
+    name_bytes = name.encode("utf-8")
+    raw_bytes = raw_ingredients.encode("utf-8")
+    _check_length(name_bytes, 0xFFFF, "recipe name")
+    _check_length(raw_bytes, 0xFFFFFFFF, "ingredients")
+    _check_length(ingredients, 0xFFFF, "ingredient list")
+    parts = [_U16.pack(len(name_bytes)), name_bytes,
+             _U32.pack(len(raw_bytes)), raw_bytes,
+             _U16.pack(len(ingredients))]
+    for amount, units, ingredient in ingredients:
+        units_bytes = units.encode("utf-8")
+        ingredient_bytes = ingredient.encode("utf-8")
+        _check_length(units_bytes, 0xFF, "units")
+        _check_length(ingredient_bytes, 0xFFFF, "ingredient name")
+        parts += [_F64.pack(amount), _U8.pack(len(units_bytes)), units_bytes,
+                  _U16.pack(len(ingredient_bytes)), ingredient_bytes]
+    return b"".join(parts)
+
+
+def compile_cook_book(
+        recipes: Iterable[tuple[str, str]], filename: str,
+        parse_ingredient: Callable[[str], tuple[float, str, str]]
+) -> int:
+    """Writes recipes to filename as a compiled cook book.
+
+    Records are written as the recipes are read, only the names and record
+    offsets are held in memory to build the sorted index. If a name appears
+    more than once (ignoring case) the last recipe is kept, the same as
+    adding the recipes to a dictionary would.
+
+    Parameters:
+        recipes (Iterable[tuple[str, str]]): The recipes, (name,
+            ingredients), e.g. the items of a cook book or read_recipes from
+            importer.py.
+        filename (str): The file to write.
+        parse_ingredient (Callable): Used to split each ingredient into its
+            amount, units and name, e.g. parse_ingredient from a1.py.
+
+    Returns:
+        The number of recipes written.
+
+    Raises:
+        ValueError: If an ingredient can't be parsed.
+
+    Usage:
+        >>> compile_cook_book(default_cook_book().items(), "cook_book.ckbk",
+        parse_ingredient)
+        6
+    """
+    # casefolded name -> (record offset, record length)
+    records: dict[bytes, tuple[int, int]] = dict()
+    with open(filename, "wb") as file:
+        file.write(bytes(HEADER.size))
+        for name, raw_ingredients in recipes:
+            ingredients = [parse_ingredient(raw_ingredient.strip())
+                           for raw_ingredient in raw_ingredients.split(",")]
+            record = _encode_record(name, raw_ingredients, ingredients)
+            records[name.casefold().encode("utf-8")] = (file.tell(),
+                                                        len(record))
+            file.write(record)
+
+        keys = sorted(records)
+        names_offset = file.tell()
+        key_offsets = list()
+        for key in keys:
+            key_offsets.append(file.tell())
+            file.write(key)
+        index_offset = file.tell()
+        file.write(b"".join(
+            INDEX_ENTRY.pack(key_offset, len(key), *records[key])
+            for key, key_offset in zip(keys, key_offsets)))
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(keys), names_offset,
+                               index_offset))
+    return len(keys)
+
+
+class BinaryCookBook(Mapping):
+    """A read only recipe name -> ingredients mapping over a compiled file.
+
+    Can be used in place of the cook book dictionary in a1.py, wrapped in a
+    collections.ChainMap if recipes need to be added.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Maps a compiled cook book, reading only its header.
+
+        Parameters:
+            filename (str): The file written by compile_cook_book.
+
+        Raises:
+            CookBookFormatError: If the file isn't a compiled cook book.
+
+        Usage:
+            >>> cook_book = BinaryCookBook("cook_book.ckbk")
+            >>> cook_book["peanut butter"]
+            '300 g peanuts,0.5 tsp salt,2 tsp oil'
+            >>> cook_book.get_ingredients("peanut butter")
+            ((300.0, 'g', 'peanuts'), (0.5, 'tsp', 'salt'), (2.0, 'tsp', 'oil'))
+        """
+        with open(filename, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                raise CookBookFormatError(f"{filename} is empty")
+        if len(self._map) < HEADER.size:
+            raise CookBookFormatError(f"{filename} is too short")
+        magic, version, _, count, _, index_offset = HEADER.unpack_from(
+            self._map)
+        if magic != MAGIC or version != VERSION:
+            raise CookBookFormatError(
+                f"{filename} is not a version {VERSION} cook book")
+        if index_offset + count * INDEX_ENTRY.size > len(self._map):
+            raise CookBookFormatError(f"{filename} is truncated")
+        self._count = count
+        self._index_offset = index_offset
+
+    def __enter__(self) -> "BinaryCookBook":
+        """Returns the cook book, which is closed when the block ends."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Closes the cook book."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        """Returns the number of recipes."""
+        return self._count
+
+    def _entry(self, position: int) -> tuple[int, int, int, int]:
+        """Returns the index entry at position."""
+        return INDEX_ENTRY.unpack_from(
+            self._map, self._index_offset + position * INDEX_ENTRY.size)
+
+    def _find(self, name: str) -> tuple[int, int] | None:
+        """Returns the (offset, length) of the record for name, or None."""
+        key = name.casefold().encode("utf-8")
+        data = self._map
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, record_offset, record_length = \
+                self._entry(middle)
+            found = data[key_offset:key_offset + key_length]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return record_offset, record_length
+        return None
+
+    def _read_record(self, offset: int, decode_ingredients: bool = False) \
+            -> tuple[str, str, tuple[tuple[float, str, str], ...] | None]:
+        """Decodes the record at offset.
+
+        The packed ingredients are only decoded if decode_ingredients is
+        True, otherwise None is returned in their place.
+        """
+        data = self._map
+        (length,) = _U16.unpack_from(data, offset)
+        offset += _U16.size
+        name = data[offset:offset + length].decode("utf-8")
+        offset += length
+        (length,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        raw_ingredients = data[offset:offset + length].decode("utf-8")
+        offset += length
+        if not decode_ingredients:
+            return name, raw_ingredients, None
+
+        (count,) = _U16.unpack_from(data, offset)
+        offset += _U16.size
+        ingredients = list()
+        for _ in range(count):
+            (amount,) = _F64.unpack_from(data, offset)
+            (length,) = _U8.unpack_from(data, offset + _F64.size)
+            offset += _F64.size + _U8.size
+            units = data[offset:offset + length].decode("utf-8")
+            offset += length
+            (length,) = _U16.unpack_from(data, offset)
+            offset += _U16.size
+            ingredient = data[offset:offset + length].decode("utf-8")
+            offset += length
+            ingredients.append((amount, units, ingredient))
+        return name, raw_ingredients, tuple(ingredients)
+
+    def __getitem__(self, name: str) -> str:
+        """Returns the ingredients of the recipe called name (ignoring case).
+        """
+        if not isinstance(name, str) or (found := self._find(name)) is None:
+            raise KeyError(name)
+        return self._read_record(found[0])[1]
+
+    def __contains__(self, name: object) -> bool:
+        """Checks if there is a recipe called name (ignoring case)."""
+        return isinstance(name, str) and self._find(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the recipe names in (casefolded) name order."""
+        for position in range(self._count):
+            yield self._read_record(self._entry(position)[2])[0]
+
+    def get_recipe(self, name: str) -> tuple[str, str] | None:
+        """Returns the recipe called name (ignoring case) or None."""
+        if (found := self._find(name)) is None:
+            return None
+        return self._read_record(found[0])[:2]
+
+    def get_ingredients(self, name: str) -> \
+            tuple[tuple[float, str, str], ...] | None:
+        """Returns the parsed ingredients of a recipe without parsing text.
+
+        Returns:
+            The (amount, units, name) of each ingredient, or None if there is
+            no recipe called name.
+        """
+        if (found := self._find(name)) is None:
+            return None
+        return self._read_record(found[0], decode_ingredients=True)[2]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from a1 import parse_ingredient
+    from importer import read_recipes
+
+    parser = argparse.ArgumentParser(
+        description="Compiles a CSV or JSONL recipe file into a binary cook "
+                    "book.")
+    parser.add_argument("recipes", help="The CSV or JSONL file to compile.")
+    parser.add_argument("output", help="The compiled cook book to write.")
+    args = parser.parse_args()
+    written = compile_cook_book(read_recipes(args.recipes, parse_ingredient),
+                                args.output, parse_ingredient)
+    print(f"Compiled {written} recipes into {args.output}")
@@ -0,0 +1,116 @@
+"""
+A small client for server.py.
+
+Interactively it prompts like a1.py does and prints each reply. With
+--batch the commands are all sent at once and the replies are printed as
+they arrive, which is much faster than waiting for each reply in turn.
+
+Usage:
+    python client.py --port 8462
+    python client.py --port 8462 --batch commands.txt
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Iterable
+
+import commands
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+async def read_reply(reader: asyncio.StreamReader) -> str | None:
+    """Returns the output of the next command, None once the server closes.
+    """
+    header = await reader.readline()
+    if not header:
+        return None
+    return (await reader.readexactly(int(header))).decode("utf-8")
+
+
+async def interact(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> \
+        None:
+    """Prompts for commands, sends them and prints the replies until q."""
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+
+    async def prompt(text: str) -> str:
+        return await loop.run_in_executor(None, input, text)
+
+    try:
+        while True:
+            line = await prompt("Please enter a command: ")
+            lines = [line]
+            command = commands.parse_command(line, strict=False)
+            if command is not None and command.kind == commands.MAKE_RECIPE:
+                lines.append(await prompt("Please enter the recipe name: "))
+                while ingredient := await prompt(
+                        "Please enter an ingredient: "):
+                    lines.append(ingredient)
+                lines.append("")
+            writer.write("".join(f"{line}\n" for line in lines).encode())
+            if (reply := await read_reply(reader)) is None:
+                break
+            print(reply, end="")
+            if command is not None and command.kind == commands.QUIT:
+                break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_batch(lines: Iterable[str], host: str = DEFAULT_HOST,
+                    port: int = DEFAULT_PORT) -> int:
+    """Sends every line without waiting and prints the replies.
+
+    Parameters:
+        lines (Iterable[str]): The commands (and the lines mkrec reads), one
+            per item.
+
+    Returns:
+        The number of replies received.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def send() -> None:
+        for line in lines:
+            line = line.rstrip("\r\n")
+            writer.write(f"{line}\n".encode())
+            await writer.drain()
+        writer.write_eof()
+
+    sender = asyncio.create_task(send())
+    replies = 0
+    buffer = list()
+    while (reply := await read_reply(reader)) is not None:
+        replies += 1
+        buffer.append(reply)
+        if len(buffer) >= 1024:
+            sys.stdout.write("".join(buffer))
+            buffer.clear()
+    sys.stdout.write("".join(buffer))
+    sender.cancel()
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except ConnectionError:  # The server closed first, after q
+        pass
+    return replies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Meal planner client.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--batch", default=None, metavar="FILE",
+                        help="Send the commands in FILE (- for stdin) "
+                             "without prompting.")
+    args = parser.parse_args()
+    if args.batch is None:
+        try:
+            asyncio.run(interact(host=args.host, port=args.port))
+        except (EOFError, KeyboardInterrupt):
+            pass
+    else:
+        with (sys.stdin if args.batch == "-" else open(args.batch)) as file:
+            asyncio.run(run_batch(file, host=args.host, port=args.port))
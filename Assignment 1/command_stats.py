@@ -0,0 +1,102 @@
+"""
+Per command latency statistics for the meal planner.
+
+Latencies are counted in a histogram of logarithmic buckets rather than kept,
+so recording one is O(1) in time and memory however long the session runs.
+Percentiles are estimated from the histogram by interpolating within the
+bucket holding them (geometrically, as the buckets are), so they are within
+one bucket (BUCKET_GROWTH - 1, i.e. 5%) of an observed latency.
+"""
+
+import json
+import math
+
+# The smallest latency told apart, faster commands share the first bucket.
+MIN_SECONDS = 1e-7
+# Each bucket is this much wider than the one before it.
+BUCKET_GROWTH = 1.05
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class CommandStats:
+    """Call counts, total time and latency percentiles for each command."""
+
+    def __init__(self) -> None:
+        """Initialises an instance of CommandStats.
+
+        Usage:
+            >>> stats = CommandStats()
+            >>> stats.record("add", 0.002)
+            >>> stats.get_summary()["add"]["count"]
+            1
+        """
+        # command -> [count, total seconds, {bucket: count}]
+        self._commands: dict[str, list] = dict()
+
+    def record(self, command: str, seconds: float) -> None:
+        """Adds one run of command, which took seconds.
+
+        Parameters:
+            command (str): The kind of command, e.g. "ls -s".
+            seconds (float): How long it took to run.
+        """
+        if (entry := self._commands.get(command)) is None:
+            entry = self._commands[command] = [0, 0.0, dict()]
+        entry[0] += 1
+        entry[1] += seconds
+        bucket = 0 if seconds <= MIN_SECONDS else \
+            int(math.log(seconds / MIN_SECONDS) / _LOG_GROWTH) + 1
+        entry[2][bucket] = entry[2].get(bucket, 0) + 1
+
+    @staticmethod
+    def _percentile(buckets: dict[int, int], count: int,
+                    percentile: float) -> float:
+        """Returns an estimate of the percentile, interpolated within its
+        bucket by how far the percentile's rank is through the bucket."""
+        rank = max(1, math.ceil(count * percentile / 100))
+        seen = 0
+        for bucket in sorted(buckets):
+            in_bucket = buckets[bucket]
+            if seen + in_bucket >= rank:
+                fraction = (rank - seen) / in_bucket
+                if bucket == 0:  # From 0 to MIN_SECONDS
+                    return MIN_SECONDS * fraction
+                return MIN_SECONDS * BUCKET_GROWTH ** (bucket - 1 + fraction)
+            seen += in_bucket
+        return 0.0
+
+    def get_summary(self) -> dict[str, dict[str, float]]:
+        """Returns the statistics of every command run so far.
+
+        Returns:
+            command -> {"count", "total seconds", "p50 seconds",
+            "p99 seconds"}, in the order the commands were first run.
+        """
+        return {
+            command: {"count": count, "total seconds": total,
+                      "p50 seconds": self._percentile(buckets, count, 50),
+                      "p99 seconds": self._percentile(buckets, count, 99)}
+            for command, (count, total, buckets) in self._commands.items()
+        }
+
+    def display(self, sizes: dict[str, int]) -> None:
+        """Prints the statistics as a table, followed by sizes.
+
+        Parameters:
+            sizes (dict[str, int]): Container name -> number of items, e.g.
+                {"recipes": 3}.
+        """
+        print(f"| {'command':<8} | {'count':>7} | {'total ms':>10} | "
+              f"{'p50 ms':>8} | {'p99 ms':>8} |")
+        for command, summary in sorted(self.get_summary().items()):
+            print(f"| {command:<8} | {summary['count']:>7} | "
+                  f"{summary['total seconds'] * 1000:>10.3f} | "
+                  f"{summary['p50 seconds'] * 1000:>8.3f} | "
+                  f"{summary['p99 seconds'] * 1000:>8.3f} |")
+        print(", ".join(f"{name}: {size}" for name, size in sizes.items()))
+
+    def dump(self, filename: str, sizes: dict[str, int]) -> None:
+        """Writes the statistics and sizes to filename as JSON."""
+        with open(filename, "w") as file:
+            json.dump({"commands": self.get_summary(), "sizes": sizes}, file,
+                      indent=2)
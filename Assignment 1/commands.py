@@ -0,0 +1,216 @@
+"""
+Table driven parser for the meal planner commands.
+
+Used by both Assignment 1/a1.py and 2023 sem 1 - rewrite/A1/a1.py, which
+loads this file by its path, so both front ends share one command grammar.
+The command words in COMMAND_TABLE are compiled into a trie once at import,
+so parsing a command walks its words once no matter how many commands exist.
+"""
+
+from typing import NamedTuple
+
+QUIT = "q"
+HELP = "h"
+GENERATE = "g"
+GENERATE_NET = "g -n"
+LIST = "ls"
+LIST_RECIPES = "ls -a"
+LIST_SHOPPING = "ls -s"
+MAKE_RECIPE = "mkrec"
+ADD = "add"
+REMOVE = "rm"
+REMOVE_INGREDIENT = "rm -i"
+IMPORT = "import"
+USES = "uses"
+COOK = "cook"
+STATS = "stats"
+PANTRY = "pantry"
+PLAN = "plan"
+
+# Kinds of argument a command takes.
+NO_ARGUMENT = "none"  # Nothing may follow the command
+PAGING = "paging"  # Optional --limit {rows} and --offset {rows}
+RECIPE_NAME = "recipe name"  # Lower case, digits removed
+INGREDIENT_AMOUNT = "ingredient amount"  # {ingredient name} {amount}
+TEXT = "text"  # Everything after the command, as typed
+
+# command -> the kind of argument it takes
+COMMAND_TABLE: dict[str, str] = {
+    QUIT: NO_ARGUMENT,
+    HELP: NO_ARGUMENT,
+    GENERATE: PAGING,
+    GENERATE_NET: PAGING,
+    LIST: NO_ARGUMENT,
+    LIST_RECIPES: NO_ARGUMENT,
+    LIST_SHOPPING: PAGING,
+    MAKE_RECIPE: NO_ARGUMENT,
+    ADD: RECIPE_NAME,
+    REMOVE: RECIPE_NAME,
+    REMOVE_INGREDIENT: INGREDIENT_AMOUNT,
+    IMPORT: TEXT,
+    USES: TEXT,
+    COOK: TEXT,
+    STATS: NO_ARGUMENT,
+    PANTRY: TEXT,
+    PLAN: TEXT,
+}
+
+# Removes digits, see sanitise.
+_DIGITS = str.maketrans("", "", "0123456789")
+# Turns every kind of whitespace into a plain space before splitting words.
+_WHITESPACE = str.maketrans("\t\n\r\x0b\x0c", "     ")
+
+
+class CommandError(ValueError):
+    """Raised for a known command with an invalid argument."""
+
+
+class Command(NamedTuple):
+    """A parsed command.
+
+    kind is one of the command constants above, e.g. ADD. argument is the
+    recipe name, ingredient name or text that followed the command, amount and
+    units are the amount (and its units, if given) passed to rm -i and
+    limit/offset are the paging options.
+    """
+    kind: str
+    argument: str | None = None
+    amount: float | None = None
+    limit: int | None = None
+    offset: int = 0
+    units: str | None = None
+
+
+class _Node:
+    """A node of the command trie, one per command word."""
+
+    __slots__ = ("children", "kind")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = dict()
+        self.kind: str | None = None
+
+
+def _compile(table: dict[str, str]) -> _Node:
+    """Builds the command trie from the command table."""
+    root = _Node()
+    for command in table:
+        node = root
+        for word in command.split(" "):
+            node = node.children.setdefault(word, _Node())
+        node.kind = command
+    return root
+
+
+_TRIE = _compile(COMMAND_TABLE)
+
+
+def sanitise(text: str) -> str:
+    """Returns text in lower case with digits and outer whitespace removed.
+
+    Usage:
+        >>> sanitise("add chocolate Brownies         5")
+        'add chocolate brownies'
+    """
+    return text.translate(_DIGITS).strip().lower()
+
+
+def _parse_paging(words: list[str]) -> tuple[int | None, int]:
+    """Reads the --limit and --offset options from words."""
+    options = {"--limit": None, "--offset": 0}
+    for index in range(0, len(words), 2):
+        option = words[index]
+        if option not in options:
+            raise CommandError(f"Unknown option {option}")
+        if index + 1 == len(words) or not words[index + 1].isdecimal():
+            raise CommandError(f"{option} needs a number")
+        options[option] = int(words[index + 1])
+    return options["--limit"], options["--offset"]
+
+
+def parse_command(user_input: str, strict: bool = True) -> Command | None:
+    """Parses a command typed by the user.
+
+    Parameters:
+        user_input (str): The command, e.g. "rm -i peanuts 300".
+        strict (bool): If False, None is returned for a known command with an
+            invalid argument instead of raising CommandError.
+
+    Digits are ignored when matching commands which take no argument or
+    only paging options, as they were by the original main, so "q 5" quits
+    and "h5" shows the help.
+
+    Returns:
+        The parsed command, or None if it isn't a known command.
+
+    Raises:
+        CommandError: If strict and the command is known but its argument is
+            invalid.
+
+    Usage:
+        >>> parse_command("Add Chocolate Brownies")
+        Command(kind='add', argument='chocolate brownies', amount=None,
+        limit=None, offset=0, units=None)
+        >>> parse_command("rm -i peanuts 300 g")
+        Command(kind='rm -i', argument='peanuts', amount=300.0, limit=None,
+        offset=0, units='g')
+    """
+    text = user_input.translate(_WHITESPACE).strip()
+    bare = sanitise(text)
+    if COMMAND_TABLE.get(bare) in (NO_ARGUMENT, PAGING):
+        return Command(bare)
+    lowered = text.lower()
+
+    # Walks the trie one word at a time, remembering the longest command.
+    node = _TRIE
+    kind = None
+    rest = ""
+    position = 0
+    while position < len(lowered):
+        end = lowered.find(" ", position)
+        if end == -1:
+            end = len(lowered)
+        node = node.children.get(lowered[position:end])
+        if node is None:
+            break
+        if node.kind is not None:
+            kind, rest = node.kind, text[end:].strip()
+        position = end + 1
+        while position < len(lowered) and lowered[position] == " ":
+            position += 1
+    if kind is None:
+        return None
+
+    try:
+        return _parse_argument(kind, rest)
+    except CommandError:
+        if strict:
+            raise
+        return None
+
+
+def _parse_argument(kind: str, rest: str) -> Command | None:
+    """Builds the Command for kind from the text that followed it."""
+    argument_kind = COMMAND_TABLE[kind]
+    if argument_kind == NO_ARGUMENT:
+        return Command(kind) if not rest else None
+    elif argument_kind == PAGING:
+        limit, offset = _parse_paging(rest.split())
+        return Command(kind, limit=limit, offset=offset)
+    elif argument_kind == RECIPE_NAME:
+        name = sanitise(rest)
+        return Command(kind, argument=name) if name else None
+    elif argument_kind == INGREDIENT_AMOUNT:
+        words = rest.lower().split()
+        # The units are optional, "rm -i onion 100 g" or "rm -i onion 2"
+        for units in (None, words[-1] if words else None):
+            if units is not None:
+                words.pop()
+            if len(words) >= 2:
+                try:
+                    return Command(kind, argument=" ".join(words[:-1]),
+                                   amount=float(words[-1]), units=units)
+                except ValueError:
+                    pass
+        raise CommandError("Usage: rm -i {ingredient_name} {amount} [units]")
+    return Command(kind, argument=rest) if rest else None
@@ -1,12 +1,22 @@
 HELP_TEXT = """    H or h: Help
     mkrec: creates a recipe, add to cook book.
+    import {file}: imports recipes from a CSV or JSONL file into the cook book.
     add {recipe}: adds a recipe to the collection.
     rm {recipe}: removes a recipe from the collection.
-    rm -i {ingredient_name} {amount}: removes ingredient from shopping list.
+    rm -i {ingredient_name} {amount} [units]: removes ingredient from shopping
+        list, units pick the row of an ingredient listed in more than one.
     ls: list all recipes in shopping cart.
     ls -a: list all available recipes in cook book.
     ls -s: display shopping list.
+        ( g, g -n and ls -s take --limit {rows} and --offset {rows} to page the list. )
+    uses {ingredient}, {ingredient}...: list recipes using all the ingredients.
+    cook {amount} {units} {ingredient}, ...: list recipes you can make.
     g or G: generates a shopping list.
+    pantry {file}: adds the ingredients in a file to your pantry.
+    g -n: generates the shopping list less what is in your pantry.
+    plan {meals} [ingredients|quantity]: adds the meals needing the fewest
+        ingredients ( or the least quantity ) to buy.
+    stats: show how long each command has taken and the list sizes.
     Q or q: Quit."""
 
 CHOCOLATE_PEANUT_BUTTER_SHAKE = ('chocolate peanut butter banana shake', 
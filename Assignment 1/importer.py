@@ -0,0 +1,220 @@
+"""
+Streaming bulk import of recipes from CSV or JSONL files.
+
+CSV files have a header row with (at least) "name" and "ingredients"
+columns, the ingredients are a single comma separated field in the same
+format as the recipes in constants.py, e.g.
+
+    name,ingredients
+    peanut butter,"300 g peanuts,0.5 tsp salt,2 tsp oil"
+
+JSONL files have one object per line with a "name" and "ingredients" key,
+where ingredients is either a comma separated string or a list of strings.
+A list item can't itself contain a comma, as the ingredients are stored
+joined by commas and it would be read back as more than one ingredient.
+
+Files are read one row at a time through a chain of generators, so memory use
+does not grow with the size of the file (apart from the cook book itself).
+"""
+
+import csv
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import TextIO
+
+CSV_EXTENSIONS = (".csv",)
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+class RecipeImportError(ValueError):
+    """Raised for a row which can't be turned into a recipe."""
+
+
+def _read_csv(file: TextIO) -> Iterator[tuple[int, dict]]:
+    """Yields (line number, row) for each row of a CSV file."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _read_jsonl(file: TextIO) -> Iterator[tuple[int, dict | str]]:
+    """Yields (line number, row) for each non-empty line of a JSONL file.
+
+    Lines which aren't valid JSON are yielded as the raw string so the error
+    can be reported against that line.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, line
+
+
+def _to_recipe(row: dict | str,
+               parse_ingredient: Callable[[str], tuple[float, str, str]]) -> \
+        tuple[str, str]:
+    """Turns a row into a recipe, validating every ingredient.
+
+    Parameters:
+        row (dict | str): The row read from the file.
+        parse_ingredient (Callable): Used to check each ingredient matches
+            the "amount units name" format.
+
+    Returns:
+        The recipe in the form (name, ingredients).
+
+    Raises:
+        RecipeImportError: If the row isn't a valid recipe.
+    """
+    if not isinstance(row, dict):
+        raise RecipeImportError("row is not a JSON object")
+
+    name = row.get("name")
+    ingredients = row.get("ingredients")
+    if not isinstance(name, str) or not name.strip():
+        raise RecipeImportError("missing recipe name")
+    if isinstance(ingredients, str):
+        ingredients = ingredients.split(",")
+    if not isinstance(ingredients, list) or not ingredients:
+        raise RecipeImportError("missing ingredients")
+
+    cleaned = list()
+    for ingredient in ingredients:
+        if not isinstance(ingredient, str):
+            raise RecipeImportError(f"invalid ingredient {ingredient!r}")
+        if "," in ingredient:
+            raise RecipeImportError(
+                f"ingredient {ingredient!r} contains a comma")
+        ingredient = ingredient.strip()
+        try:
+            parse_ingredient(ingredient)
+        except ValueError:
+            raise RecipeImportError(f"invalid ingredient {ingredient!r}")
+        cleaned.append(ingredient)
+    return name.strip().lower(), ",".join(cleaned)
+
+
+def iter_recipes(
+        rows: Iterable[tuple[int, dict | str]],
+        parse_ingredient: Callable[[str], tuple[float, str, str]],
+        on_error: Callable[[int, str], None]
+) -> Iterator[tuple[str, str]]:
+    """Yields the valid recipes in rows, reporting the invalid ones.
+
+    Parameters:
+        rows (Iterable[tuple[int, dict | str]]): (line number, row) pairs.
+        parse_ingredient (Callable): Used to validate each ingredient.
+        on_error (Callable[[int, str], None]): Called with the line number
+            and reason for every row that is skipped.
+    """
+    for line_number, row in rows:
+        try:
+            yield _to_recipe(row, parse_ingredient)
+        except RecipeImportError as error:
+            on_error(line_number, str(error))
+
+
+def _print_error(line_number: int, message: str) -> None:
+    """Default error handler, prints the skipped row."""
+    print(f"Skipping line {line_number}: {message}")
+
+
+_READERS = {"csv": _read_csv, "jsonl": _read_jsonl}
+
+
+def _file_format(filename: str, file_format: str | None) -> str:
+    """Returns file_format, working it out from filename if it's None.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if file_format is None:
+        if filename.lower().endswith(CSV_EXTENSIONS):
+            file_format = "csv"
+        elif filename.lower().endswith(JSONL_EXTENSIONS):
+            file_format = "jsonl"
+        else:
+            raise ValueError(f"Unknown recipe file format, {filename=}")
+    if file_format not in _READERS:
+        raise ValueError(f"Unknown recipe file format, {file_format=}")
+    return file_format
+
+
+def read_recipes(
+        filename: str,
+        parse_ingredient: Callable[[str], tuple[float, str, str]],
+        on_error: Callable[[int, str], None] = _print_error,
+        file_format: str | None = None
+) -> Iterator[tuple[str, str]]:
+    """Yields the valid recipes in a CSV or JSONL file, one at a time.
+
+    Parameters:
+        filename (str): The file to read.
+        parse_ingredient (Callable): Used to validate each ingredient.
+        on_error (Callable[[int, str], None]): Called for every skipped row.
+        file_format (str | None): "csv" or "jsonl", if None it is worked out
+            from the file extension.
+
+    Raises:
+        ValueError: If the file format is unknown.
+    """
+    reader = _READERS[_file_format(filename, file_format)]
+    with open(filename, "r", newline="", encoding="utf-8") as file:
+        yield from iter_recipes(reader(file), parse_ingredient, on_error)
+
+
+def import_recipes(
+        filename: str,
+        cook_book: dict[str, str],
+        parse_ingredient: Callable[[str], tuple[float, str, str]],
+        on_error: Callable[[int, str], None] = _print_error,
+        file_format: str | None = None,
+        on_import: Callable[[tuple[str, str]], None] | None = None
+) -> dict[str, int | float]:
+    """Streams the recipes in a CSV or JSONL file into cook_book.
+
+    Recipes already in the cook book are replaced, the same as mkrec does.
+
+    Parameters:
+        filename (str): The file to import.
+        cook_book (dict[str, str]): The cook book, recipe name -> ingredients.
+        parse_ingredient (Callable): Used to validate each ingredient, e.g.
+            parse_ingredient from a1.py.
+        on_error (Callable[[int, str], None]): Called for every skipped row.
+        file_format (str | None): "csv" or "jsonl", if None it is worked out
+            from the file extension.
+        on_import (Callable[[tuple[str, str]], None] | None): Called with
+            every recipe added to the cook book, e.g. to keep an index of the
+            cook book up to date.
+
+    Returns:
+        A dictionary with the number of rows read, imported and rejected, the
+        time taken in seconds and the rows per second.
+
+    Usage:
+        >>> stats = import_recipes("recipes.csv", cook_book, parse_ingredient)
+        >>> stats["imported"]
+        1000000
+    """
+    file_format = _file_format(filename, file_format)
+    stats = {"rows": 0, "imported": 0, "rejected": 0}
+
+    def count_error(line_number: int, message: str) -> None:
+        stats["rejected"] += 1
+        on_error(line_number, message)
+
+    start = time.perf_counter()
+    for name, ingredients in read_recipes(filename, parse_ingredient,
+                                          count_error, file_format):
+        cook_book[name] = ingredients
+        stats["imported"] += 1
+        if on_import is not None:
+            on_import((name, ingredients))
+    seconds = time.perf_counter() - start
+
+    stats["rows"] = stats["imported"] + stats["rejected"]
+    return {**stats, "seconds": seconds,
+            "rows per second": stats["rows"] / seconds if seconds else 0.0}
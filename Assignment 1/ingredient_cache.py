@@ -0,0 +1,93 @@
+"""
+Bounded LRU cache for parsed recipe ingredient strings.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+class ParseCache:
+    """An LRU cache mapping raw ingredient strings to their parsed form.
+
+    The raw string is the second item of a recipe, e.g.
+    "300 g peanuts,0.5 tsp salt,2 tsp oil", and the parsed form is the tuple
+    of (amount, units, name) tuples returned by recipe_ingredients. Parsed
+    values are kept as the parser returns them, so the parser must return
+    something immutable, like a tuple or an IngredientView, which can be
+    handed out to every caller without copying.
+    """
+
+    def __init__(self, parser: Callable[[str], tuple],
+                 max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initialises an instance of ParseCache.
+
+        Parameters:
+            parser (Callable[[str], tuple]): Function used to parse a raw
+                ingredient string on a cache miss.
+            max_size (int): The maximum number of raw strings to keep, the
+                least recently used string is evicted first.
+
+        Usage:
+            >>> cache = ParseCache(lambda raw: tuple(raw.split(",")), 2)
+            >>> cache.get("a,b")
+            ('a', 'b')
+            >>> cache.get_stats()
+            {'hits': 0, 'misses': 1, 'evictions': 0, 'size': 1}
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, {max_size=}")
+        self._parser = parser
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __getstate__(self) -> dict:
+        """Pickles the cache without its entries.
+
+        Lets the cache's get method be sent to worker processes, each of
+        which starts with an empty cache.
+        """
+        return {"parser": self._parser, "max_size": self._max_size}
+
+    def __setstate__(self, state: dict) -> None:
+        """Unpickles an empty cache."""
+        self.__init__(parser=state["parser"], max_size=state["max_size"])
+
+    def __len__(self) -> int:
+        """Returns the number of raw strings currently cached."""
+        return len(self._entries)
+
+    def get(self, raw_ingredients: str) -> tuple:
+        """Returns the parsed form of raw_ingredients, parsing it on a miss.
+
+        Parameters:
+            raw_ingredients (str): The comma separated ingredient string.
+
+        Returns:
+            The parsed ingredients.
+        """
+        entries = self._entries
+        parsed = entries.get(raw_ingredients)
+        if parsed is not None:
+            self._stats["hits"] += 1
+            entries.move_to_end(raw_ingredients)
+            return parsed
+
+        self._stats["misses"] += 1
+        parsed = entries[raw_ingredients] = self._parser(raw_ingredients)
+        if len(entries) > self._max_size:
+            entries.popitem(last=False)
+            self._stats["evictions"] += 1
+        return parsed
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the hit, miss and eviction counters and the cache size."""
+        return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        self._entries.clear()
+        for key in self._stats:
+            self._stats[key] = 0
@@ -0,0 +1,203 @@
+"""
+Inverted index from ingredient names to the recipes which use them.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+
+from aggregate import normalise_unit
+
+
+def _intersect(first: list[int], second: list[int]) -> list[int]:
+    """Intersects two sorted lists of recipe ids.
+
+    Walks the shorter list and binary searches forward through the longer
+    one, so the cost is O(len(shorter) * log(len(longer))).
+    """
+    if len(first) > len(second):
+        first, second = second, first
+    result = list()
+    position = 0
+    for recipe_id in first:
+        position = bisect_left(second, recipe_id, position)
+        if position == len(second):
+            break
+        if second[position] == recipe_id and \
+                (not result or result[-1] != recipe_id):
+            result.append(recipe_id)
+    return result
+
+
+class IngredientIndex:
+    """Maps each ingredient to postings of the recipes that use it.
+
+    A posting is (recipe id, dimension, amount in the dimensions base unit),
+    see aggregate.normalise_unit. Recipe ids only ever increase so every
+    posting list is sorted by recipe id, which lets "recipes using all of"
+    queries intersect them without sorting.
+
+    The index is built from source the first time it is queried and is kept
+    up to date afterwards with add_recipe/remove_recipe. Recipes are parsed
+    before the index changes, so one which can't be parsed raises ValueError
+    and leaves the index as it was.
+    """
+
+    def __init__(self, parse: Callable[[str], tuple[tuple[float, str, str]]],
+                 source: Mapping[str, str] | None = None) -> None:
+        """Initialises an instance of IngredientIndex.
+
+        Parameters:
+            parse (Callable[[str], tuple]): Function parsing the ingredient
+                string of a recipe, e.g. INGREDIENT_CACHE.get from a1.py.
+            source (Mapping[str, str] | None): The cook book to build the
+                index from when it's first needed.
+
+        Usage:
+            >>> index = IngredientIndex(INGREDIENT_CACHE.get)
+            >>> index.add_recipe(PEANUT_BUTTER)
+            >>> index.add_recipe(MUNG_BEAN_OMELETTE)
+            >>> index.recipes_using_all(["salt", "oil"])
+            ['peanut butter', 'omelette']
+        """
+        self._parse = parse
+        self._source = source
+        self._next_id = 0
+        # recipe id -> (name, distinct (ingredient, dimension)s it uses)
+        self._recipes: dict[int, tuple[str, tuple[tuple[str, str], ...]]] = \
+            dict()
+        self._recipe_ids: dict[str, int] = dict()
+        # ingredient -> (sorted recipe ids, (dimension, amount) per id)
+        self._postings: dict[str, tuple[list[int],
+                                        list[tuple[str, float]]]] = dict()
+
+    def _ensure_built(self) -> None:
+        """Builds the index from the source cook book if it hasn't been.
+
+        Raises:
+            ValueError: If a recipe can't be parsed, the index stays unbuilt.
+        """
+        if self._source is not None:
+            parsed = [(name, self._needed(raw_ingredients))
+                      for name, raw_ingredients in self._source.items()]
+            self._source = None
+            for name, needed in parsed:
+                self._insert(name, needed)
+
+    def _needed(self, raw_ingredients: str) -> dict[tuple[str, str], float]:
+        """Returns the base units of each (ingredient, dimension) needed.
+
+        Raises:
+            ValueError: If an ingredient can't be parsed.
+        """
+        needed: dict[tuple[str, str], float] = dict()
+        for amount, units, ingredient in self._parse(raw_ingredients):
+            dimension, factor = normalise_unit(units)
+            key = (ingredient.casefold(), dimension)
+            needed[key] = needed.get(key, 0.0) + amount * factor
+        return needed
+
+    def add_recipe(self, recipe: tuple[str, str]) -> None:
+        """Adds a recipe to the index, replacing one with the same name.
+
+        Parameters:
+            recipe (tuple[str, str]): The recipe, (name, ingredients).
+
+        Raises:
+            ValueError: If an ingredient can't be parsed, nothing is changed.
+        """
+        if self._source is not None:  # Will be added when the index is built
+            return
+        name, raw_ingredients = recipe
+        needed = self._needed(raw_ingredients)
+        self.remove_recipe(name)
+        self._insert(name, needed)
+
+    def _insert(self, name: str,
+                needed: dict[tuple[str, str], float]) -> None:
+        """Adds a parsed recipe to the index, see _needed."""
+        recipe_id = self._next_id
+        self._next_id += 1
+        self._recipes[recipe_id] = (name, tuple(needed))
+        self._recipe_ids[name.casefold()] = recipe_id
+        for (ingredient, dimension), amount in needed.items():
+            ids, entries = self._postings.setdefault(ingredient,
+                                                     (list(), list()))
+            ids.append(recipe_id)
+            entries.append((dimension, amount))
+
+    def remove_recipe(self, name: str) -> None:
+        """Removes the recipe called name (ignoring case) from the index."""
+        if (recipe_id := self._recipe_ids.pop(name.casefold(), None)) is None:
+            return
+        _, needed = self._recipes.pop(recipe_id)
+        for ingredient in {ingredient for ingredient, _ in needed}:
+            ids, entries = self._postings[ingredient]
+            position = bisect_left(ids, recipe_id)
+            while position < len(ids) and ids[position] == recipe_id:
+                del ids[position]
+                del entries[position]
+            if not ids:
+                del self._postings[ingredient]
+
+    def _ids_using(self, ingredient: str) -> list[int]:
+        """Returns the sorted, distinct ids of recipes using ingredient."""
+        ids = self._postings.get(ingredient.casefold(), (list(), list()))[0]
+        return [recipe_id for position, recipe_id in enumerate(ids)
+                if position == 0 or ids[position - 1] != recipe_id]
+
+    def recipes_using(self, ingredient: str) -> list[str]:
+        """Returns the names of every recipe using ingredient.
+
+        Parameters:
+            ingredient (str): The name of the ingredient.
+        """
+        self._ensure_built()
+        return [self._recipes[recipe_id][0]
+                for recipe_id in self._ids_using(ingredient)]
+
+    def recipes_using_all(self, ingredients: Iterable[str]) -> list[str]:
+        """Returns the names of every recipe using all of the ingredients.
+
+        Parameters:
+            ingredients (Iterable[str]): The names of the ingredients.
+        """
+        self._ensure_built()
+        id_lists = sorted((self._ids_using(ingredient)
+                           for ingredient in ingredients), key=len)
+        if not id_lists:
+            return list()
+        common = id_lists[0]
+        for ids in id_lists[1:]:
+            if not common:
+                break
+            common = _intersect(common, ids)
+        return [self._recipes[recipe_id][0] for recipe_id in common]
+
+    def cookable(self, pantry: Iterable[tuple[float, str, str]]) -> list[str]:
+        """Returns the names of every recipe that can be made from pantry.
+
+        Only the postings of the pantry's ingredients are visited, a recipe
+        is cookable once every one of its ingredients has been covered.
+
+        Parameters:
+            pantry (Iterable[tuple[float, str, str]]): The ingredients on hand
+                as (amount, units, name).
+        """
+        self._ensure_built()
+        stock: dict[str, dict[str, float]] = dict()
+        for amount, units, ingredient in pantry:
+            dimension, factor = normalise_unit(units)
+            by_dimension = stock.setdefault(ingredient.casefold(), dict())
+            by_dimension[dimension] = (by_dimension.get(dimension, 0.0) +
+                                       amount * factor)
+
+        covered: dict[int, int] = dict()
+        for ingredient, by_dimension in stock.items():
+            ids, entries = self._postings.get(ingredient, (list(), list()))
+            for recipe_id, (dimension, amount) in zip(ids, entries):
+                if by_dimension.get(dimension, 0.0) >= amount:
+                    covered[recipe_id] = covered.get(recipe_id, 0) + 1
+
+        return [self._recipes[recipe_id][0]
+                for recipe_id in sorted(covered)
+                if covered[recipe_id] == len(self._recipes[recipe_id][1])]
@@ -0,0 +1,160 @@
+"""
+Compact storage for parsed recipe ingredients.
+
+A recipe's ingredients are usually a tuple of (amount, units, name) tuples,
+which costs a tuple, a float and two new strings for every ingredient, about
+200 bytes. An IngredientView keeps the same ingredients in two flat arrays
+instead: the amounts as doubles, and the units and names as ids into strings
+interned once for the whole store. An ingredient then costs 16 bytes, and
+"salt" or "tsp" are stored once no matter how many recipes use them.
+
+Each view owns its arrays, so a view dropped by ParseCache frees its memory.
+"""
+
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+
+
+class _Interner:
+    """Assigns each distinct string a small integer id."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = list()
+        self._ids: dict[str, int] = dict()
+
+    def intern(self, string: str) -> int:
+        """Returns the id of string, giving it one if it is new."""
+        if (string_id := self._ids.get(string)) is None:
+            string_id = self._ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+
+class IngredientView(Sequence):
+    """A read only, compact form of one recipe's ingredients.
+
+    Behaves like the tuple of (amount, units, name) tuples returned by
+    parse_raw_ingredients: it compares equal to and hashes like that tuple,
+    and pickles as it. Each (amount, units, name) tuple is only built when it
+    is accessed.
+    """
+
+    __slots__ = ("_amounts", "_ids", "_strings")
+
+    def __init__(self, amounts: array, ids: array, strings: list[str]) -> \
+            None:
+        """Initialises an instance of IngredientView.
+
+        Parameters:
+            amounts (array): The amount of each ingredient.
+            ids (array): The units id then the name id of each ingredient.
+            strings (list[str]): The interned strings the ids refer to.
+        """
+        self._amounts = amounts
+        self._ids = ids
+        self._strings = strings
+
+    def __len__(self) -> int:
+        """Returns the number of ingredients."""
+        return len(self._amounts)
+
+    def __getitem__(self, index: int | slice) -> \
+            tuple[float, str, str] | tuple[tuple[float, str, str], ...]:
+        """Returns the (amount, units, name) of the ingredient at index."""
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        amount = self._amounts[index]
+        if index < 0:
+            index += len(self)
+        return (amount, self._strings[self._ids[2 * index]],
+                self._strings[self._ids[2 * index + 1]])
+
+    def __iter__(self) -> Iterator[tuple[float, str, str]]:
+        """Iterates over the ingredients in recipe order."""
+        strings = self._strings
+        ids = iter(self._ids)
+        for amount, units_id, name_id in zip(self._amounts, ids, ids):
+            yield amount, strings[units_id], strings[name_id]
+
+    def __eq__(self, other: object) -> bool:
+        """Compares equal to views or tuples with the same ingredients."""
+        if isinstance(other, (IngredientView, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hashes as the tuple of the same ingredients."""
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        """Shows the ingredients as their tuple would."""
+        return repr(tuple(self))
+
+    def __reduce__(self) -> tuple:
+        """Pickles the view as a plain tuple of its ingredients."""
+        return tuple, (tuple(self),)
+
+
+class IngredientStore:
+    """Parses raw ingredient strings into IngredientViews sharing one set of
+    interned units and names.
+
+    Usage:
+        >>> store = IngredientStore(parse_ingredient)
+        >>> store.parse("300 g peanuts,0.5 tsp salt")
+        ((300.0, 'g', 'peanuts'), (0.5, 'tsp', 'salt'))
+    """
+
+    def __init__(self, parse_ingredient: Callable[[str], tuple[float, str,
+                                                                str]]) -> None:
+        """Initialises an instance of IngredientStore.
+
+        Parameters:
+            parse_ingredient (Callable[[str], tuple[float, str, str]]):
+                Parses one ingredient, e.g. "0.5 tsp salt", into its amount,
+                units and name.
+        """
+        self._parse_ingredient = parse_ingredient
+        self._interner = _Interner()
+
+    def __getstate__(self) -> dict:
+        """Pickles the store without its interned strings.
+
+        Lets the store's parse method be sent to worker processes, each of
+        which interns its own strings.
+        """
+        return {"parse_ingredient": self._parse_ingredient}
+
+    def __setstate__(self, state: dict) -> None:
+        """Unpickles a store with no interned strings."""
+        self.__init__(state["parse_ingredient"])
+
+    def get_size(self) -> int:
+        """Returns the number of distinct units and names interned."""
+        return len(self._interner.strings)
+
+    def parse(self, raw_ingredients: str) -> IngredientView:
+        """Parses a comma separated string of ingredients.
+
+        Every ingredient is parsed before any string is interned, so a recipe
+        which can't be parsed leaves the store unchanged.
+
+        Parameters:
+            raw_ingredients (str): The ingredients of a recipe, e.g.
+                "300 g peanuts,0.5 tsp salt".
+
+        Returns:
+            The ingredients as a compact view.
+
+        Raises:
+            ValueError: If an ingredient can't be parsed.
+        """
+        parsed = [self._parse_ingredient(raw_ingredient.strip())
+                  for raw_ingredient in raw_ingredients.split(",")]
+        intern = self._interner.intern
+        ids = array("I")
+        for _, units, name in parsed:
+            ids.append(intern(units))
+            ids.append(intern(name))
+        return IngredientView(array("d", [amount for amount, _, _ in parsed]),
+                              ids, self._interner.strings)
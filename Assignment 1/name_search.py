@@ -0,0 +1,194 @@
+"""
+Fuzzy recipe name search over a character trigram index.
+
+Every name is padded ("$$name$") and split into overlapping three character
+trigrams, each trigram has a sorted posting list of the ids of the names
+containing it. One edit changes at most three trigrams, so a name within
+max_edits of the query shares at least
+(trigrams in the query - 3 * max_edits) of the query's trigrams. Candidates
+are only taken from the rarest few posting lists (by the pigeonhole
+principle a match must be in one of them) and counted against the rest with
+binary searches, stopping at the first miss too many. Posting lists are kept
+per name length, so only names within max_edits of the query's length are
+looked at. Only the survivors are scored with a bounded edit distance.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+DEFAULT_SUGGESTIONS = 3
+# Edits allowed between a query and a suggestion, queries of at most
+# SHORT_QUERY characters only allow one edit.
+DEFAULT_MAX_EDITS = 2
+SHORT_QUERY = 5
+
+
+def trigrams(name: str) -> set[str]:
+    """Returns the distinct trigrams of a casefolded, padded name.
+
+    Usage:
+        >>> sorted(trigrams("tea"))
+        ['$$t', '$te', 'ea$', 'tea']
+    """
+    padded = f"$${name.casefold()}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """Returns the Levenshtein distance between two strings, up to a limit.
+
+    Only the diagonal band of width 2 * limit + 1 is computed and the search
+    stops as soon as every cell of a row is over limit.
+
+    Returns:
+        The distance, or limit + 1 if it is more than limit.
+
+    Usage:
+        >>> edit_distance("brownie", "brownies", 2)
+        1
+        >>> edit_distance("seitan", "omelette", 2)
+        3
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    if len(first) > len(second):
+        first, second = second, first
+    over = limit + 1
+    previous = list(range(len(second) + 1))
+    for i, character in enumerate(first, start=1):
+        low = max(1, i - limit)
+        high = min(len(second), i + limit)
+        current = [over] * (len(second) + 1)
+        current[0] = i if i <= limit else over
+        for j in range(low, high + 1):
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1,
+                previous[j - 1] + (character != second[j - 1]))
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        previous = current
+    return min(previous[len(second)], over)
+
+
+class NameSearch:
+    """Suggests the names closest to a mistyped name.
+
+    The index is built from source the first time it is queried and is kept
+    up to date afterwards with add.
+    """
+
+    def __init__(self, source: Iterable[str] | None = None) -> None:
+        """Initialises an instance of NameSearch.
+
+        Parameters:
+            source (Iterable[str] | None): The names (e.g. the cook book) to
+                build the index from when it's first needed.
+
+        Usage:
+            >>> search = NameSearch(["chocolate brownies", "seitan"])
+            >>> search.suggest("choclate brownie")
+            ['chocolate brownies']
+        """
+        self._source = source
+        self._names: list[str] = list()
+        self._ids: dict[str, int] = dict()
+        # name length -> trigram -> sorted ids of the names containing it
+        self._postings: dict[int, dict[str, array]] = dict()
+
+    def __len__(self) -> int:
+        """Returns the number of names in the index."""
+        self._ensure_built()
+        return len(self._names)
+
+    def _ensure_built(self) -> None:
+        """Builds the index from the source names if it hasn't been."""
+        if self._source is not None:
+            source, self._source = self._source, None
+            for name in source:
+                self.add(name)
+
+    def add(self, name: str) -> None:
+        """Adds a name to the index, names already in it are ignored.
+
+        Parameters:
+            name (str): The name, e.g. of a recipe added by mkrec.
+        """
+        if self._source is not None:  # Will be added when the index is built
+            return
+        key = name.casefold()
+        if key in self._ids:
+            return
+        name_id = self._ids[key] = len(self._names)
+        self._names.append(name)
+        postings = self._postings.setdefault(len(key), dict())
+        for trigram in trigrams(key):
+            if (ids := postings.get(trigram)) is None:
+                ids = postings[trigram] = array("I")
+            ids.append(name_id)
+
+    def suggest(self, query: str, count: int = DEFAULT_SUGGESTIONS,
+                max_edits: int | None = None,
+                accept: Callable[[str], bool] | None = None) -> list[str]:
+        """Returns the names closest to query, closest first.
+
+        Parameters:
+            query (str): The mistyped name.
+            count (int): The most names to return.
+            max_edits (int | None): The most edits a suggestion may be away
+                from query, None for DEFAULT_MAX_EDITS (or 1 for short
+                queries).
+            accept (Callable[[str], bool] | None): Only names for which this
+                returns True are suggested, e.g. only recipes in the meal
+                plan.
+
+        Returns:
+            Up to count names within max_edits of query, ordered by edit
+            distance and then by name.
+        """
+        self._ensure_built()
+        query = query.casefold()
+        if max_edits is None:
+            max_edits = 1 if len(query) <= SHORT_QUERY else DEFAULT_MAX_EDITS
+
+        query_trigrams = trigrams(query)
+        # A name within max_edits shares at least this many trigrams, but
+        # every suggestion must share at least one.
+        needed = max(1, len(query_trigrams) - 3 * max_edits)
+        allowed_misses = len(query_trigrams) - needed
+
+        names = self._names
+        scored = list()
+        for length in range(max(0, len(query) - max_edits),
+                            len(query) + max_edits + 1):
+            postings = self._postings.get(length)
+            if postings is None:
+                continue
+            lists = sorted((postings.get(trigram, ()) for trigram in
+                            query_trigrams), key=len)
+            rare, common = lists[:allowed_misses + 1], \
+                lists[allowed_misses + 1:]
+
+            shared: Counter[int] = Counter()
+            for ids in rare:
+                shared.update(ids)
+
+            for name_id, count_shared in shared.items():
+                misses = len(rare) - count_shared
+                for ids in common:
+                    position = bisect_left(ids, name_id)
+                    if position == len(ids) or ids[position] != name_id:
+                        misses += 1
+                        if misses > allowed_misses:
+                            break
+                if misses > allowed_misses:
+                    continue
+                name = names[name_id]
+                if accept is not None and not accept(name):
+                    continue
+                distance = edit_distance(query, name.casefold(), max_edits)
+                if distance <= max_edits:
+                    scored.append((distance, name))
+        return [name for _, name in heapq.nsmallest(count, scored)]
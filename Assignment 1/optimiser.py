@@ -0,0 +1,233 @@
+"""
+Meal plan optimiser.
+
+Chooses a number of different recipes from a cook book so the meal plan
+needs as few distinct ingredients to be bought as possible ("ingredients"),
+or as little in total ("quantity", the sum of every amount still needed in
+its base unit, see aggregate.normalise_unit).
+
+Every (casefolded name, dimension) in the cook book is given a bit, and a
+recipe's ingredients are an int bitset, so the ingredients a plan needs are
+the OR of its recipes' bitsets and their count is int.bit_count. A greedy
+plan gives the first upper bound, then a depth first branch and bound search
+improves on it until it has tried everything or runs out of time. Recipes
+are tried in a fixed order (so each plan is only visited once) with the
+cheapest additions first. A branch is cut once its cost plus the cheapest
+additions left (see _Search.lower_bound) can't beat the best plan found.
+"""
+
+import time
+from collections.abc import Callable, Mapping
+
+from aggregate import normalise_unit
+from pantry import Pantry
+
+INGREDIENTS = "ingredients"
+QUANTITY = "quantity"
+# Seconds the branch and bound search may run for by default.
+DEFAULT_TIME_LIMIT = 0.5
+
+
+class _Recipes:
+    """The recipes of a cook book as bitsets and base amounts."""
+
+    def __init__(self, cook_book: Mapping[str, str],
+                 parse: Callable[[str], tuple[tuple[float, str, str]]],
+                 pantry: Pantry | None) -> None:
+        vocabulary: dict[tuple[str, str], int] = dict()
+        self.names: list[str] = list()
+        self.masks: list[int] = list()
+        # Per recipe, (bit, amount in the base unit) of each ingredient
+        self.amounts: list[tuple[tuple[int, float], ...]] = list()
+        stock: list[float] = list()
+        for name, raw_ingredients in cook_book.items():
+            needed: dict[int, float] = dict()
+            for amount, units, ingredient in parse(raw_ingredients):
+                dimension, factor = normalise_unit(units)
+                key = (ingredient.casefold(), dimension)
+                if (bit := vocabulary.get(key)) is None:
+                    bit = vocabulary[key] = len(stock)
+                    stock.append(0.0 if pantry is None else
+                                 pantry.get_base_stock(*key))
+                needed[bit] = needed.get(bit, 0.0) + amount * factor
+            mask = 0
+            for bit, amount in needed.items():
+                if amount > stock[bit]:  # The pantry alone doesn't cover it
+                    mask |= 1 << bit
+            self.names.append(name)
+            self.masks.append(mask)
+            self.amounts.append(tuple(needed.items()))
+        self.stock = stock
+
+
+class _Search:
+    """Greedy and branch and bound search for one objective."""
+
+    def __init__(self, recipes: _Recipes, meals: int, objective: str,
+                 deadline: float) -> None:
+        self.recipes = recipes
+        self.meals = meals
+        self.deadline = deadline
+        self.quantity = objective == QUANTITY
+        # Recipes in the fixed order branches are taken in, cheapest first
+        self.order = sorted(range(len(recipes.names)),
+                            key=lambda recipe: self.alone(recipe))
+        self.best_cost = float("inf")
+        self.best_plan: list[int] = list()
+        # Current plan state, updated on the way down and undone on the way
+        # back up
+        self.union = 0
+        self.totals = [0.0] * len(recipes.stock)
+        self.cost = 0.0
+        self.plan: list[int] = list()
+        self.timed_out = False
+
+    def alone(self, recipe: int) -> float:
+        """Returns the cost of a plan of only recipe."""
+        if not self.quantity:
+            return self.recipes.masks[recipe].bit_count()
+        stock = self.recipes.stock
+        return sum(max(0.0, amount - stock[bit])
+                   for bit, amount in self.recipes.amounts[recipe])
+
+    def marginal(self, recipe: int) -> float:
+        """Returns how much adding recipe to the plan would cost."""
+        if not self.quantity:
+            mask = self.recipes.masks[recipe]
+            return (mask & ~self.union).bit_count()
+        stock = self.recipes.stock
+        totals = self.totals
+        added = 0.0
+        for bit, amount in self.recipes.amounts[recipe]:
+            spare = stock[bit] - totals[bit]
+            added += amount if spare <= 0 else max(0.0, amount - spare)
+        return added
+
+    def push(self, recipe: int, marginal: float) -> int:
+        """Adds recipe to the plan, returning the state to undo it with."""
+        self.plan.append(recipe)
+        self.cost += marginal
+        union = self.union
+        self.union |= self.recipes.masks[recipe]
+        if self.quantity:
+            for bit, amount in self.recipes.amounts[recipe]:
+                self.totals[bit] += amount
+        return union
+
+    def pop(self, union: int, marginal: float) -> None:
+        """Undoes the last push."""
+        recipe = self.plan.pop()
+        self.cost -= marginal
+        self.union = union
+        if self.quantity:
+            for bit, amount in self.recipes.amounts[recipe]:
+                self.totals[bit] -= amount
+
+    def record(self) -> None:
+        """Keeps the current plan if it is the best so far."""
+        if self.cost < self.best_cost:
+            self.best_cost = self.cost
+            self.best_plan = list(self.plan)
+
+    def greedy(self) -> None:
+        """Builds a plan by repeatedly adding the cheapest recipe."""
+        used = set()
+        undo = list()
+        for _ in range(self.meals):
+            recipe, marginal = min(
+                ((recipe, self.marginal(recipe)) for recipe in self.order
+                 if recipe not in used), key=lambda pair: pair[1])
+            used.add(recipe)
+            undo.append((self.push(recipe, marginal), marginal))
+        self.record()
+        for union, marginal in reversed(undo):
+            self.pop(union, marginal)
+
+    def lower_bound(self, children: list[tuple[float, int]],
+                    remaining: int) -> float:
+        """Returns the least the remaining meals can add to the cost.
+
+        children are the (marginal, position) of the candidates, sorted.
+        Marginals only grow as quantities are added, so the remaining meals
+        add at least the sum of the smallest. Ingredients can be shared, but
+        the plan needs at least every ingredient of its most expensive
+        addition, which is at least the remaining-th smallest marginal.
+        """
+        if self.quantity:
+            return sum(marginal for marginal, _ in children[:remaining])
+        return children[remaining - 1][0]
+
+    def branch(self, start: int) -> None:
+        """Tries every plan extending the current one with recipes from
+        self.order[start:].
+        """
+        if len(self.plan) == self.meals:
+            self.record()
+            return
+        if time.perf_counter() > self.deadline:
+            self.timed_out = True
+            return
+        # Leaves room for the meals still to be chosen
+        last = len(self.order) - (self.meals - len(self.plan)) + 1
+        children = sorted(((self.marginal(self.order[position]), position)
+                           for position in range(start, last)))
+        remaining = self.meals - len(self.plan)
+        if len(children) < remaining or \
+                self.cost + self.lower_bound(children, remaining) >= \
+                self.best_cost:
+            return
+        for marginal, position in children:
+            if self.cost + marginal >= self.best_cost or self.timed_out:
+                break
+            union = self.push(self.order[position], marginal)
+            self.branch(position + 1)
+            self.pop(union, marginal)
+
+
+def optimise_meal_plan(
+        cook_book: Mapping[str, str], meals: int,
+        parse: Callable[[str], tuple[tuple[float, str, str]]],
+        pantry: Pantry | None = None, objective: str = INGREDIENTS,
+        time_limit: float = DEFAULT_TIME_LIMIT
+) -> tuple[list[tuple[str, str]], float, bool]:
+    """Chooses meals different recipes which need the least to be bought.
+
+    Parameters:
+        cook_book (Mapping[str, str]): Recipe name -> ingredients.
+        meals (int): The number of recipes to choose.
+        parse (Callable[[str], tuple]): Function parsing the ingredient
+            string of a recipe, e.g. INGREDIENT_CACHE.get from a1.py.
+        pantry (Pantry | None): What is already on hand. Ingredients the
+            pantry covers for a recipe aren't counted as bought.
+        objective (str): INGREDIENTS to minimise the number of distinct
+            ingredients bought or QUANTITY to minimise the total amount.
+        time_limit (float): Seconds the branch and bound search may run for,
+            the best plan found so far is returned when it runs out.
+
+    Returns:
+        The chosen recipes, (name, ingredients), the plan's cost and whether
+        it is known to be optimal.
+
+    Raises:
+        ValueError: If objective is unknown or meals is more than the number
+            of recipes.
+
+    Usage:
+        >>> optimise_meal_plan(default_cook_book(), 2, INGREDIENT_CACHE.get)
+        ([('peanut butter', '300 g peanuts,0.5 tsp salt,2 tsp oil'),
+        ('omelette', '1 cup mung bean,...')], 10.0, True)
+    """
+    if objective not in (INGREDIENTS, QUANTITY):
+        raise ValueError(f"Unknown objective, {objective=}")
+    deadline = time.perf_counter() + time_limit
+    recipes = _Recipes(cook_book, parse, pantry)
+    if not 0 < meals <= len(recipes.names):
+        raise ValueError(f"Can't choose {meals} meals from "
+                         f"{len(recipes.names)} recipes")
+
+    search = _Search(recipes, meals, objective, deadline)
+    search.greedy()
+    search.branch(0)
+    plan = [(recipes.names[recipe], cook_book[recipes.names[recipe]])
+            for recipe in search.best_plan]
+    return plan, search.best_cost, not search.timed_out
@@ -0,0 +1,133 @@
+"""
+Stock on hand, and shopping lists net of it.
+
+A pantry file has one ingredient per line in the same "amount units name"
+form as a recipe's ingredients, e.g.
+
+    500 g peanuts
+    2 tbsp salt
+
+Blank lines and lines starting with # are skipped. Amounts of the same
+ingredient are summed in the base unit of their dimension (see
+aggregate.normalise_unit), so the pantry is a hash table keyed by
+(casefolded name, dimension). Netting a shopping list against it probes that
+table once per item, an O(n + m) hash join.
+"""
+
+from collections.abc import Callable, Iterable
+
+from aggregate import AMOUNT_PRECISION, normalise_unit
+
+
+def _print_error(line_number: int, message: str) -> None:
+    """Default error handler, prints the skipped line."""
+    print(f"Skipping line {line_number}: {message}")
+
+
+class Pantry:
+    """The ingredients on hand, summed by name and dimension."""
+
+    def __init__(self,
+                 items: Iterable[tuple[float, str, str]] | None = None) -> \
+            None:
+        """Initialises an instance of Pantry.
+
+        Parameters:
+            items (Iterable[tuple[float, str, str]] | None): Ingredients on
+                hand, (amount, units, name).
+
+        Usage:
+            >>> pantry = Pantry([(1.0, "tbsp", "salt")])
+            >>> pantry.get_stock("salt", "tsp")
+            3.0
+        """
+        # (casefolded name, dimension) -> amount in the base unit
+        self._stock: dict[tuple[str, str], float] = dict()
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def __len__(self) -> int:
+        """Returns the number of distinct (name, dimension)s stocked."""
+        return len(self._stock)
+
+    def add(self, item: tuple[float, str, str]) -> None:
+        """Adds an ingredient to the pantry.
+
+        Parameters:
+            item (tuple[float, str, str]): The amount, units and name.
+        """
+        amount, units, name = item
+        dimension, factor = normalise_unit(units)
+        key = (name.casefold(), dimension)
+        self._stock[key] = self._stock.get(key, 0.0) + amount * factor
+
+    def get_stock(self, name: str, units: str) -> float:
+        """Returns how much of an ingredient is on hand, in units."""
+        dimension, factor = normalise_unit(units)
+        return self._stock.get((name.casefold(), dimension), 0.0) / factor
+
+    def get_base_stock(self, name: str, dimension: str) -> float:
+        """Returns how much of an ingredient is on hand, in the base unit of
+        dimension.
+        """
+        return self._stock.get((name.casefold(), dimension), 0.0)
+
+    def load(self, filename: str,
+             parse_ingredient: Callable[[str], tuple[float, str, str]],
+             on_error: Callable[[int, str], None] = _print_error) -> int:
+        """Adds every ingredient in a pantry file.
+
+        Parameters:
+            filename (str): The file to read.
+            parse_ingredient (Callable): Used to split each line into its
+                amount, units and name, e.g. parse_ingredient from a1.py.
+            on_error (Callable[[int, str], None]): Called with the line number
+                and reason for every line that is skipped.
+
+        Returns:
+            The number of ingredients added.
+        """
+        added = 0
+        with open(filename, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    item = parse_ingredient(line)
+                except ValueError:
+                    on_error(line_number, f"invalid ingredient {line!r}")
+                    continue
+                self.add(item)
+                added += 1
+        return added
+
+    def net(self, shopping_list: Iterable[tuple[float, str, str]]) -> \
+            list[tuple[float, str, str]]:
+        """Returns shopping_list less what is already on hand.
+
+        Each item is looked up in the pantry by (casefolded name, dimension)
+        and only the amount still needed, in the item's units, is kept. Items
+        which are fully stocked are left out. The pantry isn't changed.
+
+        Parameters:
+            shopping_list (Iterable[tuple[float, str, str]]): The aggregated
+                shopping list, (amount, units, name).
+
+        Returns:
+            The net shopping list, in the same order.
+
+        Usage:
+            >>> Pantry([(1.0, "tsp", "salt"), (1.0, "kg", "peanuts")]).net(
+            [(300.0, "g", "peanuts"), (0.5, "tbsp", "salt")])
+            [(0.166666667, 'tbsp', 'salt')]
+        """
+        stock = self._stock
+        net = list()
+        for amount, units, name in shopping_list:
+            dimension, factor = normalise_unit(units)
+            on_hand = stock.get((name.casefold(), dimension), 0.0) / factor
+            if (needed := round(amount - on_hand, AMOUNT_PRECISION)) > 0:
+                net.append((needed, units, name))
+        return net
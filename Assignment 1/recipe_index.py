@@ -0,0 +1,135 @@
+"""
+Casefolded recipe index used by the meal plan in a1.py.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+
+class RecipeIndex:
+    """A list of recipes which keeps a casefolded name -> recipe index in sync.
+
+    Recipes are kept in insertion order, duplicates included, so the index
+    can stand in for the plain list[tuple[str, str]] that a1.py works on.
+    Looking up or removing a recipe by name is O(1) and always acts on the
+    first occurrence of that name, the same as find_recipe/remove_recipe on a
+    list.
+    """
+
+    def __init__(self, recipes: Iterable[tuple[str, str]] | None = None) -> \
+            None:
+        """Initialises an instance of RecipeIndex.
+
+        Parameters:
+            recipes (Iterable[tuple[str, str]] | None): Recipes to add to the
+                index, in order.
+
+        Usage:
+            >>> recipes = RecipeIndex([("peanut butter", "300 g peanuts")])
+            >>> recipes
+            [('peanut butter', '300 g peanuts')]
+        """
+        # Every recipe gets a slot number which only ever increases, a dict
+        # keeps the slots in insertion order and allows O(1) deletion.
+        self._recipes: dict[int, tuple[str, str]] = dict()
+        self._names: dict[str, deque[int]] = dict()
+        self._next_slot = 0
+        if recipes is not None:
+            for recipe in recipes:
+                self.append(recipe)
+
+    def __len__(self) -> int:
+        """Returns the number of recipes in the index."""
+        return len(self._recipes)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """Iterates over the recipes in insertion order."""
+        return iter(self._recipes.values())
+
+    def __contains__(self, recipe: tuple[str, str]) -> bool:
+        """Checks if the recipe is in the index."""
+        return any(self._recipes[slot] == recipe
+                   for slot in self._names.get(recipe[0].casefold(), ()))
+
+    def __getitem__(self, index: int | slice) -> \
+            tuple[str, str] | list[tuple[str, str]]:
+        """Returns the recipe(s) at the given position, like a list would."""
+        return list(self._recipes.values())[index]
+
+    def __eq__(self, other: object) -> bool:
+        """Compares equal to lists or indexes with the same recipes."""
+        if isinstance(other, (RecipeIndex, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Returns the same representation as the equivalent list."""
+        return repr(list(self))
+
+    def append(self, recipe: tuple[str, str]) -> None:
+        """Adds a recipe to the end of the index.
+
+        Parameters:
+            recipe (tuple[str, str]): The recipe to add.
+        """
+        slot = self._next_slot
+        self._next_slot += 1
+        self._recipes[slot] = recipe
+        self._names.setdefault(recipe[0].casefold(), deque()).append(slot)
+
+    def find(self, recipe_name: str) -> tuple[str, str] | None:
+        """Returns the first recipe called recipe_name (ignoring case).
+
+        Parameters:
+            recipe_name (str): The name of the recipe to find.
+
+        Returns:
+            The recipe or None if there is no recipe with that name.
+
+        Usage:
+            >>> recipes = RecipeIndex([("Peanut Butter", "300 g peanuts")])
+            >>> recipes.find("peanut butter")
+            ('Peanut Butter', '300 g peanuts')
+        """
+        slots = self._names.get(recipe_name.casefold())
+        if not slots:
+            return None
+        return self._recipes[slots[0]]
+
+    def remove_name(self, recipe_name: str) -> tuple[str, str] | None:
+        """Removes the first recipe called recipe_name (ignoring case).
+
+        Parameters:
+            recipe_name (str): The name of the recipe to remove.
+
+        Returns:
+            The removed recipe or None if there was nothing to remove.
+        """
+        key = recipe_name.casefold()
+        slots = self._names.get(key)
+        if not slots:
+            return None
+        recipe = self._recipes.pop(slots.popleft())
+        if not slots:
+            del self._names[key]
+        return recipe
+
+    def remove(self, recipe: tuple[str, str]) -> None:
+        """Removes the first occurrence of recipe, like list.remove.
+
+        Parameters:
+            recipe (tuple[str, str]): The recipe to remove.
+
+        Raises:
+            ValueError: If the recipe is not in the index.
+        """
+        key = recipe[0].casefold()
+        slots = self._names.get(key, deque())
+        for position, slot in enumerate(slots):
+            if self._recipes[slot] == recipe:
+                del slots[position]
+                del self._recipes[slot]
+                if not slots:
+                    del self._names[key]
+                return
+        raise ValueError(f"{recipe=} is not in the recipe index")
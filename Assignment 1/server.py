@@ -0,0 +1,135 @@
+"""
+Asyncio TCP server running the meal planner commands for many sessions.
+
+Every connection is a session with its own meal plan and shopping list (a
+MealPlanner), while all sessions share one CookBook, so the recipes and the
+indexes over them are only held and built once. A recipe made with mkrec
+in one session can be used by every session.
+
+The protocol is line based. The client sends one command per line, as it
+would be typed at the prompt, and for each command the server replies with
+a line holding the length in bytes of the command's output followed by the
+output itself (UTF-8). After mkrec the server reads the recipe name and the
+ingredient lines, up to an empty line, before replying. The session ends
+after q, when the client closes its side of the connection or when it sends
+a line longer than MAX_LINE_LENGTH. A command which fails replies with its
+output so far and an error line, and the session carries on. Commands are
+handled as they arrive, so a client may send many commands before reading
+the replies (see client.py).
+
+Usage:
+    python server.py --port 8462
+"""
+
+import argparse
+import asyncio
+import io
+from collections import deque
+from contextlib import redirect_stdout
+
+import commands
+from a1 import CookBook, MealPlanner
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8462
+# The longest line (in bytes) a client may send.
+MAX_LINE_LENGTH = 1 << 16
+# Commands which would read or write files on the server.
+DISABLED_COMMANDS = {
+    commands.IMPORT: "\nimport is not available on the server.\n",
+    commands.PANTRY: "\npantry is not available on the server.\n",
+}
+
+
+async def _read_line(reader: asyncio.StreamReader) -> str | None:
+    """Returns the next line sent by the client, None once it has closed or
+    sent a line which is too long."""
+    try:
+        line = await reader.readline()
+    except (asyncio.LimitOverrunError, ValueError):  # Longer than the limit
+        return None
+    if not line:
+        return None
+    return line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
+async def handle_session(cook_book: CookBook, reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+    """Runs the commands sent over one connection until q or end of input.
+
+    Parameters:
+        cook_book (CookBook): The cook book shared by every session.
+        reader (asyncio.StreamReader): The connection's incoming lines.
+        writer (asyncio.StreamWriter): Where to send each command's output.
+    """
+    # Lines of a recipe being made, read by mkrec through create_recipe
+    recipe_lines: deque[str] = deque()
+    planner = MealPlanner(read_input=lambda prompt: recipe_lines.popleft()
+                          if recipe_lines else "",
+                          cook_book=cook_book)
+    try:
+        running = True
+        while running and (line := await _read_line(reader)) is not None:
+            command = commands.parse_command(line, strict=False)
+            kind = None if command is None else command.kind
+            if kind in DISABLED_COMMANDS:
+                output = DISABLED_COMMANDS[kind]
+            else:
+                if kind == commands.MAKE_RECIPE:
+                    recipe_lines.append(await _read_line(reader) or "")
+                    while ingredient := await _read_line(reader):
+                        recipe_lines.append(ingredient)
+                # execute is synchronous, so no other session can print
+                # while stdout is redirected.
+                with redirect_stdout(io.StringIO()) as captured:
+                    try:
+                        running = planner.execute(line)
+                    except ValueError as error:
+                        print(f"\nError: {error}\n")
+                recipe_lines.clear()
+                output = captured.getvalue()
+
+            reply = output.encode("utf-8")
+            writer.write(b"%d\n%b" % (len(reply), reply))
+            await writer.drain()
+    except ConnectionError:  # Client went away
+        pass
+    finally:
+        planner.close()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                cook_book: CookBook | None = None) -> None:
+    """Accepts sessions until cancelled.
+
+    Parameters:
+        host (str): The address to listen on.
+        port (int): The port to listen on, 0 for any free port.
+        cook_book (CookBook | None): The cook book to share between
+            sessions, if None the default cook book is used.
+    """
+    if cook_book is None:
+        cook_book = CookBook()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_session(cook_book, reader, writer),
+        host=host, port=port, limit=MAX_LINE_LENGTH)
+    async with server:
+        for socket in server.sockets:
+            print(f"Serving on {socket.getsockname()}")
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Meal planner server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,118 @@
+"""
+Shopping list container indexed by casefolded ingredient name.
+"""
+
+from collections.abc import Iterable, Iterator
+
+
+class ShoppingList:
+    """A shopping list of (amount, units, name) items indexed by name.
+
+    Items are stored in an insertion ordered dict keyed by the casefolded
+    ingredient name, so adding to or taking away from an item is O(1) and
+    updated items keep their place in the list. Iterating, indexing, len and
+    repr all behave like the list[tuple[float, str, str]] used by a1.py.
+    """
+
+    def __init__(self,
+                 items: Iterable[tuple[float, str, str]] | None = None) -> \
+            None:
+        """Initialises an instance of ShoppingList.
+
+        Parameters:
+            items (Iterable[tuple[float, str, str]] | None): Items to add to
+                the list, items with the same name are merged.
+
+        Usage:
+            >>> shopping_list = ShoppingList([(300.0, "g", "peanuts"),
+            (0.5, "tsp", "salt")])
+            >>> shopping_list.add((200.0, "g", "Peanuts"))
+            >>> shopping_list
+            [(500.0, 'g', 'peanuts'), (0.5, 'tsp', 'salt')]
+        """
+        self._items: dict[str, tuple[float, str, str]] = dict()
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def __len__(self) -> int:
+        """Returns the number of distinct ingredients in the list."""
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[tuple[float, str, str]]:
+        """Iterates over the items in the order they were first added."""
+        return iter(self._items.values())
+
+    def __contains__(self, item: tuple[float, str, str]) -> bool:
+        """Checks if the exact item is in the list."""
+        return self._items.get(item[2].casefold()) == item
+
+    def __getitem__(self, index: int | slice) -> \
+            tuple[float, str, str] | list[tuple[float, str, str]]:
+        """Returns the item(s) at the given position, like a list would."""
+        return list(self._items.values())[index]
+
+    def __eq__(self, other: object) -> bool:
+        """Compares equal to lists or shopping lists with the same items."""
+        if isinstance(other, (ShoppingList, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Returns the same representation as the equivalent list."""
+        return repr(list(self))
+
+    def get(self, ingredient_name: str) -> tuple[float, str, str] | None:
+        """Returns the item for ingredient_name (ignoring case) or None."""
+        return self._items.get(ingredient_name.casefold())
+
+    def add(self, ingredient_details: tuple[float, str, str]) -> None:
+        """Adds an ingredient, merging it into an existing item of that name.
+
+        When merged, the amounts are summed and the existing units and
+        position are kept.
+
+        Parameters:
+            ingredient_details (tuple[float, str, str]): The amount, units
+                and name of the ingredient.
+        """
+        amount, units, name = ingredient_details
+        key = name.casefold()
+        if (item := self._items.get(key)) is not None:
+            self._items[key] = (item[0] + amount, item[1], item[2])
+        else:
+            self._items[key] = (amount, units, name)
+
+    # Lets ShoppingList be used anywhere a list is appended to.
+    append = add
+
+    def decrease(self, ingredient_name: str, amount: float) -> None:
+        """Takes amount away from an ingredient, removing it once it is <= 0.
+
+        Does nothing if the ingredient is not in the list.
+
+        Parameters:
+            ingredient_name (str): The name of the ingredient.
+            amount (float): The amount to take away.
+        """
+        key = ingredient_name.casefold()
+        if (item := self._items.get(key)) is None:
+            return
+        if (new_amount := item[0] - amount) > 0:
+            self._items[key] = (new_amount, item[1], item[2])
+        else:
+            del self._items[key]
+
+    def remove(self, item: tuple[float, str, str]) -> None:
+        """Removes an exact item, like list.remove.
+
+        Raises:
+            ValueError: If the item is not in the list.
+        """
+        if item not in self:
+            raise ValueError(f"{item=} is not in the shopping list")
+        del self._items[item[2].casefold()]
+
+    def clear(self) -> None:
+        """Removes every item."""
+        self._items.clear()
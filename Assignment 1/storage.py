@@ -0,0 +1,288 @@
+"""
+SQLite storage for the cook book, meal plan and shopping list.
+
+Recipes are stored normalised, one row per ingredient, with indexes on the
+casefolded recipe and ingredient names. The cook book is exposed as a
+mapping which reads from the database on demand, so opening a large saved
+cook book doesn't load it into memory, and the shopping list of the meal plan
+is summed with a single GROUP BY query.
+"""
+
+import sqlite3
+from collections.abc import Callable, Iterator, MutableMapping
+
+from aggregate import UNIT_CONVERSIONS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    ingredients TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingredients (
+    recipe_id INTEGER NOT NULL REFERENCES recipes (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    units TEXT NOT NULL,
+    units_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    PRIMARY KEY (recipe_id, position)
+);
+CREATE INDEX IF NOT EXISTS ingredients_name_key ON ingredients (name_key);
+CREATE TABLE IF NOT EXISTS units (
+    units_key TEXT PRIMARY KEY,
+    dimension TEXT NOT NULL,
+    factor REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meal_plan (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipe_id INTEGER NOT NULL REFERENCES recipes (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS meal_plan_recipe_id ON meal_plan (recipe_id);
+CREATE TABLE IF NOT EXISTS shopping_list_adjustments (
+    name_key TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (name_key, dimension)
+);
+"""
+
+# Ingredient positions are folded into the meal plan position to find the
+# first time an ingredient was seen, recipes can't have more ingredients.
+MAX_INGREDIENTS = 1 << 16
+
+SHOPPING_LIST_QUERY = f"""
+SELECT MIN(meal_plan.position * {MAX_INGREDIENTS} + ingredients.position),
+       ingredients.units,
+       ingredients.name,
+       COALESCE(units.dimension, ingredients.units_key),
+       SUM(ingredients.amount * COALESCE(units.factor, 1.0)),
+       COUNT(*)
+FROM meal_plan
+JOIN ingredients ON ingredients.recipe_id = meal_plan.recipe_id
+LEFT JOIN units ON units.units_key = ingredients.units_key
+GROUP BY ingredients.name_key, COALESCE(units.dimension, ingredients.units_key)
+ORDER BY 1
+"""
+
+
+class CookBookView(MutableMapping):
+    """A recipe name -> ingredients mapping backed by a CookBookStore.
+
+    Can be used in place of the cook book dictionary in a1.py.
+    """
+
+    def __init__(self, store: "CookBookStore") -> None:
+        """Initialises an instance of CookBookView.
+
+        Parameters:
+            store (CookBookStore): The store to read and write recipes with.
+        """
+        self._store = store
+
+    def __getitem__(self, name: str) -> str:
+        """Returns the ingredients of a recipe."""
+        if (recipe := self._store.get_recipe(name)) is None:
+            raise KeyError(name)
+        return recipe[1]
+
+    def __setitem__(self, name: str, ingredients: str) -> None:
+        """Adds or replaces a recipe."""
+        self._store.add_recipe((name, ingredients))
+
+    def __delitem__(self, name: str) -> None:
+        """Removes a recipe."""
+        if not self._store.remove_recipe(name):
+            raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the recipe names in the order they were added."""
+        return self._store.recipe_names()
+
+    def __len__(self) -> int:
+        """Returns the number of recipes in the cook book."""
+        return self._store.count_recipes()
+
+    def __contains__(self, name: object) -> bool:
+        """Checks if there is a recipe called name (ignoring case)."""
+        return isinstance(name, str) and \
+            self._store.get_recipe(name) is not None
+
+
+class CookBookStore:
+    """A SQLite database holding a cook book, meal plan and the amounts taken
+    off its shopping list by hand.
+
+    Changes are made in a transaction which is committed by commit() or
+    close(), so bulk imports don't pay for a commit per recipe.
+    """
+
+    def __init__(self, filename: str,
+                 parse_ingredient: Callable[[str], tuple[float, str, str]]) \
+            -> None:
+        """Opens (creating if needed) the database in filename.
+
+        Parameters:
+            filename (str): The database file, ":memory:" for a temporary
+                database.
+            parse_ingredient (Callable): Used to split each ingredient into
+                its amount, units and name, e.g. parse_ingredient from a1.py.
+
+        Usage:
+            >>> store = CookBookStore("cook_book.db", parse_ingredient)
+            >>> store.add_recipe(PEANUT_BUTTER)
+            >>> store.add_to_meal_plan("peanut butter")
+            True
+            >>> store.get_shopping_groups()
+            [('peanuts', 'g', 'mass', 300.0, 1), ('salt', 'tsp', 'volume', 2.5, 1),
+            ('oil', 'tsp', 'volume', 10.0, 1)]
+        """
+        self._parse_ingredient = parse_ingredient
+        self._connection = sqlite3.connect(filename)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO units VALUES (?, ?, ?)",
+            ((units, dimension, factor)
+             for units, (dimension, factor) in UNIT_CONVERSIONS.items()))
+        self._connection.commit()
+
+    def commit(self) -> None:
+        """Saves all changes made so far."""
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Saves all changes and closes the database."""
+        self._connection.commit()
+        self._connection.close()
+
+    def get_cook_book(self) -> CookBookView:
+        """Returns a dictionary like view of the cook book."""
+        return CookBookView(self)
+
+    def count_recipes(self) -> int:
+        """Returns the number of recipes in the cook book."""
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def add_recipe(self, recipe: tuple[str, str]) -> None:
+        """Adds a recipe to the cook book, replacing one of the same name.
+
+        Parameters:
+            recipe (tuple[str, str]): The recipe, (name, ingredients).
+
+        Raises:
+            ValueError: If an ingredient can't be parsed.
+        """
+        name, raw_ingredients = recipe
+        ingredients = [self._parse_ingredient(raw_ingredient.strip())
+                       for raw_ingredient in raw_ingredients.split(",")]
+        if len(ingredients) > MAX_INGREDIENTS:
+            raise ValueError(f"Recipes can have at most {MAX_INGREDIENTS} "
+                             f"ingredients, {len(ingredients)=}")
+
+        cursor = self._connection.execute(
+            "INSERT INTO recipes (name, name_key, ingredients) "
+            "VALUES (?, ?, ?) ON CONFLICT (name_key) DO UPDATE SET "
+            "name = excluded.name, ingredients = excluded.ingredients "
+            "RETURNING id", (name, name.casefold(), raw_ingredients))
+        recipe_id = cursor.fetchone()[0]
+        self._connection.execute(
+            "DELETE FROM ingredients WHERE recipe_id = ?", (recipe_id,))
+        self._connection.executemany(
+            "INSERT INTO ingredients VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((recipe_id, position, amount, units, units.casefold(),
+              ingredient, ingredient.casefold())
+             for position, (amount, units, ingredient) in
+             enumerate(ingredients)))
+
+    def remove_recipe(self, name: str) -> bool:
+        """Removes a recipe from the cook book (and meal plan).
+
+        Returns:
+            True if a recipe was removed, False otherwise.
+        """
+        return self._connection.execute(
+            "DELETE FROM recipes WHERE name_key = ?",
+            (name.casefold(),)).rowcount > 0
+
+    def get_recipe(self, name: str) -> tuple[str, str] | None:
+        """Returns the recipe called name (ignoring case) or None."""
+        return self._connection.execute(
+            "SELECT name, ingredients FROM recipes WHERE name_key = ?",
+            (name.casefold(),)).fetchone()
+
+    def recipe_names(self) -> Iterator[str]:
+        """Yields every recipe name in the order they were added."""
+        for (name,) in self._connection.execute(
+                "SELECT name FROM recipes ORDER BY id"):
+            yield name
+
+    def add_to_meal_plan(self, name: str) -> bool:
+        """Adds the recipe called name to the end of the meal plan.
+
+        Returns:
+            True if the recipe was added, False if it isn't in the cook book.
+        """
+        return self._connection.execute(
+            "INSERT INTO meal_plan (recipe_id) "
+            "SELECT id FROM recipes WHERE name_key = ?",
+            (name.casefold(),)).rowcount > 0
+
+    def remove_from_meal_plan(self, name: str) -> bool:
+        """Removes the first occurrence of the recipe from the meal plan.
+
+        Returns:
+            True if a recipe was removed, False otherwise.
+        """
+        return self._connection.execute(
+            "DELETE FROM meal_plan WHERE position = ("
+            "SELECT MIN(meal_plan.position) FROM meal_plan "
+            "JOIN recipes ON recipes.id = meal_plan.recipe_id "
+            "WHERE recipes.name_key = ?)", (name.casefold(),)).rowcount > 0
+
+    def get_meal_plan(self) -> list[tuple[str, str]]:
+        """Returns the recipes in the meal plan, in order."""
+        return self._connection.execute(
+            "SELECT recipes.name, recipes.ingredients FROM meal_plan "
+            "JOIN recipes ON recipes.id = meal_plan.recipe_id "
+            "ORDER BY meal_plan.position").fetchall()
+
+    def get_shopping_groups(self) -> list[tuple[str, str, str, float, int]]:
+        """Sums the ingredients of the meal plan inside the database.
+
+        Ingredients are grouped by casefolded name and dimension, the same as
+        aggregate_shopping_list, in the order they were first seen.
+
+        Returns:
+            A list of (name, units, dimension, total in base units, number of
+            ingredients summed), name and units as first seen, for
+            RunningShoppingList's groups.
+        """
+        return [(name, units, dimension, total, uses)
+                for _, units, name, dimension, total, uses in
+                self._connection.execute(SHOPPING_LIST_QUERY)]
+
+    def save_adjustments(self,
+                         adjustments: dict[tuple[str, str], float]) -> None:
+        """Replaces the saved amounts taken off the shopping list by hand.
+
+        Parameters:
+            adjustments (dict[tuple[str, str], float]): (Casefolded ingredient
+                name, dimension) -> base units taken off, see
+                RunningShoppingList.get_adjustments.
+        """
+        self._connection.execute("DELETE FROM shopping_list_adjustments")
+        self._connection.executemany(
+            "INSERT INTO shopping_list_adjustments VALUES (?, ?, ?)",
+            ((name_key, dimension, amount)
+             for (name_key, dimension), amount in adjustments.items()))
+
+    def get_adjustments(self) -> dict[tuple[str, str], float]:
+        """Returns the saved amounts taken off the shopping list by hand."""
+        return {(name_key, dimension): amount
+                for name_key, dimension, amount in self._connection.execute(
+                    "SELECT name_key, dimension, amount "
+                    "FROM shopping_list_adjustments")}
@@ -0,0 +1,44 @@
+"""
+Tests of the meal planner commands in a1.py.
+"""
+
+import pytest
+
+from a1 import CookBook, MealPlanner
+
+
+@pytest.fixture
+def planner() -> MealPlanner:
+    """A planner whose cook book has names the recipe name argument can
+    and can't reach."""
+    return MealPlanner(cook_book=CookBook({
+        "Pad Thai": "1 cup rice noodles",
+        "green curry": "1 cup rice,2 tbsp curry paste",
+        "Tofu Scramble 2": "300 g tofu",
+        "tofu scramble": "300 g tofu,1 tsp turmeric",
+    }))
+
+
+def test_suggestions_can_be_added(planner: MealPlanner,
+                                  capsys: pytest.CaptureFixture) -> None:
+    """Only names which add finds are suggested, as add reads them."""
+    planner.execute("add green cury")
+    assert "Did you mean: green curry?" in capsys.readouterr().out
+    planner.execute("add pad thia")
+    assert "Did you mean" not in capsys.readouterr().out
+    planner.execute("add tofu scrambel")
+    assert "Did you mean: tofu scramble?" in capsys.readouterr().out
+    planner.execute("add tofu scramble")
+    planner.execute("ls")
+    assert "'tofu scramble'" in capsys.readouterr().out
+
+
+def test_remove_suggestions(planner: MealPlanner,
+                            capsys: pytest.CaptureFixture) -> None:
+    """rm only suggests recipes in the meal plan."""
+    planner.execute("add green curry")
+    capsys.readouterr()
+    planner.execute("rm green cury")
+    assert "Did you mean: green curry?" in capsys.readouterr().out
+    planner.execute("rm tofu scrambel")
+    assert "Did you mean" not in capsys.readouterr().out
@@ -0,0 +1,97 @@
+"""
+Tests of the shopping lists summed by aggregate.py.
+"""
+
+import pytest
+
+import aggregate
+from a1 import INGREDIENT_CACHE, MealPlanner, default_cook_book
+from aggregate import (RunningShoppingList, aggregate_shopping_list,
+                       parse_preferred_units)
+from constants import BROWNIE, MUNG_BEAN_OMELETTE, PEANUT_BUTTER
+
+ONION_SOUP = ("onion soup", "2 large onion,100 g onion,1 tsp salt")
+SALTED_ONION = ("salted onion", "5 g salt,1 large onion")
+
+
+def test_running_list_matches_aggregate() -> None:
+    """Each ingredient gets a row per dimension, as aggregate does."""
+    meal_plan = [ONION_SOUP, SALTED_ONION, PEANUT_BUTTER]
+    running = RunningShoppingList(INGREDIENT_CACHE.get, meal_plan)
+    assert running.get_items() == aggregate_shopping_list(
+        meal_plan, INGREDIENT_CACHE.get)
+    assert (3.0, "large", "onion") in running.get_items()
+    assert (100.0, "g", "onion") in running.get_items()
+
+
+def test_remove_recipe_matches_aggregate() -> None:
+    """Removing a recipe leaves the rows of the rest of the meal plan, in the
+    order they were first added."""
+    running = RunningShoppingList(INGREDIENT_CACHE.get,
+                                  [ONION_SOUP, SALTED_ONION])
+    running.remove_recipe(ONION_SOUP)
+    assert sorted(running.get_items()) == sorted(aggregate_shopping_list(
+        [SALTED_ONION], INGREDIENT_CACHE.get))
+
+
+def test_decrease_by_dimension() -> None:
+    """Amounts are only taken off the row in the units' dimension."""
+    running = RunningShoppingList(INGREDIENT_CACHE.get, [ONION_SOUP])
+    running.decrease("onion", 0.04, units="kg")
+    assert running.get_items() == [(2.0, "large", "onion"),
+                                   (60.0, "g", "onion"),
+                                   (1.0, "tsp", "salt")]
+    running.decrease("salt", 0.5)
+    assert running.get_items()[-1] == (0.5, "tsp", "salt")
+
+
+def test_decrease_needs_units_when_ambiguous() -> None:
+    """An ingredient in two dimensions can't be decreased without units."""
+    running = RunningShoppingList(INGREDIENT_CACHE.get, [ONION_SOUP])
+    with pytest.raises(ValueError):
+        running.decrease("onion", 1)
+    assert running.get_items() == aggregate_shopping_list(
+        [ONION_SOUP], INGREDIENT_CACHE.get)
+
+
+def test_groups_from_store() -> None:
+    """Groups summed by the database give the same list."""
+    running = RunningShoppingList(INGREDIENT_CACHE.get, [ONION_SOUP])
+    seeded = RunningShoppingList(
+        INGREDIENT_CACHE.get,
+        groups=[("onion", "large", "large", 2.0, 1),
+                ("onion", "g", "mass", 100.0, 1),
+                ("salt", "tsp", "volume", 5.0, 1)])
+    assert seeded.get_items() == running.get_items()
+    seeded.remove_recipe(ONION_SOUP)
+    assert seeded.get_items() == []
+
+
+def test_parse_preferred_units() -> None:
+    """Units are keyed by their dimension, and units which can't be
+    converted to, or which share a dimension, are refused."""
+    assert parse_preferred_units(["TSP", "kg"]) == {"volume": "tsp",
+                                                    "mass": "kg"}
+    with pytest.raises(ValueError):
+        parse_preferred_units(["large"])
+    with pytest.raises(ValueError):
+        parse_preferred_units(["tsp", "ml"])
+
+
+def test_planner_preferred_units(capsys) -> None:
+    """A planner shows its shopping list in the preferred units."""
+    planner = MealPlanner(preferred_units={"volume": "ml"})
+    planner.execute(f"add {PEANUT_BUTTER[0]}")
+    planner.execute("g")
+    assert "|   2.5 | ml  | salt     |" in capsys.readouterr().out
+
+
+def test_numpy_reduction_matches_python(monkeypatch) -> None:
+    """The NumPy reduction gives the same totals as the pure Python one."""
+    pytest.importorskip("numpy")
+    meal_plan = [ONION_SOUP, BROWNIE, MUNG_BEAN_OMELETTE, ONION_SOUP,
+                 *default_cook_book().items()]
+    with_numpy = aggregate_shopping_list(meal_plan, INGREDIENT_CACHE.get)
+    monkeypatch.setattr(aggregate, "np", None)
+    assert aggregate_shopping_list(meal_plan, INGREDIENT_CACHE.get) == \
+        with_numpy
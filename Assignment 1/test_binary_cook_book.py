@@ -0,0 +1,70 @@
+"""
+Tests of the compiled cook books in binary_cook_book.py.
+"""
+
+import os
+
+import pytest
+
+from a1 import default_cook_book, parse_ingredient, parse_raw_ingredients
+from benchmark import make_data
+from binary_cook_book import (BinaryCookBook, CookBookFormatError,
+                              compile_cook_book)
+
+
+@pytest.fixture
+def cook_book_file(tmp_path) -> str:
+    """A compiled copy of the default cook book and 500 generated recipes."""
+    filename = os.path.join(tmp_path, "cook_book.ckbk")
+    recipes = {**default_cook_book(), **dict(make_data(500)["cook book"])}
+    assert compile_cook_book(recipes.items(), filename,
+                             parse_ingredient) == len(recipes)
+    return filename
+
+
+def test_round_trip(cook_book_file: str) -> None:
+    """Every recipe reads back as it was written."""
+    recipes = {**default_cook_book(), **dict(make_data(500)["cook book"])}
+    with BinaryCookBook(cook_book_file) as cook_book:
+        assert len(cook_book) == len(recipes)
+        assert dict(cook_book.items()) == recipes
+        assert list(cook_book) == sorted(recipes, key=str.casefold)
+        for name, raw_ingredients in recipes.items():
+            assert cook_book.get_recipe(name) == (name, raw_ingredients)
+            assert cook_book.get_ingredients(name) == \
+                parse_raw_ingredients(raw_ingredients)
+
+
+def test_lookup(cook_book_file: str) -> None:
+    """Names are found ignoring case, and missing names aren't found."""
+    with BinaryCookBook(cook_book_file) as cook_book:
+        assert cook_book["PEANUT Butter"] == default_cook_book()[
+            "peanut butter"]
+        assert "Seitan" in cook_book
+        for missing in ("", "peanut", "peanut butters", "zzz", 7):
+            assert missing not in cook_book
+            assert cook_book.get(missing) is None
+        assert cook_book.get_recipe("aaa") is None
+        assert cook_book.get_ingredients("zzz") is None
+        with pytest.raises(KeyError):
+            cook_book["tofu"]
+
+
+def test_last_duplicate_kept(tmp_path) -> None:
+    """A name given twice (ignoring case) keeps its last recipe."""
+    filename = os.path.join(tmp_path, "cook_book.ckbk")
+    assert compile_cook_book([("Toast", "1 slice bread"),
+                              ("toast", "2 slice bread")], filename,
+                             parse_ingredient) == 1
+    with BinaryCookBook(filename) as cook_book:
+        assert dict(cook_book.items()) == {"toast": "2 slice bread"}
+
+
+@pytest.mark.parametrize("contents", [b"", b"CKBK", b"XXXX" + bytes(64)])
+def test_bad_files(tmp_path, contents: bytes) -> None:
+    """Files which aren't compiled cook books are refused."""
+    filename = os.path.join(tmp_path, "cook_book.ckbk")
+    with open(filename, "wb") as file:
+        file.write(contents)
+    with pytest.raises(CookBookFormatError):
+        BinaryCookBook(filename)
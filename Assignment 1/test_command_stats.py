@@ -0,0 +1,38 @@
+"""
+Tests of the latency statistics in command_stats.py.
+"""
+
+import pytest
+
+from command_stats import BUCKET_GROWTH, MIN_SECONDS, CommandStats
+
+
+@pytest.mark.parametrize("seconds", [3e-6, 0.002, 1.5])
+def test_single_latency(seconds: float) -> None:
+    """With one latency recorded, every percentile is within a bucket of
+    it."""
+    stats = CommandStats()
+    stats.record("add", seconds)
+    summary = stats.get_summary()["add"]
+    for key in ("p50 seconds", "p99 seconds"):
+        assert summary[key] == pytest.approx(seconds, rel=BUCKET_GROWTH - 1)
+
+
+def test_fastest_latencies() -> None:
+    """Latencies under MIN_SECONDS are all reported as at most it."""
+    stats = CommandStats()
+    stats.record("h", 2e-8)
+    assert 0 < stats.get_summary()["h"]["p50 seconds"] <= MIN_SECONDS
+
+
+def test_percentiles_of_many_latencies() -> None:
+    """Percentiles of 1 to 1000 ms are within a bucket of the true ones."""
+    stats = CommandStats()
+    for milliseconds in range(1, 1001):
+        stats.record("g", milliseconds / 1000)
+    summary = stats.get_summary()["g"]
+    assert summary["count"] == 1000
+    assert summary["p50 seconds"] == pytest.approx(0.5,
+                                                   rel=BUCKET_GROWTH - 1)
+    assert summary["p99 seconds"] == pytest.approx(0.99,
+                                                   rel=BUCKET_GROWTH - 1)
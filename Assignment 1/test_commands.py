@@ -0,0 +1,47 @@
+"""
+Tests of the command parser in commands.py.
+"""
+
+import pytest
+
+import commands
+from commands import Command, CommandError, parse_command
+
+
+@pytest.mark.parametrize("user_input, kind", [
+    ("q", commands.QUIT), ("Q", commands.QUIT), ("q 5", commands.QUIT),
+    ("h5", commands.HELP), ("g 5", commands.GENERATE),
+    ("ls -s 2", commands.LIST_SHOPPING), ("mkrec 1", commands.MAKE_RECIPE),
+])
+def test_digits_ignored_like_original_main(user_input: str, kind: str) -> \
+        None:
+    """Commands without arguments match with digits around them, as the
+    original main compared sanitised input."""
+    assert parse_command(user_input) == Command(kind)
+
+
+def test_text_after_command_without_argument() -> None:
+    """Words (not digits) after a command without arguments don't match."""
+    assert parse_command("q now") is None
+    assert parse_command("ls everything") is None
+
+
+def test_paging() -> None:
+    """Paging options are read, and bad ones are reported."""
+    assert parse_command("g --limit 10 --offset 20") == Command(
+        commands.GENERATE, limit=10, offset=20)
+    with pytest.raises(CommandError):
+        parse_command("g --limit ten")
+    assert parse_command("g --limit ten", strict=False) is None
+
+
+def test_remove_ingredient() -> None:
+    """rm -i takes an amount and optionally its units."""
+    assert parse_command("rm -i soy sauce 0.5") == Command(
+        commands.REMOVE_INGREDIENT, argument="soy sauce", amount=0.5)
+    assert parse_command("rm -i onion 100 g") == Command(
+        commands.REMOVE_INGREDIENT, argument="onion", amount=100.0,
+        units="g")
+    with pytest.raises(CommandError):
+        parse_command("rm -i onion")
+
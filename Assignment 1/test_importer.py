@@ -0,0 +1,87 @@
+"""
+Tests of the recipe import in importer.py.
+"""
+
+import json
+import os
+
+import pytest
+
+from a1 import parse_ingredient
+from importer import import_recipes, read_recipes
+
+
+def _write(tmp_path, filename: str, text: str) -> str:
+    """Writes text to filename in tmp_path and returns its path."""
+    path = os.path.join(tmp_path, filename)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+    return path
+
+
+def test_csv(tmp_path) -> None:
+    """Rows of a CSV file become recipes, named in lower case."""
+    path = _write(tmp_path, "recipes.csv",
+                  'name,ingredients\n'
+                  'Peanut Butter,"300 g peanuts, 0.5 tsp salt"\n'
+                  'toast,2 slice bread\n')
+    cook_book = dict()
+    stats = import_recipes(path, cook_book, parse_ingredient)
+    assert cook_book == {"peanut butter": "300 g peanuts,0.5 tsp salt",
+                         "toast": "2 slice bread"}
+    assert (stats["rows"], stats["imported"], stats["rejected"]) == (2, 2, 0)
+
+
+def test_jsonl(tmp_path) -> None:
+    """Ingredients may be a string or a list, blank lines are skipped."""
+    path = _write(tmp_path, "recipes.jsonl", "\n".join([
+        json.dumps({"name": "peanut butter",
+                    "ingredients": "300 g peanuts,0.5 tsp salt"}),
+        "",
+        json.dumps({"name": "toast",
+                    "ingredients": ["2 slice bread", "10 g butter"]})]))
+    assert list(read_recipes(path, parse_ingredient)) == [
+        ("peanut butter", "300 g peanuts,0.5 tsp salt"),
+        ("toast", "2 slice bread,10 g butter")]
+
+
+@pytest.mark.parametrize("line", [
+    "not json",
+    json.dumps(["toast", "2 slice bread"]),
+    json.dumps({"name": " ", "ingredients": "2 slice bread"}),
+    json.dumps({"name": "toast", "ingredients": []}),
+    json.dumps({"name": "toast", "ingredients": "two slice bread"}),
+    json.dumps({"name": "toast", "ingredients": ["2 slice bread", 10]}),
+    json.dumps({"name": "toast",
+                "ingredients": ["2 slice bread, 10 g butter"]}),
+])
+def test_bad_rows_reported(tmp_path, line: str) -> None:
+    """Bad rows are passed to on_error and the good rows still imported."""
+    good = json.dumps({"name": "jam", "ingredients": ["20 g jam"]})
+    path = _write(tmp_path, "recipes.jsonl", f"{good}\n{line}\n{good}\n")
+    errors = list()
+    cook_book = dict()
+    stats = import_recipes(
+        path, cook_book, parse_ingredient,
+        on_error=lambda line_number, message: errors.append(line_number))
+    assert errors == [2]
+    assert cook_book == {"jam": "20 g jam"}
+    assert (stats["rows"], stats["imported"], stats["rejected"]) == (3, 2, 1)
+
+
+def test_bad_csv_row_reported(tmp_path) -> None:
+    """A CSV row with a bad ingredient is reported against its line."""
+    path = _write(tmp_path, "recipes.csv",
+                  "name,ingredients\ntoast,some bread\njam,20 g jam\n")
+    errors = list()
+    assert list(read_recipes(
+        path, parse_ingredient,
+        on_error=lambda *error: errors.append(error))) == [("jam", "20 g jam")]
+    assert errors == [(2, "invalid ingredient 'some bread'")]
+
+
+def test_unknown_format(tmp_path) -> None:
+    """Files which aren't CSV or JSONL are refused."""
+    path = _write(tmp_path, "recipes.txt", "")
+    with pytest.raises(ValueError):
+        import_recipes(path, dict(), parse_ingredient)
@@ -0,0 +1,31 @@
+"""
+Tests of the recipe index in ingredient_index.py.
+"""
+
+import pytest
+
+from a1 import INGREDIENT_CACHE
+from constants import MUNG_BEAN_OMELETTE, PEANUT_BUTTER
+from ingredient_index import IngredientIndex
+
+
+def test_bad_source_leaves_index_unbuilt() -> None:
+    """A source recipe which can't be parsed fails every query, rather than
+    leaving an index built from only the recipes before it."""
+    source = dict([PEANUT_BUTTER, ("broken", "one onion")])
+    index = IngredientIndex(INGREDIENT_CACHE.get, source=source)
+    with pytest.raises(ValueError):
+        index.recipes_using("salt")
+    del source["broken"]
+    assert index.recipes_using("salt") == ["peanut butter"]
+
+
+def test_bad_recipe_leaves_index_unchanged() -> None:
+    """Replacing a recipe with one which can't be parsed keeps the old one."""
+    index = IngredientIndex(INGREDIENT_CACHE.get,
+                            source=dict([PEANUT_BUTTER, MUNG_BEAN_OMELETTE]))
+    index.recipes_using("salt")
+    with pytest.raises(ValueError):
+        index.add_recipe(("peanut butter", "300 g peanuts,salt"))
+    assert index.recipes_using_all(["salt", "oil"]) == ["peanut butter",
+                                                        "omelette"]
@@ -0,0 +1,66 @@
+"""
+Tests of the compact ingredient views in ingredient_store.py.
+"""
+
+import pickle
+
+import pytest
+
+from a1 import (INGREDIENT_CACHE, parse_ingredient, parse_raw_ingredients,
+                recipe_ingredients)
+from aggregate import aggregate_shopping_list
+from constants import PEANUT_BUTTER
+from ingredient_store import IngredientStore, IngredientView
+
+RAW = "300 g peanuts,0.5 tsp salt, 2 tsp oil"
+
+
+def test_view_behaves_like_tuple() -> None:
+    """A view indexes, slices, compares and hashes like the parsed tuple."""
+    view = IngredientStore(parse_ingredient).parse(RAW)
+    parsed = parse_raw_ingredients(RAW)
+    assert isinstance(view, IngredientView)
+    assert view == parsed and parsed == view
+    assert hash(view) == hash(parsed)
+    assert len(view) == 3
+    assert view[0] == (300.0, "g", "peanuts")
+    assert view[-1] == (2.0, "tsp", "oil")
+    assert view[1:] == parsed[1:]
+    assert list(view) == list(parsed)
+    assert repr(view) == repr(parsed)
+    with pytest.raises(IndexError):
+        view[3]
+
+
+def test_strings_interned_once() -> None:
+    """Units and names are shared between recipes."""
+    store = IngredientStore(parse_ingredient)
+    first = store.parse(RAW)
+    second = store.parse("1 tsp salt,5 g peanuts")
+    assert store.get_size() == 5
+    assert first[1][2] is second[0][2]
+
+
+def test_bad_ingredient_leaves_store_unchanged() -> None:
+    """A recipe which can't be parsed raises and interns nothing."""
+    store = IngredientStore(parse_ingredient)
+    with pytest.raises(ValueError):
+        store.parse("1 g new,one onion")
+    assert store.get_size() == 0
+
+
+def test_pickles_as_tuple() -> None:
+    """Views pickle as plain tuples, and the store pickles without its
+    strings, so both can be sent to worker processes."""
+    store = IngredientStore(parse_ingredient)
+    view = store.parse(RAW)
+    assert type(pickle.loads(pickle.dumps(view))) is tuple
+    assert pickle.loads(pickle.dumps(store)).get_size() == 0
+
+
+def test_cached_recipes_are_views() -> None:
+    """recipe_ingredients and the shopping list aggregation use the views."""
+    INGREDIENT_CACHE.clear()
+    assert isinstance(recipe_ingredients(PEANUT_BUTTER), IngredientView)
+    assert aggregate_shopping_list([PEANUT_BUTTER], INGREDIENT_CACHE.get) == \
+        aggregate_shopping_list([PEANUT_BUTTER], parse_raw_ingredients)
@@ -0,0 +1,72 @@
+"""
+Tests of the branch and bound meal plan search in optimiser.py.
+"""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from a1 import INGREDIENT_CACHE, default_cook_book
+from aggregate import normalise_unit
+from optimiser import INGREDIENTS, QUANTITY, optimise_meal_plan
+from pantry import Pantry
+
+NAMES = ("salt", "peanuts", "oil", "onion", "flour", "sugar", "rice", "tofu")
+UNITS = ("g", "kg", "tsp", "tbsp", "ml", "large")
+
+
+def _cost(plan: list[tuple[str, str]], pantry: Pantry,
+          objective: str) -> float:
+    """Returns what a plan needs bought, summed straight from its recipes."""
+    needed: dict[tuple[str, str], float] = dict()
+    for _, raw_ingredients in plan:
+        for amount, units, name in INGREDIENT_CACHE.get(raw_ingredients):
+            dimension, factor = normalise_unit(units)
+            key = (name.casefold(), dimension)
+            needed[key] = needed.get(key, 0.0) + amount * factor
+    to_buy = [amount - pantry.get_base_stock(*key)
+              for key, amount in needed.items()]
+    if objective == INGREDIENTS:
+        return sum(1 for amount in to_buy if amount > 0)
+    return sum(max(0.0, amount) for amount in to_buy)
+
+
+def _cook_book(rng: random.Random, recipes: int) -> dict[str, str]:
+    """Returns a random cook book of small recipes."""
+    return {f"recipe {chr(ord('a') + i)}": ",".join(
+        f"{rng.randint(1, 8)} {rng.choice(UNITS)} {name}"
+        for name in rng.sample(NAMES, k=rng.randint(2, 5)))
+        for i in range(recipes)}
+
+
+@pytest.mark.parametrize("objective", [INGREDIENTS, QUANTITY])
+def test_matches_brute_force(objective: str) -> None:
+    """The search finds a plan as cheap as trying every plan does."""
+    rng = random.Random(1001)
+    for _ in range(40):
+        cook_book = _cook_book(rng, rng.randint(3, 9))
+        meals = rng.randint(1, min(4, len(cook_book)))
+        # The ingredients objective counts a pantry item per recipe, so it is
+        # only compared without one.
+        pantry = Pantry() if objective == INGREDIENTS else Pantry(
+            [(rng.randint(1, 10), rng.choice(UNITS), name)
+             for name in rng.sample(NAMES, k=3)])
+        plan, cost, optimal = optimise_meal_plan(
+            cook_book, meals, INGREDIENT_CACHE.get, pantry=pantry,
+            objective=objective, time_limit=60)
+        best = min(_cost(list(candidate), pantry, objective)
+                   for candidate in combinations(cook_book.items(), meals))
+        assert optimal
+        assert len({name for name, _ in plan}) == meals
+        assert cost == pytest.approx(best)
+        assert _cost(plan, pantry, objective) == pytest.approx(best)
+
+
+def test_bad_arguments() -> None:
+    """Unknown objectives and too many meals are refused."""
+    with pytest.raises(ValueError):
+        optimise_meal_plan(default_cook_book(), 2, INGREDIENT_CACHE.get,
+                           objective="price")
+    with pytest.raises(ValueError):
+        optimise_meal_plan(default_cook_book(), 7, INGREDIENT_CACHE.get)
@@ -0,0 +1,71 @@
+"""
+Tests of netting shopping lists against the pantry in pantry.py.
+"""
+
+import os
+import random
+
+from a1 import parse_ingredient
+from aggregate import AMOUNT_PRECISION, UNIT_CONVERSIONS, normalise_unit
+from pantry import Pantry
+
+NAMES = ("salt", "Salt", "peanuts", "oil", "onion", "flour")
+UNITS = (*UNIT_CONVERSIONS, "large", "stalk")
+
+
+def _nested_loop_net(pantry_items: list[tuple[float, str, str]],
+                     shopping_list: list[tuple[float, str, str]]) -> \
+        list[tuple[float, str, str]]:
+    """Nets a shopping list by scanning every pantry item for each item."""
+    net = list()
+    for amount, units, name in shopping_list:
+        dimension, factor = normalise_unit(units)
+        on_hand = 0.0
+        for stock_amount, stock_units, stock_name in pantry_items:
+            stock_dimension, stock_factor = normalise_unit(stock_units)
+            if stock_name.casefold() == name.casefold() and \
+                    stock_dimension == dimension:
+                on_hand += stock_amount * stock_factor
+        if (needed := round(amount - on_hand / factor,
+                            AMOUNT_PRECISION)) > 0:
+            net.append((needed, units, name))
+    return net
+
+
+def _items(rng: random.Random, count: int) -> list[tuple[float, str, str]]:
+    """Returns count random (amount, units, name) items."""
+    return [(rng.randint(1, 40) / 4, rng.choice(UNITS), rng.choice(NAMES))
+            for _ in range(count)]
+
+
+def test_hash_join_matches_nested_loop() -> None:
+    """Netting through the pantry's table gives the nested loop's result."""
+    rng = random.Random(1001)
+    for _ in range(200):
+        pantry_items = _items(rng, rng.randint(0, 12))
+        shopping_list = _items(rng, rng.randint(0, 12))
+        assert Pantry(pantry_items).net(shopping_list) == \
+            _nested_loop_net(pantry_items, shopping_list)
+
+
+def test_net_keeps_dimensions_apart() -> None:
+    """Stock only counts against items of the same dimension."""
+    pantry = Pantry([(2.0, "large", "onion"), (1.0, "tbsp", "salt")])
+    assert pantry.net([(3.0, "large", "onion"), (100.0, "g", "onion"),
+                       (2.0, "tsp", "SALT")]) == [(1.0, "large", "onion"),
+                                                  (100.0, "g", "onion")]
+    assert pantry.get_stock("salt", "tsp") == 3.0
+    assert len(pantry) == 2
+
+
+def test_load(tmp_path) -> None:
+    """Pantry files skip blank and comment lines and report bad ones."""
+    filename = os.path.join(tmp_path, "pantry.txt")
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("# stock\n500 g peanuts\n\nsome salt\n0.5 kg peanuts\n")
+    errors = list()
+    pantry = Pantry()
+    assert pantry.load(filename, parse_ingredient,
+                       on_error=lambda *error: errors.append(error)) == 2
+    assert errors == [(4, "invalid ingredient 'some salt'")]
+    assert pantry.get_base_stock("peanuts", "mass") == 1000.0
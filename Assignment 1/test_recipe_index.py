@@ -0,0 +1,55 @@
+"""
+Tests of the casefolded recipe index in recipe_index.py.
+"""
+
+import pytest
+
+from a1 import find_recipe, remove_recipe
+from constants import BROWNIE, PEANUT_BUTTER, SEITAN
+from recipe_index import RecipeIndex
+
+SHOUTED_SEITAN = ("SEITAN", SEITAN[1])
+
+
+def test_behaves_like_list() -> None:
+    """The index keeps order and duplicates, like the list it replaces."""
+    recipes = [PEANUT_BUTTER, BROWNIE, PEANUT_BUTTER]
+    index = RecipeIndex(recipes)
+    assert index == recipes and len(index) == 3
+    assert list(index) == recipes
+    assert index[1] == BROWNIE and index[-1] == PEANUT_BUTTER
+    assert repr(index) == repr(recipes)
+    assert BROWNIE in index and SEITAN not in index
+
+
+def test_find_ignores_case() -> None:
+    """find returns the first recipe of that name, as find_recipe does on a
+    list."""
+    recipes = [PEANUT_BUTTER, SHOUTED_SEITAN, SEITAN]
+    index = RecipeIndex(recipes)
+    for name in ("seitan", "Seitan", "peanut butter", "tofu"):
+        assert index.find(name) == find_recipe(name, recipes)
+        assert find_recipe(name, index) == find_recipe(name, recipes)
+
+
+def test_remove_matches_list() -> None:
+    """Removing by name takes the first recipe of that name, as remove_recipe
+    does on a list."""
+    recipes = [SHOUTED_SEITAN, PEANUT_BUTTER, SEITAN]
+    index = RecipeIndex(recipes)
+    for name in ("seitan", "tofu", "peanut butter", "seitan", "seitan"):
+        remove_recipe(name, recipes)
+        remove_recipe(name, index)
+        assert index == recipes
+    assert len(index) == 0
+
+
+def test_remove_exact_recipe() -> None:
+    """remove takes the first equal recipe, skipping others with the same
+    name, and raises like list.remove when there is none."""
+    index = RecipeIndex([SHOUTED_SEITAN, PEANUT_BUTTER, SEITAN])
+    index.remove(SEITAN)
+    assert index == [SHOUTED_SEITAN, PEANUT_BUTTER]
+    assert index.find("seitan") == SHOUTED_SEITAN
+    with pytest.raises(ValueError):
+        index.remove(SEITAN)
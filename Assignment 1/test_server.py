@@ -0,0 +1,42 @@
+"""
+Tests of the sessions run by server.py.
+"""
+
+import asyncio
+
+from a1 import CookBook
+from client import read_reply
+from server import MAX_LINE_LENGTH, handle_session
+
+
+async def _run_session(cook_book: CookBook, lines: list[str]) -> list[str]:
+    """Sends lines to a session and returns every reply."""
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_session(cook_book, reader, writer),
+        host="127.0.0.1", port=0, limit=MAX_LINE_LENGTH)
+    async with server:
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+        await writer.drain()
+        replies = list()
+        while (reply := await read_reply(reader)) is not None:
+            replies.append(reply)
+        writer.close()
+        await writer.wait_closed()
+    return replies
+
+
+def test_bad_recipe_keeps_session_and_cook_book() -> None:
+    """A recipe which can't be parsed gets an error reply, and neither the
+    session nor the shared cook book is broken by it."""
+    cook_book = CookBook()
+    recipes = len(cook_book)
+    replies = asyncio.run(_run_session(cook_book, [
+        "mkrec", "broken", "one onion", "", "uses onion", "add peanut butter",
+        "ls", "q"]))
+    assert len(replies) == 5
+    assert "Could not make broken" in replies[0]
+    assert "broken" not in cook_book.get_recipes()
+    assert len(cook_book) == recipes
+    assert "peanut butter" in replies[3]
@@ -0,0 +1,61 @@
+"""
+Tests of the name indexed shopping list in shopping_list.py.
+"""
+
+import pytest
+
+from a1 import add_to_shopping_list, remove_from_shopping_list
+from shopping_list import ShoppingList
+
+ITEMS = [(300.0, "g", "peanuts"), (0.5, "tsp", "salt"),
+         (200.0, "g", "Peanuts"), (2.0, "tsp", "oil")]
+
+
+def test_add_merges_in_place() -> None:
+    """Items of the same name (ignoring case) are summed, keeping the units,
+    name and position of the first."""
+    shopping_list = ShoppingList(ITEMS)
+    assert shopping_list == [(500.0, "g", "peanuts"), (0.5, "tsp", "salt"),
+                             (2.0, "tsp", "oil")]
+    assert shopping_list.get("PEANUTS") == (500.0, "g", "peanuts")
+    assert shopping_list.get("tofu") is None
+    assert (0.5, "tsp", "salt") in shopping_list
+    assert (1.0, "tsp", "salt") not in shopping_list
+
+
+def test_decrease() -> None:
+    """Taking away leaves the rest, and removes items at or below zero."""
+    shopping_list = ShoppingList(ITEMS)
+    shopping_list.decrease("peanuts", 100)
+    shopping_list.decrease("salt", 0.5)
+    shopping_list.decrease("tofu", 1)
+    assert shopping_list == [(400.0, "g", "peanuts"), (2.0, "tsp", "oil")]
+
+
+def test_matches_list_functions() -> None:
+    """The a1 functions give the same amounts for a ShoppingList as for a
+    list, though a list moves updated items to its end and takes the name of
+    the latest item added."""
+    shopping_list = ShoppingList()
+    items = list()
+    for item in ITEMS:
+        add_to_shopping_list(item, shopping_list)
+        add_to_shopping_list(item, items)
+    for name, amount in (("peanuts", 150.0), ("Salt", 1.0), ("tofu", 1.0)):
+        remove_from_shopping_list(name, amount, shopping_list)
+        remove_from_shopping_list(name, amount, items)
+    assert {name.casefold(): (amount, units)
+            for amount, units, name in shopping_list} == \
+        {name.casefold(): (amount, units) for amount, units, name in items}
+    assert len(shopping_list) == len(items) == 2
+
+
+def test_remove_exact_item() -> None:
+    """remove only takes an item equal to the one given."""
+    shopping_list = ShoppingList(ITEMS)
+    with pytest.raises(ValueError):
+        shopping_list.remove((300.0, "g", "peanuts"))
+    shopping_list.remove((500.0, "g", "peanuts"))
+    assert len(shopping_list) == 2
+    shopping_list.clear()
+    assert shopping_list == []
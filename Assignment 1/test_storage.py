@@ -0,0 +1,41 @@
+"""
+Tests of the SQLite cook book store in storage.py.
+"""
+
+import os
+
+from a1 import MealPlanner, parse_ingredient
+from constants import PEANUT_BUTTER
+from storage import CookBookStore
+
+
+def test_adjustments_saved(tmp_path) -> None:
+    """Saved adjustments are read back after the database is reopened."""
+    database = os.path.join(tmp_path, "cook_book.db")
+    store = CookBookStore(database, parse_ingredient)
+    store.save_adjustments({("salt", "volume"): 1.5, ("onion", "mass"): 20.0})
+    store.close()
+
+    store = CookBookStore(database, parse_ingredient)
+    assert store.get_adjustments() == {("salt", "volume"): 1.5,
+                                       ("onion", "mass"): 20.0}
+    store.close()
+
+
+def test_planner_adjustments_survive_reopen(tmp_path, capsys) -> None:
+    """An ingredient taken off the shopping list stays off it in the next
+    session."""
+    database = os.path.join(tmp_path, "cook_book.db")
+    planner = MealPlanner(database=database)
+    planner.execute(f"add {PEANUT_BUTTER[0]}")
+    planner.execute("rm -i peanuts 100")
+    planner.execute("ls -s")
+    planner.execute("q")
+    before = capsys.readouterr().out
+
+    planner = MealPlanner(database=database)
+    planner.execute("ls -s")
+    planner.execute("q")
+    after = capsys.readouterr().out
+    assert "| 200.0 |  g   | peanuts  |" in before
+    assert after == before
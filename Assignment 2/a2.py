@@ -272,7 +272,8 @@ class Player(Entity):
     Sets up all methods for Player classes and subclasses.
     """
 
-    def __init__(self, max_hp: int, cards: list[Card] | None = None) -> None:
+    def __init__(self, max_hp: int, cards: list[Card] | None = None,
+                 rng: random.Random | None = None) -> None:
         """Initialises the Player class.
 
         Calls the __init__ method of the Entity class to set up basic
@@ -282,6 +283,8 @@ class Player(Entity):
         Parameters:
             max_hp (int): The max (initial) hp of the player.
             cards (list[Card]): The cards to be added to the players deck.
+            rng (random.Random | None): The random number generator cards
+                are drawn with, if None the random module is used.
 
         Usage:
             >>> cards = [Bash(), Bash(), Strike(), Defend()]
@@ -298,6 +301,7 @@ class Player(Entity):
             "discard pile": list(),
         }
         self._entity_attrs["energy"] = 3
+        self._entity_attrs["rng"] = random if rng is None else rng
 
     def __repr__(self) -> str:
         """Returns the string representation of an instance of this object"""
@@ -330,6 +334,10 @@ class Player(Entity):
         else:
             self._entity_attrs["cards"][reset_cards[condition]] = list()
 
+    def get_rng(self) -> random.Random:
+        """Returns the random number generator the player draws cards with."""
+        return self._entity_attrs["rng"]
+
     def get_energy(self) -> int:
         """Returns the player's energy."""
         return self._entity_attrs["energy"]
@@ -421,7 +429,7 @@ class Player(Entity):
             self.get_discarded().clear()
 
         draw_cards(hand=self.get_hand(), deck=self.get_deck(),
-                   discarded=self.get_discarded())
+                   discarded=self.get_discarded(), rng=self.get_rng())
 
     def play_card(self, card_name: str) -> Card | None:
         """Searches through the players hand and plays the specified card if
@@ -445,11 +453,11 @@ class Player(Entity):
 
 class IronClad(Player):
     """Inherits from Player"""
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
         """Initialises IronClad"""
         super().__init__(max_hp=80,
-                         cards=([Strike()] * 5) + ([Defend()] * 4) + [Bash()]
-                         )
+                         cards=([Strike()] * 5) + ([Defend()] * 4) + [Bash()],
+                         rng=rng)
 
     def __repr__(self) -> str:
         """Returns the string representation of an instance of this object"""
@@ -458,12 +466,12 @@ class IronClad(Player):
 
 class Silent(Player):
     """Inherits from Player"""
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
         """Initialises Silent"""
         super().__init__(max_hp=70,
                          cards=(([Strike()] * 5) + ([Defend()] * 5) +
-                                [Neutralize(), Survivor()])
-                         )
+                                [Neutralize(), Survivor()]),
+                         rng=rng)
 
     def __repr__(self) -> str:
         """Returns the string representation of an instance of this object"""
@@ -479,7 +487,7 @@ class Monster(Entity):
 
     MONSTER_ID = -1
 
-    def __init__(self, max_hp: int) -> None:
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
         """Initialises the Monster class.
 
         Calls the __init__ method of the Entity class to set up basic
@@ -487,11 +495,15 @@ class Monster(Entity):
 
         Parameters:
              max_hp (int): The maximum (initial) hp of the monster.
+             rng (random.Random | None): The random number generator the
+                monster's actions are drawn with, if None the random module
+                is used.
         """
         super().__init__(max_hp=max_hp)
         Monster.MONSTER_ID += 1
         self._entity_attrs["uid"] = Monster.MONSTER_ID
         self._entity_attrs["action"] = NotImplementedError
+        self._entity_attrs["rng"] = random if rng is None else rng
 
     def get_id(self) -> int:
         """Returns the UID (Unique ID) of the monster."""
@@ -507,19 +519,20 @@ class Monster(Entity):
 
 class Louse(Monster):
     """Subclass of Monster"""
-    def __init__(self, max_hp: int) -> None:
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
         """Initialises an instance of Louse"""
-        super().__init__(max_hp=max_hp)
-        self._entity_attrs["action"] = {"damage": random_louse_amount()}
+        super().__init__(max_hp=max_hp, rng=rng)
+        self._entity_attrs["action"] = {
+            "damage": random_louse_amount(self._entity_attrs["rng"])}
         if self.get_strength() > 0:
             self._entity_attrs["action"]["strength"] = self.get_strength()
 
 
 class Cultist(Monster):
     """Subclass of Monster"""
-    def __init__(self, max_hp: int) -> None:
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
         """Initialises an instance of Cultist"""
-        super().__init__(max_hp=max_hp)
+        super().__init__(max_hp=max_hp, rng=rng)
         self._entity_attrs["action calls"] = 0
 
     def action(self) -> dict[str, int]:
@@ -537,9 +550,9 @@ class Cultist(Monster):
 
 class JawWorm(Monster):
     """Subclass of Monster"""
-    def __init__(self, max_hp: int) -> None:
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
         """Initialises an instance of JawWorm"""
-        super().__init__(max_hp=max_hp)
+        super().__init__(max_hp=max_hp, rng=rng)
 
     def action(self) -> dict[str, int]:
         """Returns a dictionary with the amount of damage, weak and strength
@@ -564,16 +577,26 @@ class JawWorm(Monster):
 class Encounter:
     """Class to handle encounters.
 
-    Sets up all methods for Encounter classes.
+    Sets up all methods for Encounter classes. The monsters are kept in a
+    dictionary keyed by their id, which keeps them in the order they were
+    added (the order they are displayed in), so finding, targeting and
+    removing a monster is O(1).
     """
 
-    def __init__(self, player: Player, monsters: list[tuple[str, int]]) -> None:
+    def __init__(self, player: Player, monsters: list[tuple[str, int]],
+                 rng: random.Random | None = None,
+                 monster_types: dict[str, type] | None = None) -> None:
         """Initialises  the Encounter class.
 
         Parameters:
             player (Player): The player.
             monsters (list[tuple[str, int]]): A list of the monsters in the
                 encounter, [("Louse", 10), ("Cultist", 5), ...].
+            rng (random.Random | None): The random number generator the
+                monsters use, if None the player's is used.
+            monster_types (dict[str, type] | None): Monster type (lower
+                case) -> the class to make it with, if None the subclasses
+                of Monster are used.
 
         Usage:
             >>> monsters = [("Louse", 15), ("Louse", 10)]
@@ -582,62 +605,57 @@ class Encounter:
         """
         self._encounter_attrs = {
             "player": player,
-            "monsters": self._init_monsters(monsters),
+            # Monster id -> monster, in display order
+            "monsters": {monster.get_id(): monster
+                         for monster in self._init_monsters(
+                             monsters, player.get_rng() if rng is None
+                             else rng, monster_types)},
             "player turn": True,
         }
         self._encounter_attrs["player"].start_new_encounter()
         self.start_new_turn()
 
     @staticmethod
-    def _init_monsters(monsters: list[tuple[str, int]]) -> list[Monster]:
+    def _init_monsters(monsters: list[tuple[str, int]], rng: random.Random,
+                       monster_types: dict[str, type] | None = None) -> \
+            list[Monster]:
         """Turns the list into a list of monsters classes.
 
         Parameters:
             monsters (list[tuple[str, int]]): A list of the monsters in the
                 encounter, [("Louse", 10), ("Cultist", 5), ...].
+            rng (random.Random): The random number generator the monsters
+                use.
+            monster_types (dict[str, type] | None): Monster type (lower
+                case) -> class, if None the subclasses of Monster.
         """
-        str_to_class = {monster_class.__name__.lower(): monster_class
-                        for monster_class in Monster.__subclasses__()}
+        str_to_class = monster_types
+        if str_to_class is None:
+            str_to_class = {monster_class.__name__.lower(): monster_class
+                            for monster_class in Monster.__subclasses__()}
         active_monsters = [
-            str_to_class[monster[0].lower()](monster[1])
+            str_to_class[monster[0].lower()](monster[1], rng=rng)
             for monster in monsters
         ]
         return active_monsters
 
-    def _get_monster_by_id(self,
-                           monster_id: int) -> tuple[Monster, int] | \
-                                               tuple[None, float]:
-        """Finds and returns the monster and its index.
-
-        Loops through the encounter's monsters, finds the monster
-        corresponding to monster_id (if it exists) and returns the monster
-        with its index in the encounters monster list. If it does not exist
-        it returns (None, float("inf")).
+    def _get_monster_by_id(self, monster_id: int | None) -> Monster | None:
+        """Returns the monster with the id monster_id, or None if it isn't
+        in the encounter.
 
         Parameters:
-            monster_id (int): The id of the monster to find.
-
-        Returns:
-            Either (monster, index) or (None, float("inf"))
+            monster_id (int | None): The id of the monster to find.
         """
-        for index, monster in enumerate(self.get_monsters()):
-            if monster_id == monster.get_id():
-                return monster, index
-        return None, float("inf")
+        return self._encounter_attrs["monsters"].get(monster_id)
 
     def _remove_by_id(self, monster_id: int) -> None:
-        """Removes a monster from the monsters list.
-
-        Loops through the monsters list and removes the monster corresponding
-            to that id.
+        """Removes the monster with the id monster_id, if it is in the
+        encounter, keeping the others in order.
 
         Parameters:
             monster_id (int): The id of the monster to remove.
         """
-        monster = self._get_monster_by_id(monster_id=monster_id)
-        if monster[1] == float("inf"):
-            return
-        del self.get_monsters()[monster[1]]
+        self._encounter_attrs["monsters"].pop(monster_id, None)
 
     def _player_play_card(self, card_name: str,
                           target_id: int | None = None) -> Card | None:
@@ -656,22 +674,19 @@ class Encounter:
             otherwise the player cannot make that move.
         """
         player = self.get_player()
-        starting_player_energy = player.get_energy()
-        starting_cards = (player.get_hand().copy(),
-                          player.get_discarded().copy())
-        card = self.get_player().play_card(card_name)
-
-        if (
-                (card is None) or
-                (card.requires_target() and target_id is None) or
-                (not self._encounter_attrs["player turn"])
-        ):
-            if card is not None:
-                player.set_energy(starting_player_energy)
-                player.set_cards(starting_cards[1], 2)
-                player.set_cards(starting_cards[0], 1)
+        if not self._encounter_attrs["player turn"]:
             return None
-        return card
+        if target_id is None:
+            # Finds the card play_card would play, so the move is refused
+            # before anything changes rather than undone afterwards.
+            energy = player.get_energy()
+            for card in player.get_hand():
+                if card.get_name() == card_name and \
+                        energy >= card.get_energy_cost():
+                    if card.requires_target():
+                        return None
+                    break
+        return player.play_card(card_name)
 
     def start_new_turn(self) -> None:
         """Starts a new player turn."""
@@ -682,7 +697,7 @@ class Encounter:
         """Ends the player's turn."""
         self._encounter_attrs["player"].end_turn()
         self._encounter_attrs["player turn"] = False
-        for monster in self._encounter_attrs["monsters"]:
+        for monster in self._encounter_attrs["monsters"].values():
             monster.new_turn()
 
     def get_player(self) -> Player:
@@ -690,12 +705,16 @@ class Encounter:
         return self._encounter_attrs["player"]
 
     def get_monsters(self) -> list[Monster]:
-        """Gets a list of Monsters still active in the encounter."""
-        return self._encounter_attrs["monsters"]
+        """Gets a list of Monsters still active in the encounter.
+
+        The list is a copy, in display order. Changing it doesn't change the
+        encounter, monsters are only removed when they are defeated.
+        """
+        return list(self._encounter_attrs["monsters"].values())
 
     def is_active(self) -> bool:
         """Checks to see if any monsters are still alive (active)."""
-        for monster in self.get_monsters():
+        for monster in self._encounter_attrs["monsters"].values():
             if not monster.is_defeated():
                 return True
         return False
@@ -725,29 +744,30 @@ class Encounter:
         # Check if required fields are filled, and it's the players turn
 
         monster = self._get_monster_by_id(monster_id=target_id)
-        if monster[1] == float("inf") and target_id:
+        # As before, a card which doesn't need a target ignores a target id
+        # of 0 which no monster has.
+        if monster is None and (target_id or card.requires_target()):
             return False
 
+        modifiers = card.get_status_modifiers()
         player.add_block(card.get_block())
-        if "strength" in card.get_status_modifiers():
-            player.add_strength(card.get_status_modifiers()["strength"])
+        if "strength" in modifiers:
+            player.add_strength(modifiers["strength"])
 
         if not card.requires_target():
             return True
 
-        for effect in card.get_status_modifiers():
+        for effect in modifiers:
             if effect == "weak":
-                monster[0].add_weak(
-                    card.get_status_modifiers()["weak"])
+                monster.add_weak(modifiers["weak"])
             if effect == "vulnerable":
-                monster[0].add_vulnerable(
-                    card.get_status_modifiers()["vulnerable"])
+                monster.add_vulnerable(modifiers["vulnerable"])
         damage = int(card.get_damage_amount() +
                      player.get_strength() *
-                     (1.5 if monster[0].get_vulnerable() > 0 else 1) *
+                     (1.5 if monster.get_vulnerable() > 0 else 1) *
                      (0.75 if player.get_weak() > 0 else 1))
-        monster[0].reduce_hp(damage)
-        if monster[0].is_defeated():
+        monster.reduce_hp(damage)
+        if monster.is_defeated():
             self._remove_by_id(monster_id=target_id)
         return True
 
@@ -760,9 +780,7 @@ class Encounter:
             return
 
         player = self.get_player()
-        monsters = self.get_monsters()
-
-        for monster in monsters:
+        for monster in self._encounter_attrs["monsters"].values():
             action = monster.action()
             action["damage"] += action.get("strength", 0)
 
@@ -57,18 +57,21 @@ def read_game_file(filename: str) -> list[list[tuple[str, int]]]:
     return encounters
 
 
-def select_cards(cards: list, amount: int) -> list['Card']:
+def select_cards(cards: list, amount: int,
+                 rng: random.Random = random) -> list['Card']:
     """ Selects an amount of cards from the cards list, removes those cards from
         the original cards list, and returns the selected cards.
     
         Parameters:
             cards (list): The list of cards to select from.
             amount (int): The amount of cards to select.
+            rng (random.Random): The random number generator to select with,
+                                 the random module by default.
         
         Returns:
             list[Card]: The selected cards.
     """
-    selected_indices = random.sample(range(len(cards)), k=amount)
+    selected_indices = rng.sample(range(len(cards)), k=amount)
     selected_cards = [cards[i] for i in selected_indices]
     for i in sorted(selected_indices, reverse=True):
         cards.pop(i)
@@ -78,7 +81,8 @@ def select_cards(cards: list, amount: int) -> list['Card']:
 def draw_cards(
         deck: list['Card'],
         hand: list['Card'],
-        discarded: list['Card']
+        discarded: list['Card'],
+        rng: random.Random = random
 ) -> None:
     """ Handles drawing cards from the deck to the hand at the beginning of a
         turn.
@@ -89,6 +93,8 @@ def draw_cards(
             discarded (list[Card]): The discard pile used to replenish
                                     the deck if there aren't enough cards
                                     available.
+            rng (random.Random): The random number generator to draw with,
+                                 the random module by default.
     """
     hand.clear()
     if len(deck) < 5:
@@ -96,9 +102,10 @@ def draw_cards(
         deck.clear()
         deck.extend(discarded)
         discarded.clear()
-    hand.extend(select_cards(deck, 5 - len(hand)))
+    hand.extend(select_cards(deck, 5 - len(hand), rng))
 
 
-def random_louse_amount() -> int:
-    """ (int) Returns a random amount of damage for a louse to give. """
-    return random.randint(5, 7)
+def random_louse_amount(rng: random.Random = random) -> int:
+    """ (int) Returns a random amount of damage for a louse to give, drawn
+        from rng (the random module by default). """
+    return rng.randint(5, 7)
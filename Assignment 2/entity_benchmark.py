@@ -0,0 +1,91 @@
+"""
+Compares the dictionary based entities of a2.py with the __slots__ based
+ones of slot_entities.py.
+
+For each it reports the bytes allocated per Louse (measured with tracemalloc
+over many monsters, so it includes every dictionary and list the monster
+owns), getter calls per second and per second of a turn's worth of
+add_*/reduce_hp/new_turn calls.
+
+Usage:
+    python entity_benchmark.py --monsters 100000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import a2
+import slot_entities
+
+
+def bytes_per_monster(monster_type: type, count: int) -> float:
+    """Returns the bytes allocated per monster when making count of them."""
+    rng = random.Random(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    monsters = [monster_type(10, rng=rng) for _ in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # The list holding them isn't part of the monsters
+    return (allocated - monsters.__sizeof__()) / count
+
+
+def calls_per_second(run: Callable[[], None], calls: int,
+                     repeat: int) -> float:
+    """Returns calls / the fastest time run takes out of repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return calls / best
+
+
+def getters(monsters: list) -> None:
+    """Calls every getter of every monster."""
+    for monster in monsters:
+        monster.get_hp()
+        monster.get_max_hp()
+        monster.get_block()
+        monster.get_strength()
+        monster.get_weak()
+        monster.get_vulnerable()
+        monster.get_id()
+
+
+def mutators(monsters: list) -> None:
+    """Plays a turn's worth of state changes on every monster."""
+    for monster in monsters:
+        monster.add_block(5)
+        monster.add_weak(1)
+        monster.add_vulnerable(2)
+        monster.add_strength(0)
+        monster.reduce_hp(6)
+        monster.new_turn()
+
+
+def main(count: int, repeat: int) -> None:
+    """Prints the comparison table."""
+    print(f"| {'entities':<8} | {'bytes/monster':>13} | "
+          f"{'getters M/s':>11} | {'mutators M/s':>12} |")
+    for label, module in (("dict", a2), ("slots", slot_entities)):
+        monsters = [module.Louse(count, rng=random.Random(0))
+                    for _ in range(count)]
+        memory = bytes_per_monster(module.Louse, count)
+        read = calls_per_second(lambda: getters(monsters), 7 * count, repeat)
+        write = calls_per_second(lambda: mutators(monsters), 6 * count,
+                                 repeat)
+        print(f"| {label:<8} | {memory:>13.0f} | {read / 1e6:>11.2f} | "
+              f"{write / 1e6:>12.2f} |")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compares the dict and __slots__ entity representations.")
+    parser.add_argument("--monsters", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.monsters, args.repeat)
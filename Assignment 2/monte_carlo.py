@@ -0,0 +1,236 @@
+"""
+Monte Carlo estimates of the chance of winning a game, across processes.
+
+Games are played by simulator.simulate_game in worker processes, in chunks
+of consecutive game numbers. Each game gets its own random.Random seeded
+from (seed, game number), and Monster.MONSTER_ID, a class level counter, is
+restarted in the worker before each game. So every game is reproducible
+from the seed alone, whichever worker plays it and in whatever order the
+chunks finish.
+
+Estimates use the Wilson score interval, which stays inside [0, 1] and is
+reasonable even when almost every game is won or lost.
+
+Usage:
+    python monte_carlo.py games/*.txt --games 100000 --precision 0.005
+"""
+
+import argparse
+import math
+import os
+import random
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, \
+    wait
+from functools import lru_cache
+from statistics import NormalDist
+from typing import NamedTuple
+
+from a2 import Monster, Player
+from a2_support import read_game_file
+from simulator import GreedyPolicy, Policy, RandomPolicy, simulate_game
+
+PLAYER_TYPES = {player_type.__name__.lower(): player_type
+                for player_type in Player.__subclasses__()}
+# Policy name -> function making the policy from the random number generator
+# it may use.
+POLICIES = {"greedy": lambda rng: GreedyPolicy(), "random": RandomPolicy}
+# Games played by a worker per task, large enough that sending the task
+# costs little next to playing it.
+DEFAULT_CHUNK_SIZE = 250
+DEFAULT_CONFIDENCE = 0.95
+
+
+class Estimate(NamedTuple):
+    """A win rate estimate from the games finished so far.
+
+    low and high bound the win rate with the requested confidence.
+    """
+    wins: int
+    games: int
+    rate: float
+    low: float
+    high: float
+
+
+def wilson_interval(wins: int, games: int,
+                    confidence: float = DEFAULT_CONFIDENCE) -> \
+        tuple[float, float]:
+    """Returns the Wilson score interval of a win rate.
+
+    Parameters:
+        wins (int): The number of games won.
+        games (int): The number of games played, more than 0.
+        confidence (float): The chance the interval holds the true rate.
+
+    Usage:
+        >>> wilson_interval(50, 100)
+        (0.4038315303659957, 0.5961684696340044)
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = wins / games
+    scale = 1 + z * z / games
+    centre = (rate + z * z / (2 * games)) / scale
+    spread = z * math.sqrt(rate * (1 - rate) / games +
+                           z * z / (4 * games * games)) / scale
+    # Exact at the ends, where rounding would leave the rate outside
+    return (0.0 if wins == 0 else max(0.0, centre - spread),
+            1.0 if wins == games else min(1.0, centre + spread))
+
+
+def _positive_int(text: str) -> int:
+    """Returns text as an integer of at least 1, for argparse.
+
+    Raises:
+        argparse.ArgumentTypeError: If text isn't a positive integer.
+    """
+    try:
+        number = int(text)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {text!r}")
+    return number
+
+
+@lru_cache
+def _read_game(filename: str) -> list[list[tuple[str, int]]]:
+    """Returns the encounters of a game file, reading it once per worker."""
+    return read_game_file(filename)
+
+
+def play_games(player: str, filename: str, policy: str, seed: int,
+               first: int, count: int) -> int:
+    """Plays games first to first + count - 1 and returns how many were won.
+
+    Game number n is played with a random number generator seeded from
+    (seed, n) and monster ids starting from 0, so it always plays out the
+    same.
+
+    Parameters:
+        player (str): The player type, a key of PLAYER_TYPES.
+        filename (str): The game file.
+        policy (str): The policy, a key of POLICIES.
+        seed (int): The seed of the whole run.
+        first (int): The number of the first game.
+        count (int): The number of games to play.
+    """
+    encounters = _read_game(filename)
+    player_type = PLAYER_TYPES[player]
+    game_rng = random.Random()
+    policy_rng = random.Random()
+    game_policy: Policy = POLICIES[policy](policy_rng)
+    wins = 0
+    for game in range(first, first + count):
+        game_rng.seed(f"{seed}:{game}")
+        policy_rng.seed(f"{seed}:{game}:policy")
+        Monster.MONSTER_ID = -1
+        wins += simulate_game(player_type, encounters, game_policy,
+                              rng=game_rng).won
+    return wins
+
+
+def estimate_win_rate(
+        executor: ProcessPoolExecutor, player: str, filename: str,
+        games: int, policy: str = "greedy", seed: int = 0,
+        precision: float | None = None,
+        confidence: float = DEFAULT_CONFIDENCE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        in_flight: int | None = None
+) -> Iterator[Estimate]:
+    """Plays up to games games on executor, yielding an Estimate as each
+    chunk of games finishes.
+
+    Only in_flight chunks are queued at once, so once the interval is no
+    wider than precision either side of the rate the remaining games are
+    never started and the last estimate is yielded.
+
+    Parameters:
+        executor (ProcessPoolExecutor): The worker processes.
+        player (str): The player type, a key of PLAYER_TYPES.
+        filename (str): The game file.
+        games (int): The most games to play.
+        policy (str): The policy, a key of POLICIES.
+        seed (int): Seed of the run, the same seed gives the same games.
+        precision (float | None): Stop once the interval's half width is at
+            most this, if None every game is played.
+        confidence (float): The confidence of the intervals.
+        chunk_size (int): Games per task.
+        in_flight (int | None): Tasks queued at once, if None twice the
+            number of CPUs.
+
+    Raises:
+        ValueError: If player or policy is unknown.
+    """
+    if player not in PLAYER_TYPES or policy not in POLICIES:
+        raise ValueError(f"Unknown player or policy, {player=}, {policy=}")
+    if in_flight is None:
+        in_flight = 2 * (os.cpu_count() or 1)
+    # Queued chunk -> number of games in it
+    pending: dict[Future, int] = dict()
+    next_game = 0
+    wins = played = 0
+    try:
+        while True:
+            while len(pending) < in_flight and next_game < games:
+                count = min(chunk_size, games - next_game)
+                pending[executor.submit(play_games, player, filename, policy,
+                                        seed, next_game, count)] = count
+                next_game += count
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                wins += future.result()
+                played += pending.pop(future)
+            low, high = wilson_interval(wins, played, confidence)
+            yield Estimate(wins, played, wins / played, low, high)
+            if precision is not None and (high - low) / 2 <= precision:
+                return
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Estimates the chance each player type wins each game "
+                    "file.")
+    parser.add_argument("game_files", nargs="+")
+    parser.add_argument("--players", nargs="+", choices=PLAYER_TYPES,
+                        default=list(PLAYER_TYPES))
+    parser.add_argument("--games", type=_positive_int, default=10000)
+    parser.add_argument("--policy", choices=POLICIES, default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--precision", type=float, default=None,
+                        help="Stop once the win rate is known to within this.")
+    parser.add_argument("--workers", type=_positive_int, default=None)
+    parser.add_argument("--chunk-size", type=_positive_int,
+                        default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--quiet", action="store_true",
+                        help="Only print the final estimate of each run.")
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for game_file in args.game_files:
+            for player_name in args.players:
+                start = time.perf_counter()
+                estimate = None
+                for estimate in estimate_win_rate(
+                        pool, player_name, game_file, args.games,
+                        policy=args.policy, seed=args.seed,
+                        precision=args.precision,
+                        chunk_size=args.chunk_size,
+                        in_flight=None if args.workers is None else
+                        2 * args.workers):
+                    if not args.quiet:
+                        print(f"\r{game_file} {player_name}: "
+                              f"{estimate.rate:.4f} [{estimate.low:.4f}, "
+                              f"{estimate.high:.4f}] after {estimate.games}",
+                              end="", flush=True)
+                seconds = time.perf_counter() - start
+                print(f"\r{game_file} {player_name}: {estimate.rate:.4f} "
+                      f"[{estimate.low:.4f}, {estimate.high:.4f}] after "
+                      f"{estimate.games} games, {seconds:.1f}s")
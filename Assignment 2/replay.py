@@ -0,0 +1,246 @@
+"""
+Compact logs of simulated games, and replaying them exactly.
+
+Every random choice in a game (the cards drawn and each louse's damage) is
+made by the one random.Random the game is played with, so a game is fully
+described by that generator's seed and the moves made. A GameLog holds the
+seed, the player type, the encounters and the moves, plus the GameResult
+the game reached. Targets are logged by their position in get_monsters()
+rather than by monster id, so a log reads the same whichever monsters were
+made before the game. A target id which no monster had is logged as that id,
+and the value of Monster.MONSTER_ID (a class level counter) the game started
+with is logged and restored, so such an id is replayed exactly as it was
+played.
+
+Replaying feeds the logged moves back through simulator.simulate_game, so it
+runs at simulation speed, and checks the result (win, turns, encounters won
+and the HP after every enemy turn) matches the log.
+
+Logs are saved one JSON object per line, so a file can collect any number
+of games, e.g. every failing run of a test.
+
+Usage:
+    python replay.py failures.jsonl
+"""
+
+import json
+import random
+from typing import NamedTuple
+
+from a2 import Encounter, Monster, Player
+from simulator import MAX_TURNS, GameResult, Policy, simulate_game
+
+PLAYER_TYPES = {player_type.__name__: player_type
+                for player_type in Player.__subclasses__()}
+
+
+class ReplayMismatchError(ValueError):
+    """Raised when a replayed game doesn't match its log."""
+
+
+class GameLog(NamedTuple):
+    """Everything needed to replay a game.
+
+    moves are (card name, target position or None) in the order they were
+    chosen, None for ending the turn, including moves which failed. A move
+    at a target id no monster in the encounter had is (card name, None,
+    target id). first_monster_id is Monster.MONSTER_ID when the game began.
+    """
+    seed: int
+    player: str
+    encounters: list[list[tuple[str, int]]]
+    moves: list[tuple[str, int | None] | tuple[str, None, int] | None]
+    result: GameResult
+    first_monster_id: int = -1
+
+
+class RecordingPolicy(Policy):
+    """Plays the moves of another policy and logs them."""
+
+    def __init__(self, policy: Policy) -> None:
+        """Initialises an instance of RecordingPolicy.
+
+        Parameters:
+            policy (Policy): The policy choosing the moves.
+        """
+        self._policy = policy
+        self._moves: list[tuple[str, int | None] | tuple[str, None, int] |
+                          None] = list()
+
+    def get_moves(self) -> list[tuple[str, int | None] |
+                                tuple[str, None, int] | None]:
+        """Returns the moves chosen so far, targets as positions, see
+        GameLog."""
+        return self._moves
+
+    def choose_move(self, encounter: Encounter) -> tuple[str, int | None] | \
+            None:
+        """Returns and logs the wrapped policy's move."""
+        move = self._policy.choose_move(encounter)
+        if move is None or move[1] is None:
+            self._moves.append(move)
+            return move
+        card_name, target_id = move
+        for position, monster in enumerate(encounter.get_monsters()):
+            if monster.get_id() == target_id:
+                self._moves.append((card_name, position))
+                break
+        else:
+            self._moves.append((card_name, None, target_id))
+        return move
+
+
+class ReplayPolicy(Policy):
+    """Plays the moves of a log in order."""
+
+    def __init__(self, moves: list[tuple[str, int | None] |
+                                   tuple[str, None, int] | None]) -> None:
+        """Initialises an instance of ReplayPolicy.
+
+        Parameters:
+            moves (list): The logged moves, targets as positions, see
+                GameLog.
+        """
+        self._moves = moves
+        self._next = 0
+
+    def is_finished(self) -> bool:
+        """Checks if every logged move has been played."""
+        return self._next == len(self._moves)
+
+    def choose_move(self, encounter: Encounter) -> tuple[str, int | None] | \
+            None:
+        """Returns the next logged move, with the target as an id.
+
+        Raises:
+            ReplayMismatchError: If the log has no moves left, or the logged
+                target position is past the encounter's monsters.
+        """
+        if self.is_finished():
+            raise ReplayMismatchError("The game went on after the logged "
+                                      "moves ran out")
+        move = self._moves[self._next]
+        self._next += 1
+        if move is None:
+            return move
+        if len(move) == 3:  # A target id no monster had
+            return move[0], move[2]
+        card_name, position = move
+        if position is None:
+            return move
+        monsters = encounter.get_monsters()
+        if not 0 <= position < len(monsters):
+            raise ReplayMismatchError(f"No monster at logged {position=}")
+        return card_name, monsters[position].get_id()
+
+
+def record_game(player_type: type[Player],
+                encounters: list[list[tuple[str, int]]], policy: Policy,
+                seed: int, max_turns: int = MAX_TURNS) -> GameLog:
+    """Plays a game with simulate_game and returns its log.
+
+    Parameters:
+        player_type (type[Player]): The player class, e.g. IronClad.
+        encounters (list[list[tuple[str, int]]]): The monsters in each
+            encounter, as returned by read_game_file.
+        policy (Policy): Chooses every move.
+        seed (int): Seeds the game's random number generator.
+        max_turns (int): The player turns after which the game is lost.
+
+    Usage:
+        >>> log = record_game(Silent, read_game_file("games/game1.txt"),
+        GreedyPolicy(), seed=7)
+        >>> log.moves[:3]
+        [('Strike', 0), ('Strike', 0), ('Strike', 0)]
+    """
+    recorder = RecordingPolicy(policy)
+    first_monster_id = Monster.MONSTER_ID
+    result = simulate_game(player_type, encounters, recorder,
+                           max_turns=max_turns, rng=random.Random(seed))
+    return GameLog(seed, player_type.__name__, encounters,
+                   recorder.get_moves(), result, first_monster_id)
+
+
+def replay_game(log: GameLog, max_turns: int = MAX_TURNS) -> GameResult:
+    """Replays a logged game and checks it plays out the same.
+
+    Monster.MONSTER_ID is set back to the value the game began with, so the
+    monsters get the same ids.
+
+    Parameters:
+        log (GameLog): The game to replay.
+        max_turns (int): The same max_turns the game was recorded with.
+
+    Returns:
+        The result of the replayed game.
+
+    Raises:
+        ReplayMismatchError: If the replay doesn't use every move or reach
+            the logged result.
+    """
+    if log.player not in PLAYER_TYPES:
+        raise ReplayMismatchError(f"Unknown player type, {log.player=}")
+    replayer = ReplayPolicy(log.moves)
+    Monster.MONSTER_ID = log.first_monster_id
+    result = simulate_game(PLAYER_TYPES[log.player], log.encounters,
+                           replayer, max_turns=max_turns,
+                           rng=random.Random(log.seed))
+    if not replayer.is_finished():
+        raise ReplayMismatchError("The game ended before the logged moves")
+    if result != log.result:
+        raise ReplayMismatchError(f"Replayed {result}, logged {log.result}")
+    return result
+
+
+def dump_log(log: GameLog) -> str:
+    """Returns log as one line of JSON."""
+    return json.dumps({"seed": log.seed, "player": log.player,
+                       "encounters": log.encounters, "moves": log.moves,
+                       "result": log.result._asdict(),
+                       "first_monster_id": log.first_monster_id},
+                      separators=(",", ":"))
+
+
+def load_log(line: str) -> GameLog:
+    """Returns the GameLog dumped as line by dump_log.
+
+    Raises:
+        ValueError: If line isn't a dumped log.
+    """
+    try:
+        data = json.loads(line)
+        return GameLog(
+            seed=data["seed"], player=data["player"],
+            encounters=[[(monster_type, hp) for monster_type, hp in monsters]
+                        for monsters in data["encounters"]],
+            moves=[None if move is None else tuple(move)
+                   for move in data["moves"]],
+            result=GameResult(**data["result"]),
+            first_monster_id=data.get("first_monster_id", -1))
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Not a game log, {error}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Replays every game log in a file.")
+    parser.add_argument("log_file")
+    args = parser.parse_args()
+
+    replayed = mismatched = 0
+    start = time.perf_counter()
+    with open(args.log_file) as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                replay_game(load_log(line))
+            except ValueError as error:
+                mismatched += 1
+                print(f"Line {line_number}: {error}")
+            replayed += 1
+    print(f"Replayed {replayed} games, {mismatched} mismatched, in "
+          f"{time.perf_counter() - start:.2f}s")
@@ -0,0 +1,204 @@
+"""
+Headless simulation of the card game in a2.py.
+
+simulate_game plays every encounter of a game in order with one player, the
+same as main, but asks a policy for each move instead of prompting and never
+prints. Moves go straight to Encounter.player_apply_card, so no command text
+is built or parsed. A move which can't be played ends the player's turn, so
+every policy makes progress, and a game which goes on for max_turns player
+turns is counted as a loss.
+
+On one core games/game2.txt plays at roughly 3,000 games per second with
+the entities of a2.py, a little faster with slot_entities.py. Most of the
+time goes to the rules themselves (drawing a hand with random.sample every
+turn, the dictionary based entities and the checks of every card played),
+so for many more games spread them over processes with monte_carlo.py.
+
+Usage:
+    python simulator.py ironclad games/game2.txt --games 10000
+"""
+
+import random
+from typing import NamedTuple
+
+from a2 import Card, Encounter, Player
+
+# Player turns a game may take before it is counted as a loss, so games
+# against monsters which never attack (e.g. an untouched JawWorm) still end.
+MAX_TURNS = 1000
+
+
+class GameResult(NamedTuple):
+    """The outcome of one simulated game.
+
+    won is whether every encounter was won, turns the number of player turns
+    taken, encounters_won the number of encounters won and hp the player's HP
+    at the start of the game and after every enemy turn.
+    """
+    won: bool
+    turns: int
+    encounters_won: int
+    hp: list[int]
+
+
+class Policy:
+    """Parent class to all policies, which choose the player's moves."""
+
+    def choose_move(self, encounter: Encounter) -> tuple[str, int | None] | \
+            None:
+        """Returns the next move to make in encounter.
+
+        Parameters:
+            encounter (Encounter): The encounter being played, it is the
+                player's turn.
+
+        Returns:
+            The (card name, target monster id or None) to play, or None to
+            end the turn.
+        """
+        raise NotImplementedError
+
+
+class GreedyPolicy(Policy):
+    """Plays the affordable card dealing the most damage (then block) at the
+    monster with the least HP, until no card is affordable.
+    """
+
+    def __init__(self) -> None:
+        """Initialises an instance of GreedyPolicy."""
+        # Card class -> (energy cost, (damage, block), name, requires target),
+        # cards of a class never change so they are only asked once.
+        self._cards: dict[type[Card], tuple[int, tuple[int, int], str, bool]] \
+            = dict()
+
+    def _describe(self, card: Card) -> tuple[int, tuple[int, int], str, bool]:
+        """Returns the cached (cost, rank, name, requires target) of card."""
+        if (info := self._cards.get(type(card))) is None:
+            info = self._cards[type(card)] = (
+                card.get_energy_cost(),
+                (card.get_damage_amount(), card.get_block()),
+                card.get_name(), card.requires_target())
+        return info
+
+    def choose_move(self, encounter: Encounter) -> tuple[str, int | None] | \
+            None:
+        """Returns the greedy move, see Policy.choose_move."""
+        energy = encounter.get_player().get_energy()
+        best = None
+        for card in encounter.get_player().get_hand():
+            info = self._describe(card)
+            if info[0] <= energy and (best is None or info[1] > best[1]):
+                best = info
+        if best is None:
+            return None
+        if not best[3]:
+            return best[2], None
+        target = min(encounter.get_monsters(),
+                     key=lambda monster: monster.get_hp())
+        return best[2], target.get_id()
+
+
+class RandomPolicy(Policy):
+    """Ends the turn or plays an affordable card at a monster, uniformly at
+    random.
+    """
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """Initialises an instance of RandomPolicy.
+
+        Parameters:
+            rng (random.Random | None): The random number generator to use,
+                if None the random module is used.
+        """
+        self._rng = random if rng is None else rng
+
+    def choose_move(self, encounter: Encounter) -> tuple[str, int | None] | \
+            None:
+        """Returns a random move, see Policy.choose_move."""
+        energy = encounter.get_player().get_energy()
+        playable = [card for card in encounter.get_player().get_hand()
+                    if card.get_energy_cost() <= energy]
+        choice = self._rng.randrange(len(playable) + 1)
+        if choice == len(playable):
+            return None
+        card = playable[choice]
+        if not card.requires_target():
+            return card.get_name(), None
+        return card.get_name(), self._rng.choice(
+            encounter.get_monsters()).get_id()
+
+
+def simulate_game(player_type: type[Player],
+                  encounters: list[list[tuple[str, int]]], policy: Policy,
+                  max_turns: int = MAX_TURNS,
+                  rng: random.Random | None = None,
+                  monster_types: dict[str, type] | None = None) -> GameResult:
+    """Plays a game to the end without any input or output.
+
+    Parameters:
+        player_type (type[Player]): The player class, e.g. IronClad.
+        encounters (list[list[tuple[str, int]]]): The monsters in each
+            encounter, as returned by read_game_file.
+        policy (Policy): Chooses every move.
+        max_turns (int): The player turns after which the game is lost.
+        rng (random.Random | None): The random number generator the cards
+            are drawn and monsters made with, if None the random module is
+            used.
+        monster_types (dict[str, type] | None): Passed on to Encounter, e.g.
+            slot_entities.MONSTER_TYPES with a player type from there too.
+
+    Returns:
+        The result of the game.
+
+    Usage:
+        >>> result = simulate_game(IronClad, read_game_file("games/game1.txt"),
+        GreedyPolicy())
+        >>> result.won, result.turns, result.hp
+        (True, 5, [80, 79, 79, 74])
+    """
+    player = player_type(rng=rng)
+    hp = [player.get_hp()]
+    turns = 0
+    for encounters_won, monsters in enumerate(encounters):
+        encounter = Encounter(player=player, monsters=monsters,
+                              monster_types=monster_types)
+        turns += 1
+        while encounter.is_active():
+            move = policy.choose_move(encounter)
+            if move is not None and encounter.player_apply_card(*move):
+                continue
+            encounter.end_player_turn()
+            encounter.enemy_turn()
+            hp.append(player.get_hp())
+            if player.get_hp() <= 0 or turns >= max_turns:
+                return GameResult(False, turns, encounters_won, hp)
+            turns += 1
+        encounter.end_player_turn()
+    return GameResult(True, turns, len(encounters), hp)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from a2_support import read_game_file
+
+    player_types = {player_type.__name__.lower(): player_type
+                    for player_type in Player.__subclasses__()}
+    policies = {"greedy": GreedyPolicy, "random": RandomPolicy}
+    parser = argparse.ArgumentParser(
+        description="Plays a game file many times without any output.")
+    parser.add_argument("player", choices=player_types)
+    parser.add_argument("game_file")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--policy", choices=policies, default="greedy")
+    args = parser.parse_args()
+
+    game = read_game_file(args.game_file)
+    policy = policies[args.policy]()
+    start = time.perf_counter()
+    wins = sum(simulate_game(player_types[args.player], game, policy).won
+               for _ in range(args.games))
+    seconds = time.perf_counter() - start
+    print(f"Won {wins}/{args.games} games, {args.games / seconds:.0f} games "
+          f"per second")
@@ -0,0 +1,376 @@
+"""
+Compact entities for the card game, with their state in __slots__.
+
+The entities in a2.py keep their state in a dictionary of string keys
+(_entity_attrs), so every entity costs an instance __dict__, the attribute
+dictionary (plus a nested dictionary of card lists for players and an action
+dictionary for monsters) and a string hash lookup per getter. The classes
+here have the same names, public methods and behaviour, but keep each value
+in a slot: no per instance dictionaries and a getter is one attribute load.
+A class's name is read from the class rather than stored per instance.
+
+They can be used in place of those in a2.py, e.g.
+
+    >>> encounter = Encounter(IronClad(), [("Louse", 10)],
+    monster_types=MONSTER_TYPES)
+
+and entity_benchmark.py compares the two.
+"""
+
+import random
+
+import a2
+from a2 import Bash, Card, Defend, Neutralize, Strike, Survivor
+from a2_support import draw_cards, random_louse_amount
+
+
+class Entity:
+    """Parent class to all entities, see a2.Entity."""
+
+    __slots__ = ("_max_hp", "_hp", "_block", "_strength", "_weak",
+                 "_vulnerable")
+
+    def __init__(self, max_hp: int) -> None:
+        """Initialises an instance of Entity.
+
+        Parameters:
+             max_hp (int): The maximum (starting) hp of the Entity.
+        """
+        self._max_hp = max_hp
+        self._hp = max_hp
+        self._block = 0
+        self._strength = 0
+        self._weak = 0
+        self._vulnerable = 0
+
+    def __str__(self) -> str:
+        """Returns the string representation of this object"""
+        return f"{self.get_name()}: {self._hp}/{self._max_hp} HP"
+
+    def __repr__(self) -> str:
+        """Returns the string representation of an instance of this object"""
+        return f"{self.get_name()}({self._max_hp})"
+
+    def get_hp(self) -> int:
+        """Get current hp."""
+        return self._hp
+
+    def get_max_hp(self) -> int:
+        """Get entities max hp (initial hp)."""
+        return self._max_hp
+
+    def get_block(self) -> int:
+        """Get current block."""
+        return self._block
+
+    def get_strength(self) -> int:
+        """Get current strength."""
+        return self._strength
+
+    def get_weak(self) -> int:
+        """Get the number of turns an entity is weak for."""
+        return self._weak
+
+    def get_vulnerable(self) -> int:
+        """Get the number of turns an entity is vulnerable for."""
+        return self._vulnerable
+
+    def get_name(self) -> str:
+        """Get the name of the entity"""
+        return self.__class__.__name__
+
+    def reduce_hp(self, amount: int) -> None:
+        """Reduces the entity's block then if block is 0 and there is still
+        outstanding damage HP is reduced."""
+        if amount <= self._block:
+            self._block -= amount
+            return
+        amount -= self._block
+        self._block = 0
+        self._hp = 0 if self._hp < amount else self._hp - amount
+
+    def is_defeated(self) -> bool:
+        """Checks if entity health is 0."""
+        return self._hp == 0
+
+    def add_block(self, amount: int) -> None:
+        """Adds block to the entity."""
+        self._block += amount
+
+    def add_strength(self, amount: int) -> None:
+        """Adds strength to the entity."""
+        self._strength += amount
+
+    def add_weak(self, amount: int) -> None:
+        """Adds weak to the entity."""
+        self._weak += amount
+
+    def add_vulnerable(self, amount: int) -> None:
+        """Adds vulnerable to the entity."""
+        self._vulnerable += amount
+
+    def new_turn(self) -> None:
+        """Default actions for all entities to take when a new turn begins."""
+        self._block = 0
+        if self._weak > 0:
+            self._weak -= 1
+        if self._vulnerable > 0:
+            self._vulnerable -= 1
+
+
+class Player(Entity):
+    """Parent class to all player types, see a2.Player."""
+
+    __slots__ = ("_deck", "_hand", "_discarded", "_energy", "_rng")
+
+    def __init__(self, max_hp: int, cards: list[Card] | None = None,
+                 rng: random.Random | None = None) -> None:
+        """Initialises the Player class.
+
+        Parameters:
+            max_hp (int): The max (initial) hp of the player.
+            cards (list[Card]): The cards to be added to the players deck.
+            rng (random.Random | None): The random number generator cards
+                are drawn with, if None the random module is used.
+        """
+        super().__init__(max_hp=max_hp)
+        self._deck = list() if cards is None else cards
+        self._hand: list[Card] = list()
+        self._discarded: list[Card] = list()
+        self._energy = 3
+        self._rng = random if rng is None else rng
+
+    def __repr__(self) -> str:
+        """Returns the string representation of an instance of this object"""
+        return f"{self.get_name()}({self._max_hp}, {self._deck})"
+
+    def get_rng(self) -> random.Random:
+        """Returns the random number generator the player draws cards with."""
+        return self._rng
+
+    def get_energy(self) -> int:
+        """Returns the player's energy."""
+        return self._energy
+
+    def set_energy(self, energy: int) -> None:
+        """Sets the player's energy to a given value.
+
+        Raises:
+            ValueError: If energy isn't an integer.
+        """
+        if type(energy) != int:
+            raise ValueError(f"energy must be an integer, {energy=}, "
+                             f"{type(energy)=}")
+        self._energy = energy
+
+    def get_hand(self) -> list[Card]:
+        """Gets the player's hand."""
+        return self._hand
+
+    def set_cards(self, cards: list[Card], location: int) -> None:
+        """Replaces the player's deck (location 0), hand (1) or discard pile
+        (2) with cards.
+
+        Raises:
+            ValueError: If cards isn't a list of cards.
+        """
+        if type(cards) != list or (any(type(card) not in
+                                       [Card] + Card.__subclasses__()
+                                       for card in cards)):
+            raise ValueError("cards must be a list containing only "
+                             f"containing cards, {cards=}, {type(cards)=}")
+        match location:
+            case 0:
+                self._deck = cards
+            case 1:
+                self._hand = cards
+            case 2:
+                self._discarded = cards
+
+    def get_deck(self) -> list[Card]:
+        """Gets the player's deck"""
+        return self._deck
+
+    def get_discarded(self) -> list[Card]:
+        """Gets the player's discard pile."""
+        return self._discarded
+
+    def start_new_encounter(self) -> None:
+        """Moves the cards in the player's hand and discard pile to the end of
+        their deck."""
+        hand, discarded = self._hand, self._discarded
+        self._hand = list()
+        self._discarded = list()
+        self._deck.extend(hand + discarded)
+
+    def end_turn(self) -> None:
+        """Moves the cards in the player's hand to the end of the discard
+        pile."""
+        hand = self._hand
+        self._hand = list()
+        self._discarded.extend(hand)
+
+    def new_turn(self) -> None:
+        """Does Entity's new turn actions, resets the player's energy and
+        draws a new hand."""
+        super().new_turn()
+        self._energy = 3
+        if len(self._deck) == 0:
+            self._deck.extend(self._discarded)
+            self._discarded.clear()
+        draw_cards(hand=self._hand, deck=self._deck,
+                   discarded=self._discarded, rng=self._rng)
+
+    def play_card(self, card_name: str) -> Card | None:
+        """Plays the first card in the player's hand called card_name, if the
+        player has the energy for it.
+
+        Returns:
+            The card played, or None if it couldn't be.
+        """
+        for card in self._hand:
+            if (card.get_name() == card_name and
+                    self._energy >= card.get_energy_cost()):
+                self._discarded.append(card)
+                self._hand.remove(card)
+                self._energy -= card.get_energy_cost()
+                return card
+        return None
+
+
+class IronClad(Player):
+    """Inherits from Player"""
+
+    __slots__ = ()
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """Initialises IronClad"""
+        super().__init__(max_hp=80,
+                         cards=([Strike()] * 5) + ([Defend()] * 4) + [Bash()],
+                         rng=rng)
+
+    def __repr__(self) -> str:
+        """Returns the string representation of an instance of this object"""
+        return f"{self.__class__.__name__}()"
+
+
+class Silent(Player):
+    """Inherits from Player"""
+
+    __slots__ = ()
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """Initialises Silent"""
+        super().__init__(max_hp=70,
+                         cards=(([Strike()] * 5) + ([Defend()] * 5) +
+                                [Neutralize(), Survivor()]),
+                         rng=rng)
+
+    def __repr__(self) -> str:
+        """Returns the string representation of an instance of this object"""
+        return f"{self.__class__.__name__}()"
+
+
+class Monster(Entity):
+    """Parent class to all Monster types, see a2.Monster.
+
+    Ids are counted by a2.Monster.MONSTER_ID, shared with a2's monsters, so
+    ids never clash and restarting that counter restarts both.
+    """
+
+    __slots__ = ("_uid", "_action", "_rng")
+
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
+        """Initialises the Monster class.
+
+        Parameters:
+             max_hp (int): The maximum (initial) hp of the monster.
+             rng (random.Random | None): The random number generator the
+                monster's actions are drawn with, if None the random module
+                is used.
+        """
+        super().__init__(max_hp=max_hp)
+        a2.Monster.MONSTER_ID += 1
+        self._uid = a2.Monster.MONSTER_ID
+        self._action: dict[str, int] | None = None
+        self._rng = random if rng is None else rng
+
+    def get_id(self) -> int:
+        """Returns the UID (Unique ID) of the monster."""
+        return self._uid
+
+    def action(self) -> dict[str, int]:
+        """Returns the monster's action.
+
+        Raises:
+            NotImplementedError: If the monster has no action.
+        """
+        if self._action is None:
+            raise NotImplementedError
+        return self._action
+
+
+class Louse(Monster):
+    """Subclass of Monster"""
+
+    __slots__ = ("_damage",)
+
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
+        """Initialises an instance of Louse"""
+        super().__init__(max_hp=max_hp, rng=rng)
+        self._damage = random_louse_amount(self._rng)
+
+    def action(self) -> dict[str, int]:
+        """Returns a dictionary with the amount of damage applied.
+
+        The dictionary is only made on the first call, a swarm of lice
+        waiting to act is just their slots. Like a2.Louse the same
+        dictionary is returned every call.
+        """
+        if self._action is None:
+            self._action = {"damage": self._damage}
+        return self._action
+
+
+class Cultist(Monster):
+    """Subclass of Monster"""
+
+    __slots__ = ("_action_calls",)
+
+    def __init__(self, max_hp: int, rng: random.Random | None = None) -> None:
+        """Initialises an instance of Cultist"""
+        super().__init__(max_hp=max_hp, rng=rng)
+        self._action_calls = 0
+
+    def action(self) -> dict[str, int]:
+        """Returns a dictionary with the amount of damage, weak and strength
+        applied."""
+        calls = self._action_calls
+        self._action = {"damage": 0 if calls == 0 else 6 + calls,
+                        "weak": calls & 1}
+        if self._strength > 0:
+            self._action["strength"] = self._strength
+        self._action_calls += 1
+        return self._action
+
+
+class JawWorm(Monster):
+    """Subclass of Monster"""
+
+    __slots__ = ()
+
+    def action(self) -> dict[str, int]:
+        """Gains block of half the damage taken (rounded up) and returns a
+        dictionary with the amount of damage (half the damage taken, rounded
+        down) and strength applied."""
+        damage_taken = self._max_hp - self._hp
+        self.add_block(-(-damage_taken // 2))
+        self._action = {"damage": damage_taken // 2}
+        if self._strength > 0:
+            self._action["strength"] = self._strength
+        return self._action
+
+
+# Monster type (lower case) -> class, for Encounter's monster_types.
+MONSTER_TYPES = {monster_type.__name__.lower(): monster_type
+                 for monster_type in Monster.__subclasses__()}
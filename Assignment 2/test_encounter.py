@@ -0,0 +1,66 @@
+"""
+Tests of targeting and removing monsters in an Encounter.
+"""
+
+import random
+
+import pytest
+
+import a2
+from a2 import Defend, Encounter, IronClad, Strike
+
+
+@pytest.fixture
+def encounter(monkeypatch: pytest.MonkeyPatch) -> Encounter:
+    """An encounter of three Cultists, with ids from 100 and the player
+    holding two Strikes and a Defend."""
+    monkeypatch.setattr(a2.Monster, "MONSTER_ID", 99)
+    player = IronClad(rng=random.Random(0))
+    encounter = Encounter(player, [("Cultist", 6), ("Cultist", 20),
+                                   ("Cultist", 6)])
+    player.set_cards([Strike(), Strike(), Defend()], 1)
+    return encounter
+
+
+def test_defeated_monsters_removed_by_id(encounter: Encounter) -> None:
+    """A defeated monster is removed, keeping the rest in order."""
+    assert [monster.get_id() for monster in encounter.get_monsters()] == \
+        [100, 101, 102]
+    assert encounter.player_apply_card("Strike", 102)
+    assert [monster.get_id() for monster in encounter.get_monsters()] == \
+        [100, 101]
+    assert encounter.player_apply_card("Strike", 101)
+    assert encounter.get_monsters()[1].get_hp() == 14
+    assert [monster.get_id() for monster in encounter.get_monsters()] == \
+        [100, 101]
+
+
+def test_get_monsters_is_a_copy(encounter: Encounter) -> None:
+    """Changing the returned list doesn't change the encounter."""
+    encounter.get_monsters().clear()
+    assert len(encounter.get_monsters()) == 3
+    assert encounter.is_active()
+
+
+def test_missing_target(encounter: Encounter) -> None:
+    """A target id no monster has fails the move, but the card is still
+    spent."""
+    player = encounter.get_player()
+    assert not encounter.player_apply_card("Strike", 7)
+    assert [card.get_name() for card in player.get_hand()] == \
+        ["Strike", "Defend"]
+    assert player.get_energy() == 2
+    assert not encounter.player_apply_card("Defend", 7)
+    assert player.get_block() == 0
+    assert all(monster.get_hp() == monster.get_max_hp()
+               for monster in encounter.get_monsters())
+
+
+def test_missing_target_zero(encounter: Encounter) -> None:
+    """A target id of 0 which no monster has is ignored by cards which don't
+    need a target, and fails cards which do."""
+    player = encounter.get_player()
+    assert encounter.player_apply_card("Defend", 0)
+    assert player.get_block() == 5
+    assert not encounter.player_apply_card("Strike", 0)
+    assert len(encounter.get_monsters()) == 3
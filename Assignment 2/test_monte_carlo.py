@@ -0,0 +1,46 @@
+"""
+Tests that the Monte Carlo estimates of monte_carlo.py are reproducible.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from monte_carlo import estimate_win_rate, play_games, wilson_interval
+
+GAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games",
+                    "game2.txt")
+
+
+@pytest.mark.parametrize("player", ["ironclad", "silent"])
+def test_games_depend_only_on_seed(player: str) -> None:
+    """Games play out the same again, and however they are chunked."""
+    wins = play_games(player, GAME, "random", seed=7, first=0, count=120)
+    assert 0 < wins < 120
+    assert play_games(player, GAME, "random", 7, 0, 120) == wins
+    assert play_games(player, GAME, "random", 7, 50, 70) + \
+        play_games(player, GAME, "random", 7, 0, 50) == wins
+
+
+def test_estimate_independent_of_chunks() -> None:
+    """The same seed gives the same final estimate with any chunk size or
+    number of workers."""
+    estimates = list()
+    for workers, chunk_size in ((1, 120), (2, 7), (2, 50)):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            estimates.append(list(estimate_win_rate(
+                executor, "ironclad", GAME, 120, policy="random", seed=3,
+                chunk_size=chunk_size))[-1])
+    assert estimates[0].games == 120
+    assert estimates[1] == estimates[0] and estimates[2] == estimates[0]
+    assert estimates[0].wins == play_games("ironclad", GAME, "random", 3, 0,
+                                           120)
+
+
+def test_wilson_interval() -> None:
+    """The interval holds the rate and stays inside [0, 1]."""
+    for wins, games in ((0, 10), (3, 10), (10, 10), (500, 1000)):
+        low, high = wilson_interval(wins, games)
+        assert 0.0 <= low <= wins / games <= high <= 1.0
+    assert wilson_interval(500, 1000, 0.99)[1] > wilson_interval(500, 1000)[1]
@@ -0,0 +1,79 @@
+"""
+Tests that games logged by replay.py replay exactly.
+"""
+
+import os
+import random
+
+import pytest
+
+import a2
+from a2 import Encounter
+from a2_support import read_game_file
+from replay import (ReplayMismatchError, dump_log, load_log, record_game,
+                    replay_game)
+from simulator import GreedyPolicy, Policy, RandomPolicy
+
+GAMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games")
+
+
+class _FirstCardAtZero(Policy):
+    """Starts every turn by playing the first card in hand at monster id 0,
+    then plays greedily."""
+
+    def __init__(self) -> None:
+        self._greedy = GreedyPolicy()
+        self._turn_started = True
+
+    def choose_move(self, encounter: Encounter) -> tuple[str, int | None] | \
+            None:
+        if self._turn_started:
+            self._turn_started = False
+            return encounter.get_player().get_hand()[0].get_name(), 0
+        if (move := self._greedy.choose_move(encounter)) is None:
+            self._turn_started = True
+        return move
+
+
+@pytest.mark.parametrize("game", ["game1.txt", "game2.txt", "game3.txt"])
+@pytest.mark.parametrize("player", [a2.IronClad, a2.Silent])
+def test_recorded_games_replay(game: str, player: type[a2.Player]) -> None:
+    """A recorded game, saved and loaded, replays to the same result."""
+    encounters = read_game_file(os.path.join(GAMES, game))
+    for seed in range(10):
+        a2.Monster.MONSTER_ID = -1
+        log = record_game(player, encounters,
+                          RandomPolicy(random.Random(seed)), seed)
+        loaded = load_log(dump_log(log))
+        assert loaded == log
+        a2.Monster.MONSTER_ID = 500
+        assert replay_game(loaded) == log.result
+
+
+def test_missing_target_replayed_as_logged() -> None:
+    """A target id no monster had is logged and replayed as that id, so a
+    card which needs no target at id 0 still succeeds."""
+    a2.Monster.MONSTER_ID = 99
+    log = record_game(a2.IronClad,
+                      read_game_file(os.path.join(GAMES, "game2.txt")),
+                      _FirstCardAtZero(), seed=1)
+    missing = [move for move in log.moves if move and len(move) == 3]
+    assert {move[2] for move in missing} == {0}
+    assert {move[0] for move in missing} >= {"Strike", "Defend"}
+    assert log.first_monster_id == 99
+    a2.Monster.MONSTER_ID = -1
+    assert replay_game(load_log(dump_log(log))) == log.result
+
+
+def test_mismatch_detected() -> None:
+    """Replays which run out of moves or end differently are reported."""
+    a2.Monster.MONSTER_ID = -1
+    log = record_game(a2.Silent,
+                      read_game_file(os.path.join(GAMES, "game2.txt")),
+                      GreedyPolicy(), seed=3)
+    with pytest.raises(ReplayMismatchError):
+        replay_game(log._replace(moves=log.moves[:-3]))
+    with pytest.raises(ReplayMismatchError):
+        replay_game(log._replace(result=log.result._replace(turns=0)))
+    with pytest.raises(ValueError):
+        load_log("{}")
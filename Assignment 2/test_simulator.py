@@ -0,0 +1,92 @@
+"""
+Tests that simulator.py plays games the same as the main loop of a2.py.
+"""
+
+import os
+import random
+
+import pytest
+
+import a2
+from a2_support import read_game_file
+from simulator import GreedyPolicy, RandomPolicy, simulate_game
+
+GAMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games")
+POLICIES = {"greedy": lambda seed: GreedyPolicy(),
+            "random": lambda seed: RandomPolicy(random.Random(seed + 1))}
+
+
+def _play_main(monkeypatch: pytest.MonkeyPatch, player: str, game: str,
+               policy, seed: int) -> tuple[bool, int, int, list[int]]:
+    """Plays a game through a2.main, typing the policy's moves.
+
+    Returns:
+        Whether the game was won, the player turns taken, the encounters won
+        and the player's HP at the start and after every enemy turn, as in a
+        GameResult.
+    """
+    encounters = list()
+    hp = list()
+
+    class WatchedEncounter(a2.Encounter):
+        """Keeps each encounter of the game and what happens in it."""
+
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.failed = False
+            if not hp:
+                hp.append(self.get_player().get_hp())
+            encounters.append(self)
+
+        def player_apply_card(self, *move) -> bool:
+            self.failed = not super().player_apply_card(*move)
+            return not self.failed
+
+        def enemy_turn(self) -> None:
+            super().enemy_turn()
+            hp.append(self.get_player().get_hp())
+
+    def type_move() -> str:
+        """Types the move simulate_game would make, which ends the turn
+        when the last card couldn't be played."""
+        encounter = encounters[-1]
+        if encounter.failed:
+            encounter.failed = False
+            return "end turn"
+        if (move := policy.choose_move(encounter)) is None:
+            return "end turn"
+        name, target = move
+        return f"play {name}" if target is None else f"play {name} {target}"
+
+    answers = {"Enter a player type: ": lambda: player,
+               "Enter a game file: ": lambda: os.path.join(GAMES, game),
+               "Enter a move: ": type_move}
+    monkeypatch.setattr(a2, "Encounter", WatchedEncounter)
+    monkeypatch.setattr("builtins.input", lambda prompt: answers[prompt]())
+    monkeypatch.setattr(a2.Monster, "MONSTER_ID", -1)
+    random.seed(seed)
+    with open(os.devnull, "w") as devnull:
+        monkeypatch.setattr("sys.stdout", devnull)
+        a2.main()
+        monkeypatch.undo()
+
+    won = not encounters[-1].is_active() and hp[-1] > 0
+    enemy_turns = len(hp) - 1
+    encounters_won = len(encounters) - (not won)
+    return won, len(encounters) + enemy_turns - (not won), encounters_won, hp
+
+
+@pytest.mark.parametrize("game", ["game0.txt", "game1.txt", "game2.txt"])
+@pytest.mark.parametrize("player", ["IronClad", "Silent"])
+@pytest.mark.parametrize("policy", list(POLICIES))
+def test_matches_main(monkeypatch: pytest.MonkeyPatch, game: str,
+                      player: str, policy: str) -> None:
+    """A seeded game plays out the same as typing its moves into main."""
+    for seed in range(5):
+        a2.Monster.MONSTER_ID = -1
+        random.seed(seed)
+        simulated = simulate_game(getattr(a2, player),
+                                  read_game_file(os.path.join(GAMES, game)),
+                                  POLICIES[policy](seed))
+        assert tuple(simulated) == _play_main(
+            monkeypatch, player.lower(), game, POLICIES[policy](seed), seed)
@@ -0,0 +1,52 @@
+"""
+Tests that the entities in slot_entities.py play the same as those in a2.py.
+"""
+
+import os
+import random
+
+import pytest
+
+import a2
+import slot_entities
+from a2_support import read_game_file
+from simulator import GreedyPolicy, RandomPolicy, simulate_game
+
+GAMES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games")
+
+
+def _play(module, player: str, game: str, policy: str, seed: int):
+    """Plays a seeded game with the entities of module."""
+    a2.Monster.MONSTER_ID = -1
+    policies = {"greedy": lambda: GreedyPolicy(),
+                "random": lambda: RandomPolicy(random.Random(seed + 1))}
+    return simulate_game(
+        getattr(module, player),
+        read_game_file(os.path.join(GAMES, game)), policies[policy](),
+        rng=random.Random(seed),
+        monster_types=getattr(module, "MONSTER_TYPES", None))
+
+
+@pytest.mark.parametrize("game", sorted(os.listdir(GAMES)))
+@pytest.mark.parametrize("player", ["IronClad", "Silent"])
+@pytest.mark.parametrize("policy", ["greedy", "random"])
+def test_same_games(game: str, player: str, policy: str) -> None:
+    """Seeded games end the same way with either kind of entity."""
+    for seed in range(20):
+        assert _play(slot_entities, player, game, policy, seed) == \
+            _play(a2, player, game, policy, seed)
+
+
+def test_ids_shared() -> None:
+    """Both kinds of monster take ids from the same counter."""
+    a2.Monster.MONSTER_ID = -1
+    ids = [a2.Louse(10).get_id(), slot_entities.Louse(10).get_id(),
+           a2.Cultist(10).get_id()]
+    assert ids == [0, 1, 2]
+
+
+def test_louse_uses_rng() -> None:
+    """A louse draws its damage from the rng it is given."""
+    for seed in range(10):
+        assert slot_entities.Louse(10, rng=random.Random(seed)).action() == \
+            a2.Louse(10, rng=random.Random(seed)).action()